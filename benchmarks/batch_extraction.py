@@ -0,0 +1,49 @@
+#  ---------------------------------------------------------------------------
+#   BENCHMARK
+#  ---------------------------------------------------------------------------
+# Compares WebDriver round trips and wall time of the 'element' and 'batch'
+# extraction modes of PageParser on a local listing page.
+
+import time
+import tempfile
+from pathlib import Path
+
+from selenium_drivers.google_chrome import create_google_chrome_driver
+
+from parsing.general_methods import PageParser
+from parsing.command_tracer import CommandTracer
+from benchmarks.fixtures import FixturePageData, write_listing_page
+
+CARDS_COUNT = 50
+REPEATS = 5
+
+page_elements = [FixturePageData.title, FixturePageData.url, FixturePageData.address]
+
+
+def run_benchmark(parser: PageParser, tracer: CommandTracer) -> dict[str, float]:
+    """Extracts data from the opened page REPEATS times and returns average values."""
+    tracer.reset()
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        parser.get_data_from_page_elements(elements=page_elements)
+    wall_time = time.perf_counter() - start
+    round_trips = sum(page_report['commands'] for page_report in tracer.get_report())
+    return {'round_trips': round_trips / REPEATS,
+            'wall_time': wall_time / REPEATS}
+
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        page_link = write_listing_page(Path(tmp_dir), cards_count=CARDS_COUNT)
+        google_driver = create_google_chrome_driver(mode='prod')
+        parser = PageParser(driver=google_driver)
+        commands_tracer = CommandTracer(parser).attach()
+        try:
+            parser.open_page(page_url=page_link)
+            for mode in ('element', 'batch'):
+                parser.extraction_mode = mode
+                result = run_benchmark(parser, commands_tracer)
+                print(f"{mode:>8}: {result['round_trips']:>6.0f} round trips, "
+                      f"{result['wall_time'] * 1000:>8.1f} ms per page")
+        finally:
+            parser.close_browser_window()
@@ -0,0 +1,165 @@
+#  ---------------------------------------------------------------------------
+#   BENCHMARK
+#  ---------------------------------------------------------------------------
+# Runs collect_data_from_links and collect_data_by_click_next_page against
+# the local fixture site for each backend and concurrency setting.
+# Reports pages/sec, p50/p95 per-page latency and peak RSS of the python process,
+# the results are written to the JSON file to catch regressions.
+#
+#   py -m benchmarks.end_to_end --backends http async selenium --concurrency 1 4 --output bench.json
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from parsing.data_collection import Page, Pagination, PageDataCollector
+from benchmarks.fixtures import FixturePageData, serve_fixture_site, get_listing_page_links
+
+fixture_page_sample = Page(elements=[FixturePageData.title, FixturePageData.url, FixturePageData.address],
+                           end_of_page=FixturePageData.end_of_page,
+                           pagination=Pagination(pagination_elem=FixturePageData.pagination_block,
+                                                 next_page_button=FixturePageData.next_page),
+                           authentication=None)
+
+
+def get_peak_rss_kb() -> int | None:
+    """Returns peak RSS of the current process in kilobytes, None if it cannot be measured"""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak_rss // 1024 if sys.platform == 'darwin' else peak_rss
+
+
+def measure_pages(pages: Iterable) -> list[float]:
+    """Consumes pages and returns time of every page in seconds"""
+    latencies: list[float] = []
+    start = time.perf_counter()
+    for _ in pages:
+        now = time.perf_counter()
+        latencies.append(now - start)
+        start = now
+    return latencies
+
+
+async def measure_async_pages(pages) -> list[float]:
+    latencies: list[float] = []
+    start = time.perf_counter()
+    async for _ in pages:
+        now = time.perf_counter()
+        latencies.append(now - start)
+        start = now
+    return latencies
+
+
+def create_parser(backend: str):
+    match backend:
+        case 'selenium':
+            from selenium_drivers.google_chrome import create_google_chrome_driver
+            from parsing.general_methods import PageParser
+            return PageParser(driver=create_google_chrome_driver(mode='prod', profile='lean'),
+                              extraction_mode='snapshot')
+        case _:
+            from parsing.http_parser import HttpPageParser
+            return HttpPageParser()
+
+
+def collect_pages(backend: str, method: str, concurrency: int,
+                  base_url: str, pages_count: int) -> list[float]:
+    """Runs one scenario and returns per-page latencies"""
+    links = get_listing_page_links(base_url, pages_count)
+
+    if backend == 'async':
+        from parsing.async_data_collection import AsyncPageDataCollector
+        collector = AsyncPageDataCollector(page=fixture_page_sample, max_connections_per_host=concurrency)
+        pages = (collector.collect_data_from_links(page_links=links) if method == 'links'
+                 else collector.collect_data_by_click_next_page(start_page=links[0]))
+        return asyncio.run(measure_async_pages(pages))
+
+    from parsing.parser_pool import ParserPool
+    parser = create_parser(backend)
+    pool = (ParserPool(create_parser=lambda: create_parser(backend), size=concurrency)
+            if method == 'links' and concurrency > 1 else None)
+    collector = PageDataCollector(parser=parser, page=fixture_page_sample, pool=pool)
+    try:
+        pages = (collector.collect_data_from_links(page_links=links) if method == 'links'
+                 else collector.collect_data_by_click_next_page(start_page=links[0]))
+        return measure_pages(pages)
+    finally:
+        parser.close_browser_window()
+        if pool:
+            pool.close()
+
+
+def run_scenario(backend: str, method: str, concurrency: int, base_url: str, pages_count: int) -> dict:
+    """Runs one scenario in the current process and returns its results"""
+    start = time.perf_counter()
+    latencies = collect_pages(backend, method, concurrency, base_url, pages_count)
+    wall_time = time.perf_counter() - start
+    percentiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    return {'backend': backend,
+            'method': method,
+            'concurrency': concurrency,
+            'pages': len(latencies),
+            'wall_time': wall_time,
+            'pages_per_second': len(latencies) / wall_time if wall_time else None,
+            'p50_latency': percentiles[49] if latencies else None,
+            'p95_latency': percentiles[94] if latencies else None,
+            'peak_rss_kb': get_peak_rss_kb()}
+
+
+def iter_scenarios(backends: list[str], concurrency_levels: list[int]) -> Iterator[tuple[str, str, int]]:
+    for backend in backends:
+        for concurrency in concurrency_levels:
+            yield backend, 'links', concurrency
+        # pagination is sequential, so the concurrency does not apply to it
+        yield backend, 'pagination', 1
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="End-to-end benchmark on the local fixture site")
+    arg_parser.add_argument('--backends', nargs='+', default=['http', 'async', 'selenium'],
+                            choices=['http', 'async', 'selenium'])
+    arg_parser.add_argument('--concurrency', nargs='+', type=int, default=[1, 4])
+    arg_parser.add_argument('--pages', type=int, default=30)
+    arg_parser.add_argument('--cards', type=int, default=50)
+    arg_parser.add_argument('--response-delay', type=float, default=0.05,
+                            help="server latency in seconds")
+    arg_parser.add_argument('--output', type=Path, default=Path('bench_results.json'))
+    args = arg_parser.parse_args()
+
+    results: list[dict] = []
+    # every scenario runs in a fresh process, so its peak RSS is not affected by the others
+    context = multiprocessing.get_context('spawn')
+    with serve_fixture_site(pages_count=args.pages, cards_count=args.cards,
+                            response_delay=args.response_delay) as base_url:
+        for backend, method, concurrency in iter_scenarios(args.backends, args.concurrency):
+            with context.Pool(processes=1) as process:
+                try:
+                    result = process.apply(run_scenario, (backend, method, concurrency, base_url, args.pages))
+                except Exception as error_message:
+                    result = {'backend': backend, 'method': method, 'concurrency': concurrency,
+                              'error': f"{error_message.__class__.__name__}: {error_message}"}
+            results.append(result)
+            print(json.dumps(result))
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps({'python': platform.python_version(),
+                                       'platform': platform.platform(),
+                                       'pages': args.pages,
+                                       'cards': args.cards,
+                                       'response_delay': args.response_delay,
+                                       'results': results}, indent=2), encoding='utf8')
+    print(f"Results are written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
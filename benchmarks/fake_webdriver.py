@@ -0,0 +1,180 @@
+from typing import NoReturn
+from urllib.parse import urljoin
+
+from lxml import etree, html
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+
+from parsing import scripts
+from parsing.snapshot import PageSnapshot, compile_xpath, get_inner_text, URL_ATTRIBUTES
+from utils.type_hinting import Html, Link
+
+
+class FakeWebElement:
+    """In-memory element, that answers like selenium WebElement"""
+
+    def __init__(self, driver: 'FakeWebDriver', node: html.HtmlElement):
+        self._driver = driver
+        self._node = node
+
+    @property
+    def text(self) -> str:
+        """Like in the browser, the text keeps line breaks of the block elements and <br>"""
+        self._driver.commands_count += 1
+        return get_inner_text(self._node)
+
+    def get_attribute(self, name: str) -> str | None:
+        self._driver.commands_count += 1
+        if name == 'innerHTML':
+            return (self._node.text or '') + ''.join(etree.tostring(child, encoding='unicode', method='html')
+                                                     for child in self._node)
+        value = self._node.get(name)
+        if value is not None and name in URL_ATTRIBUTES:
+            value = urljoin(self._driver.base_url, value)
+        return value
+
+    def find_element(self, by: str = By.XPATH, value: str = None) -> 'FakeWebElement':
+        found_elements = self.find_elements(by, value)
+        if not found_elements:
+            raise NoSuchElementException(f"Unable to locate element: {value}")
+        return found_elements[0]
+
+    def find_elements(self, by: str = By.XPATH, value: str = None) -> list['FakeWebElement']:
+        """Looks for elements relative to this element"""
+        self._driver.commands_count += 1
+        return [FakeWebElement(self._driver, node) for node in compile_xpath(value)(self._node)]
+
+    def __eq__(self, other) -> bool:
+        """Like in the browser, the elements are equal if they are the same node"""
+        return isinstance(other, FakeWebElement) and self._node is other._node
+
+    def __hash__(self) -> int:
+        return id(self._node)
+
+    def click(self) -> NoReturn:
+        self._driver.commands_count += 1
+        self._driver.on_click(self._node)
+
+    def clear(self) -> NoReturn:
+        self._driver.commands_count += 1
+
+    def send_keys(self, *value) -> NoReturn:
+        self._driver.commands_count += 1
+
+
+class FakeWebDriver:
+    """
+    In-process stub of selenium webdriver, that answers from the given page source.
+    Supports the commands and scripts used by PageParser and counts the commands,
+    so the cost of the library itself can be measured without a browser.
+    """
+
+    def __init__(self, page_source: Html, current_url: Link = 'http://localhost/'):
+        self.page_source = page_source
+        self.current_url = current_url
+        self.commands_count = 0
+        self._snapshot = PageSnapshot(page_source=page_source, page_url=current_url)
+
+    @property
+    def base_url(self) -> Link:
+        """URL, that relative links are resolved by: <base href> or the page URL"""
+        base = self._snapshot.document.find('.//base[@href]')
+        return self.current_url if base is None else urljoin(self.current_url, base.get('href'))
+
+    def get(self, url: Link) -> NoReturn:
+        self.commands_count += 1
+        self.current_url = url
+
+    def find_element(self, by: str = By.XPATH, value: str = None) -> FakeWebElement:
+        found_elements = self.find_elements(by, value)
+        if not found_elements:
+            raise NoSuchElementException(f"Unable to locate element: {value}")
+        return found_elements[0]
+
+    def find_elements(self, by: str = By.XPATH, value: str = None) -> list[FakeWebElement]:
+        self.commands_count += 1
+        return [FakeWebElement(self, node) for node in compile_xpath(value)(self._snapshot.document)]
+
+    def execute_script(self, script: str, *args):
+        self.commands_count += 1
+        match script:
+            case scripts.EXTRACT_PAGE_ELEMENTS:
+                # the elements are read inside the script, so the reads are not commands
+                commands_count = self.commands_count
+                result = self._extract_page_elements(args[0])
+                self.commands_count = commands_count
+                return result
+            case scripts.GET_ELEMENT_LINK:
+                links = args[0]._node.xpath("ancestor-or-self::a[@href][1]")
+                href = links[0].get('href').strip() if links else ''
+                return None if not href or href.startswith(('#', 'javascript:')) else urljoin(self.base_url, href)
+            case scripts.GET_PAGE_STATE:
+                document = self._snapshot.document
+                return [FakeWebElement(self, document), self.current_url,
+                        hash(etree.tostring(document.body, encoding='unicode'))]
+            case scripts.GET_PAGE_SOURCE:
+                return [self.page_source, self.current_url]
+            case scripts.WRITE_PAGE_SOURCE:
+                self.page_source = args[0]
+                self._snapshot = PageSnapshot(page_source=args[0], page_url=self.current_url)
+            case scripts.GET_ELEMENTS_HTML:
+                return '\n'.join(etree.tostring(node, encoding='unicode', method='html', with_tail=False)
+                                 for xpath in args[0]
+                                 for node in compile_xpath(xpath)(self._snapshot.document))
+            case _:
+                return None
+
+    def execute_async_script(self, script: str, *args):
+        self.commands_count += 1
+        match script:
+            case scripts.WAIT_UNTIL_PAGE_READY:
+                return {'ready': True, 'elapsed_ms': 0}
+            case scripts.SCROLL_TO_ELEMENT:
+                found_elements = self.find_elements(By.XPATH, args[0])
+                return {'element': found_elements[0] if found_elements else None,
+                        'steps': 0,
+                        'elapsed_ms': 0,
+                        'reason': 'found' if found_elements else 'end_of_page'}
+            case _:
+                return None
+
+    def on_click(self, node: html.HtmlElement) -> NoReturn:
+        """Called when the element is clicked, the page is not changed by clicks"""
+
+    def set_script_timeout(self, time_to_wait: float) -> NoReturn:
+        self.commands_count += 1
+
+    def close(self) -> NoReturn:
+        self.commands_count += 1
+
+    def quit(self) -> NoReturn:
+        self.commands_count += 1
+
+    def _extract_page_elements(self, schema: list[list]) -> dict[str, list | str | None]:
+        result: dict[str, list | str | None] = {}
+        for name, xpath, data_type, tag, many, fields in schema:
+            nodes = compile_xpath(xpath)(self._snapshot.document)
+            if fields:
+                result[name] = [self._extract_fields(node, fields) for node in nodes]
+            else:
+                result[name] = self._extract_values(nodes, data_type, tag, many)
+        return result
+
+    def _extract_fields(self, container: html.HtmlElement, fields: list[list]) -> dict[str, list | str | None]:
+        return {name: self._extract_values(compile_xpath(xpath)(container), data_type, tag, many)
+                for name, xpath, data_type, tag, many in fields}
+
+    def _extract_values(self, nodes: list[html.HtmlElement], data_type: str, tag: str,
+                        many: bool) -> list[str] | str | None:
+        values = [self._extract(FakeWebElement(self, node), data_type, tag) for node in nodes]
+        return values if many else (values[0] if values else None)
+
+    @staticmethod
+    def _extract(element: FakeWebElement, data_type: str, tag: str) -> str | None:
+        match data_type:
+            case 'text':
+                return element.text
+            case 'url':
+                return element.get_attribute(tag)
+            case _:
+                return element.get_attribute('innerHTML')
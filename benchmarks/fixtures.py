@@ -0,0 +1,114 @@
+import threading
+import time
+from contextlib import contextmanager
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
+from enum import Enum
+from html import escape
+from typing import Iterator
+from urllib.parse import urlparse, parse_qs
+
+from utils.for_building_input_data import HtmlElem, TextElem, LinkElem, ButtonElem, ContainerElem
+from utils.type_hinting import Html, Link
+
+
+# Elements from the fixture pages, the markup repeats the hh.ru search page
+class FixturePageData(Enum):
+    vacancy_block = ContainerElem(xpath="//div [@class='vacancy-serp-item']",
+                                  fields={'title': TextElem(xpath=".//a [@data-qa='vacancy-serp__vacancy-title']"),
+                                          'url': LinkElem(xpath=".//a [@data-qa='vacancy-serp__vacancy-title']"),
+                                          'address': TextElem(
+                                              xpath=".//div [@data-qa='vacancy-serp__vacancy-address']"
+                                          )})
+    title = TextElem(xpath="//a [@data-qa='vacancy-serp__vacancy-title']",
+                     many=True)
+    url = LinkElem(xpath="//a [@data-qa='vacancy-serp__vacancy-title'][@href]",
+                   many=True)
+    address = TextElem(xpath="//div [@data-qa='vacancy-serp__vacancy-address']",
+                       many=True)
+    pagination_block = HtmlElem(xpath="//div [@class='pager'][@data-qa='pager-block']")
+    next_page = ButtonElem(xpath="//a [@class='bloko-button'][@data-qa='pager-next']")
+    end_of_page = HtmlElem(xpath="//div [@class='bloko-gap bloko-gap_bottom']")
+
+
+def build_listing_page(page_number: int = 0, cards_count: int = 50,
+                       next_page_url: Link | None = None) -> Html:
+    """
+    Builds the listing page with vacancy cards and the pagination block.
+    If next_page_url is given, the pagination block gets 'next page' button.
+    """
+    cards: list[str] = []
+    for card_number in range(1, cards_count + 1):
+        vacancy_id = page_number * cards_count + card_number
+        cards.append(
+            f"<div class='vacancy-serp-item'>"
+            f"<h3><a data-qa='vacancy-serp__vacancy-title' href='/vacancy/{vacancy_id}'>"
+            f"Python developer {vacancy_id}</a></h3>"
+            f"<div data-qa='vacancy-serp__vacancy-address'>Moscow, street {escape(str(vacancy_id))}</div>"
+            f"</div>"
+        )
+
+    next_page_button = ""
+    if next_page_url:
+        next_page_button = f"<a class='bloko-button' data-qa='pager-next' href='{next_page_url}'>next</a>"
+    pager = f"<div class='pager' data-qa='pager-block'><span>{page_number + 1}</span>{next_page_button}</div>"
+
+    return (f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>Page {page_number}</title></head>"
+            f"<body>{''.join(cards)}{pager}<div class='bloko-gap bloko-gap_bottom'></div></body></html>")
+
+
+def write_listing_page(folder: Path, page_number: int = 0, cards_count: int = 50) -> Link:
+    """Writes the listing page to the folder and returns its 'file://' link"""
+    folder.mkdir(parents=True, exist_ok=True)
+    page_file = folder.joinpath(f"page_{page_number}.html")
+    page_file.write_text(build_listing_page(page_number, cards_count), encoding='utf8')
+    return page_file.absolute().as_uri()
+
+
+def get_listing_page_links(base_url: Link, pages_count: int) -> list[Link]:
+    """Returns links to all listing pages of the fixture site"""
+    return [f"{base_url}/search?page={page_number}" for page_number in range(pages_count)]
+
+
+@contextmanager
+def serve_fixture_site(pages_count: int = 10, cards_count: int = 50,
+                       response_delay: float = 0) -> Iterator[Link]:
+    """
+    Serves the listing pages on the local http.server in a background thread.
+    Page '/search?page=N' links to the next page until pages_count is reached.
+    response_delay (in seconds) imitates the network and server latency.
+    Yields the base URL of the site.
+    """
+
+    class FixtureSiteHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'  # keep-alive connections
+
+        def do_GET(self):
+            parsed_url = urlparse(self.path)
+            page_number = int(parse_qs(parsed_url.query).get('page', ['0'])[0])
+            if parsed_url.path != '/search' or page_number >= pages_count:
+                self.send_error(404)
+                return
+
+            time.sleep(response_delay)
+            next_page_url = (f"/search?page={page_number + 1}"
+                             if page_number + 1 < pages_count else None)
+            body = build_listing_page(page_number, cards_count, next_page_url).encode('utf8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FixtureSiteHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}"
+    finally:
+        server.shutdown()
+        server.server_close()
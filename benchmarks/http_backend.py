@@ -0,0 +1,51 @@
+#  ---------------------------------------------------------------------------
+#   BENCHMARK
+#  ---------------------------------------------------------------------------
+# Compares pages/sec of PageDataCollector.collect_data_from_links
+# with the browserless HttpPageParser and the selenium PageParser
+# on the local fixture site.
+
+import time
+
+from selenium_drivers.google_chrome import create_google_chrome_driver
+
+from parsing.data_collection import Page, PageParser, PageDataCollector
+from parsing.http_parser import HttpPageParser
+from benchmarks.fixtures import FixturePageData, serve_fixture_site, get_listing_page_links
+
+PAGES_COUNT = 10
+CARDS_COUNT = 50
+
+fixture_page_sample = Page(elements=[FixturePageData.title, FixturePageData.url, FixturePageData.address],
+                           end_of_page=FixturePageData.end_of_page,
+                           pagination=None,
+                           authentication=None)
+
+
+def run_benchmark(parser, page_links: list[str]) -> float:
+    """Collects data from all links and returns pages per second."""
+    collector = PageDataCollector(parser=parser, page=fixture_page_sample)
+    start = time.perf_counter()
+    collected_pages = sum(1 for _ in collector.collect_data_from_links(page_links=page_links))
+    return collected_pages / (time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    with serve_fixture_site(pages_count=PAGES_COUNT, cards_count=CARDS_COUNT) as base_url:
+        links = get_listing_page_links(base_url, PAGES_COUNT)
+        results: dict[str, float] = {}
+
+        http_parser = HttpPageParser()
+        try:
+            results['http'] = run_benchmark(http_parser, links)
+        finally:
+            http_parser.close_browser_window()
+
+        selenium_parser = PageParser(driver=create_google_chrome_driver(mode='prod'))
+        try:
+            results['selenium'] = run_benchmark(selenium_parser, links)
+        finally:
+            selenium_parser.close_browser_window()
+
+    for backend, pages_per_second in results.items():
+        print(f"{backend:>8}: {pages_per_second:>8.2f} pages/sec")
@@ -0,0 +1,207 @@
+#  ---------------------------------------------------------------------------
+#   BENCHMARK
+#  ---------------------------------------------------------------------------
+# Measures the per-page overhead of the library itself without a browser.
+# PageParser talks to the in-process FakeWebDriver, so the difference between
+# the parser and the bare driver calls is the cost of write_log,
+# handle_page_parser_exceptions, the match dispatch and the progress bars.
+# The results are written to the JSON file; with --baseline the run fails
+# if any scenario became slower than the tolerance allows.
+#
+#   py -m benchmarks.micro --output micro_results.json --baseline micro_results.json
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import re
+import sys
+import timeit
+from pathlib import Path
+from typing import Callable
+
+from lxml import html
+
+from parsing.general_methods import PageParser, get_extraction_schema
+from parsing.scripts import EXTRACT_PAGE_ELEMENTS
+from parsing.snapshot import compile_xpath
+from utils.decorators import write_log, handle_func_errors
+from utils.progress_bars import set_progress_bar
+from web_parser_logger.main import logger
+from benchmarks.fake_webdriver import FakeWebDriver
+from benchmarks.fixtures import FixturePageData, build_listing_page
+
+page_elements = [FixturePageData.title, FixturePageData.url, FixturePageData.address]
+
+
+def get_package_version() -> str:
+    pyproject = Path(__file__).resolve().parent.parent / 'pyproject.toml'
+    found = re.search(r'^version\s*=\s*"(.+?)"', pyproject.read_text(encoding='utf8'), re.MULTILINE)
+    return found.group(1) if found else 'unknown'
+
+
+def measure(func: Callable, repeat: int = 5) -> float:
+    """Returns the best time of one call in microseconds"""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1_000_000
+
+
+# ---------------------------------------------------------------------------
+#   Bare driver calls, that are made by each extraction mode
+# ---------------------------------------------------------------------------
+def extract_by_driver_elements(driver: FakeWebDriver) -> dict:
+    result = {}
+    for elem in page_elements:
+        found_elements = driver.find_elements('xpath', elem.value.xpath)
+        match elem.value.extracted_data_type:
+            case 'text':
+                result[elem.name] = [element.text for element in found_elements]
+            case _:
+                result[elem.name] = [element.get_attribute(elem.value.extracted_tag) for element in found_elements]
+    return result
+
+
+def extract_by_driver_script(driver: FakeWebDriver) -> dict:
+    return driver.execute_script(EXTRACT_PAGE_ELEMENTS, get_extraction_schema(tuple(page_elements)))
+
+
+def extract_by_lxml(page_source: str) -> dict:
+    document = html.fromstring(page_source)
+    return {elem.name: [node.text_content() for node in compile_xpath(elem.value.xpath)(document)]
+            for elem in page_elements}
+
+
+def extract_by_parser(parser: PageParser) -> dict:
+    # the elements are found on every call, as by the bare driver calls, so the same work is compared
+    parser.clear_element_cache()
+    return parser.get_data_from_page_elements(elements=page_elements)
+
+
+# ---------------------------------------------------------------------------
+#   Framework pieces in isolation
+# ---------------------------------------------------------------------------
+class Plain:
+    def noop(self, value):
+        return value
+
+
+class Decorated:
+    @write_log(before_msg="Before", after_msg="After")
+    def logged(self, value):
+        return value
+
+    @handle_func_errors
+    def guarded(self, value):
+        return value
+
+
+def dispatch_by_match(data_type: str) -> int:
+    match data_type:
+        case 'text':
+            return 1
+        case 'url':
+            return 2
+        case _:
+            return 3
+
+
+def iterate_pages(pages_count: int):
+    for page_number in range(pages_count):
+        yield page_number
+
+
+def measure_progress_bar(pages_count: int) -> float:
+    """Returns the progress bar cost of one page in microseconds"""
+    wrapped_pages = set_progress_bar(known_amount=True)(iterate_pages)
+    with contextlib.redirect_stdout(io.StringIO()):
+        bare = timeit.timeit(lambda: sum(iterate_pages(pages_count)), number=1)
+        wrapped = timeit.timeit(lambda: sum(wrapped_pages(pages_count)), number=1)
+    return (wrapped - bare) / pages_count * 1_000_000
+
+
+def measure_write_log_at_info_level(decorated: Decorated) -> float:
+    """Returns the write_log cost, when the DEBUG and SUCCESS records are skipped, as by the production preset"""
+    level = logger.level
+    logger.setLevel('INFO')
+    try:
+        return measure(lambda: decorated.logged(1))
+    finally:
+        logger.setLevel(level)
+
+
+def run_benchmarks(cards_count: int, pages_count: int) -> dict[str, float]:
+    page_source = build_listing_page(page_number=1, cards_count=cards_count, next_page_url=None)
+    driver = FakeWebDriver(page_source=page_source)
+    parser = PageParser(driver=driver)
+    plain, decorated = Plain(), Decorated()
+    results: dict[str, float] = {}
+
+    results['driver_element'] = measure(lambda: extract_by_driver_elements(driver))
+    results['driver_batch'] = measure(lambda: extract_by_driver_script(driver))
+    results['lxml_snapshot'] = measure(lambda: extract_by_lxml(page_source))
+    for mode in ('element', 'batch', 'snapshot'):
+        parser.extraction_mode = mode
+        results[f'parser_{mode}'] = measure(lambda: extract_by_parser(parser))
+
+    results['plain_call'] = measure(lambda: plain.noop(1))
+    results['write_log_call'] = measure(lambda: decorated.logged(1))
+    results['write_log_call_info_level'] = measure_write_log_at_info_level(decorated)
+    results['handle_func_errors_call'] = measure(lambda: decorated.guarded(1))
+    results['match_dispatch'] = measure(lambda: dispatch_by_match('html'))
+    results['progress_bar_per_page'] = measure_progress_bar(pages_count)
+
+    results['overhead_element'] = results['parser_element'] - results['driver_element']
+    results['overhead_batch'] = results['parser_batch'] - results['driver_batch']
+    results['overhead_snapshot'] = results['parser_snapshot'] - results['lxml_snapshot']
+    return results
+
+
+def find_regressions(results: dict[str, float], baseline: dict[str, float],
+                     tolerance: float) -> list[str]:
+    regressions: list[str] = []
+    for name, value in results.items():
+        if name.startswith('overhead') or name not in baseline:
+            continue
+        if value > baseline[name] * (1 + tolerance):
+            regressions.append(f"{name}: {baseline[name]:.2f} -> {value:.2f} us")
+    return regressions
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Micro-benchmarks of the library overhead")
+    arg_parser.add_argument('--cards', type=int, default=50)
+    arg_parser.add_argument('--pages', type=int, default=200,
+                            help="pages count for the progress bar scenario")
+    arg_parser.add_argument('--output', type=Path, default=Path('micro_results.json'))
+    arg_parser.add_argument('--baseline', type=Path, default=None,
+                            help="JSON file of the previous run to compare with")
+    arg_parser.add_argument('--tolerance', type=float, default=0.2,
+                            help="allowed slowdown against the baseline, 0.2 is 20%%")
+    args = arg_parser.parse_args()
+
+    baseline: dict[str, float] = {}
+    if args.baseline and args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text(encoding='utf8'))['results']
+
+    results = run_benchmarks(cards_count=args.cards, pages_count=args.pages)
+    for name, value in results.items():
+        print(f"{name:>26}: {value:>12.2f} us")
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps({'version': get_package_version(),
+                                       'python': platform.python_version(),
+                                       'platform': platform.platform(),
+                                       'cards': args.cards,
+                                       'results': results}, indent=2), encoding='utf8')
+    print(f"Results are written to {args.output}")
+
+    regressions = find_regressions(results, baseline, args.tolerance)
+    if regressions:
+        print("Regressions against the baseline:\n" + '\n'.join(regressions))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -14,7 +14,7 @@ from parsing.data_collection import (
     Pagination,
     PageDataCollector
 )
-from utils.for_building_input_data import HtmlElem, TextElem, LinkElem, ButtonElem
+from utils.for_building_input_data import HtmlElem, TextElem, LinkElem, ButtonElem, ContainerElem
 from utils.helpers import save_data_to_json_file
 
 # init folder:
@@ -24,8 +24,12 @@ collected_data_folder = current_folder.joinpath('collected_data')
 
 # Elements from the website hh.ru
 class PageData(Enum):
-    vacancy_block = HtmlElem(xpath="//div [@class='vacancy-serp-item']",
-                             many=True)
+    vacancy_block = ContainerElem(xpath="//div [@class='vacancy-serp-item']",
+                                  fields={'title': TextElem(xpath=".//a [@data-qa='vacancy-serp__vacancy-title']"),
+                                          'url': LinkElem(xpath=".//a [@data-qa='vacancy-serp__vacancy-title']"),
+                                          'address': TextElem(
+                                              xpath=".//div [@data-qa='vacancy-serp__vacancy-address']"
+                                          )})
     title = TextElem(xpath="//a [@data-qa='vacancy-serp__vacancy-title']",
                      many=True)
     url = LinkElem(xpath="//a [@data-qa='vacancy-serp__vacancy-title'][@href]",
@@ -9,7 +9,7 @@ from enum import Enum
 from selenium_drivers.google_chrome import create_google_chrome_driver
 
 from parsing.data_collection import Page, PageParser, PageDataCollector
-from utils.for_building_input_data import HtmlElem, TextElem, LinkElem, ButtonElem
+from utils.for_building_input_data import HtmlElem, TextElem, LinkElem, ButtonElem, ContainerElem
 from utils.helpers import save_data_to_json_file
 
 # init content folder:
@@ -19,8 +19,12 @@ collected_data_folder = current_folder.joinpath('collected_data')
 
 # Elements from the website hh.ru
 class PageData(Enum):
-    vacancy_block = HtmlElem(xpath="//div [@class='vacancy-serp-item']",
-                             many=True)
+    vacancy_block = ContainerElem(xpath="//div [@class='vacancy-serp-item']",
+                                  fields={'title': TextElem(xpath=".//a [@data-qa='vacancy-serp__vacancy-title']"),
+                                          'url': LinkElem(xpath=".//a [@data-qa='vacancy-serp__vacancy-title']"),
+                                          'address': TextElem(
+                                              xpath=".//div [@data-qa='vacancy-serp__vacancy-address']"
+                                          )})
     title = TextElem(xpath="//a [@data-qa='vacancy-serp__vacancy-title']",
                      many=True)
     url = LinkElem(xpath="//a [@data-qa='vacancy-serp__vacancy-title'][@href]",
@@ -39,7 +43,8 @@ google_driver = create_google_chrome_driver()
 
 parser = PageParser(driver=google_driver)
 
-search_page_sample = Page(elements=[PageData.title, PageData.url, PageData.address],
+# every card is one record, a card without address gets None
+search_page_sample = Page(elements=[PageData.vacancy_block],
                           end_of_page=PageData.end_of_page,
                           pagination=None,
                           authentication=None)
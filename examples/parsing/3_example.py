@@ -0,0 +1,54 @@
+#  ---------------------------------------------------------------------------
+#   JUST EXAMPLE
+#  ---------------------------------------------------------------------------
+# (This is a sample to improve your understanding of how to work this package)
+
+from pathlib import Path
+from enum import Enum
+
+from selenium_drivers.google_chrome import create_google_chrome_driver
+
+from parsing.data_collection import Page, PageParser, PageDataCollector
+from parsing.parser_pool import ParserPool
+from utils.for_building_input_data import TextElem, LinkElem, HtmlElem
+from utils.helpers import save_data_to_json_file
+
+# init content folder:
+current_folder = Path(__file__).parent
+collected_data_folder = current_folder.joinpath('collected_data')
+
+
+# Elements from the website hh.ru
+class PageData(Enum):
+    title = TextElem(xpath="//a [@data-qa='vacancy-serp__vacancy-title']",
+                     many=True)
+    url = LinkElem(xpath="//a [@data-qa='vacancy-serp__vacancy-title'][@href]",
+                   many=True)
+    address = TextElem(xpath="//div [@data-qa='vacancy-serp__vacancy-address']",
+                       many=True)
+    end_of_page = HtmlElem(xpath="//div [@class='bloko-gap bloko-gap_bottom']")
+
+
+search_page_sample = Page(elements=[PageData.title, PageData.url, PageData.address],
+                          end_of_page=PageData.end_of_page,
+                          pagination=None,
+                          authentication=None)
+
+if __name__ == '__main__':
+    # data collection by 3 browsers at the same time
+    with ParserPool(create_parser=lambda: PageParser(driver=create_google_chrome_driver(mode='prod')),
+                    size=3) as parsers_pool:
+        hh_search_pages_data = PageDataCollector(parser=None,
+                                                 page=search_page_sample,
+                                                 pool=parsers_pool,
+                                                 ordered=False)
+        try:
+            for page_number, data in enumerate(hh_search_pages_data.collect_data_from_links(
+                    page_links=[f"https://hh.ru/search/vacancy?area=113&text=python&page={number}"
+                                for number in range(6)]
+            ), start=1):
+                json_file_name: str = f"data_from_page_{page_number}.json"
+                json_file: Path = collected_data_folder.joinpath(json_file_name)
+                save_data_to_json_file(json_file, data)
+        except Exception as error_message:
+            print(f"{error_message=}")
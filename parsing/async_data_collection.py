@@ -0,0 +1,169 @@
+import asyncio
+import time
+import weakref
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import AsyncIterator
+from urllib.parse import urljoin, urlparse
+
+import httpx
+
+from parsing.general_methods import Page, Pagination
+from parsing.snapshot import PageSnapshot
+from parsing.response_cache import ResponseCache
+from parsing.exceptions import (
+    ElementNotFound,
+    ValueIsEmpty,
+    ValueIsWrong
+)
+from utils.type_hinting import Second, Link
+from utils.decorators import write_log
+from utils.metrics import metrics
+from web_parser_logger.main import logger
+
+
+@dataclass
+class AsyncPageDataCollector:
+    """
+    Class for collecting data from identical static pages without a browser.
+    Pages are fetched by the async HTTP client, the number of simultaneous
+    requests to one host is limited by max_connections_per_host, to all hosts by max_connections.
+    Uses the same Page model and returns data in the same format as PageDataCollector.
+    As in PageDataCollector, the page, that has failed, is logged and skipped, the collection goes on.
+    If the cache is set, the cached pages are not fetched again.
+    """
+    page: Page
+    pages_count: int = None
+    max_connections_per_host: int = 10
+    max_connections: int = 100
+    headers: dict[str, str] = None
+    timeout: Second = 10
+    cache: ResponseCache = None
+
+    def __post_init__(self):
+        # semaphores are bound to the event loop, so they are kept per running loop
+        self._host_semaphores: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop,
+                                                         defaultdict[str, asyncio.Semaphore]] = (
+            weakref.WeakKeyDictionary()
+        )
+
+    @write_log(before_msg="Collecting data by URLs...",
+               after_msg="Data collection by URLs completed.\n")
+    async def collect_data_from_links(self, page_links: list[Link]) -> AsyncIterator[dict[str, dict | str]]:
+        """
+        This is async links iterator.
+        All URLs are fetched concurrently, data is returned in the order of URLs.
+        """
+        number_of_pages = (len(page_links) and self.pages_count) or len(page_links)
+        if number_of_pages == 0:
+            raise ValueIsEmpty("'AsyncPageDataCollector.collect_data_from_links.page_links' cannot be empty")
+
+        async with self._create_client() as client:
+            tasks = [asyncio.create_task(self._collect_data_from_link(client, url))
+                     for url in page_links[:number_of_pages]]
+            try:
+                for task in tasks:
+                    page_data = await task
+                    if page_data is None:
+                        continue
+                    metrics.count_page(page_data)
+                    yield page_data
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+    @write_log(before_msg="Collecting data by 'next page' links...",
+               after_msg="Data collection by 'next page' links completed.\n")
+    async def collect_data_by_click_next_page(self, start_page: Link) -> AsyncIterator[dict[str, dict | str]]:
+        """
+        This is async paginator.
+        Iterates through pages by following the "next page" button link, while collecting data from them.
+        """
+        if not isinstance(self.page.pagination, Pagination):
+            raise ValueIsWrong("Attribute 'page.pagination' must be an instance of the class Pagination")
+
+        if not self.page.pagination.next_page_button:
+            raise ValueIsEmpty("Attribute 'page.pagination.next_page_button' cannot be empty")
+
+        pagination: Pagination = self.page.pagination
+        page_url: Link = start_page
+        page_counter = 0
+
+        async with self._create_client() as client:
+            while True:
+                try:
+                    snapshot = await self._fetch_page(client, page_url)
+                except Exception as error:
+                    self._log_page_error(page_url, error)
+                    logger.error(f"Pagination is stopped, the page '{page_url}' is not opened")
+                    break
+                if snapshot.find_element(pagination.pagination_elem) is None:
+                    raise ElementNotFound(f"Element '{pagination.pagination_elem}' not found.")
+
+                page_data = await asyncio.to_thread(snapshot.get_data_from_page_elements, self.page.elements)
+                metrics.count_page(page_data)
+                yield page_data
+
+                page_counter += 1
+
+                next_page_button = snapshot.find_element(pagination.next_page_button)
+                if next_page_button is None or not next_page_button.get('href'):
+                    print("Reached the last page")
+                    break
+
+                elif self.pages_count and (self.pages_count == page_counter):
+                    break
+
+                else:
+                    page_url = urljoin(snapshot.page_url, next_page_button.get('href'))
+
+    def _create_client(self) -> httpx.AsyncClient:
+        """Creates the HTTP client with keep-alive connections"""
+        return httpx.AsyncClient(headers=self.headers,
+                                 timeout=self.timeout,
+                                 follow_redirects=True,
+                                 limits=httpx.Limits(max_connections=self.max_connections,
+                                                     max_keepalive_connections=self.max_connections_per_host))
+
+    async def _fetch_page(self, client: httpx.AsyncClient, page_url: Link) -> PageSnapshot:
+        """Fetches the page, waits if there are too many requests to the page host."""
+        if self.cache:
+            cached_response = await asyncio.to_thread(self.cache.get, page_url, client.headers)
+            if cached_response:
+                return PageSnapshot(page_source=cached_response.page_source, page_url=cached_response.url)
+
+        async with self._get_host_semaphore(urlparse(page_url).netloc):
+            start = time.perf_counter()
+            response = await client.get(page_url)
+            metrics.observe('open_page', time.perf_counter() - start)
+        response.raise_for_status()
+        if self.cache:
+            await asyncio.to_thread(self.cache.put, page_url, response.text,
+                                    final_url=str(response.url),
+                                    headers=client.headers,
+                                    response_headers=dict(response.headers))
+        return PageSnapshot(page_source=response.text, page_url=str(response.url))
+
+    def _get_host_semaphore(self, host: str) -> asyncio.Semaphore:
+        """Returns the semaphore of the host in the running event loop"""
+        loop = asyncio.get_running_loop()
+        if loop not in self._host_semaphores:
+            self._host_semaphores[loop] = defaultdict(lambda: asyncio.Semaphore(self.max_connections_per_host))
+        return self._host_semaphores[loop][host]
+
+    async def _collect_data_from_link(self, client: httpx.AsyncClient, url: Link) -> dict[str, dict | str] | None:
+        """
+        Fetches the page and parses it in a separate thread, so the event loop is not blocked.
+        Returns None if the page has failed, so the other pages are collected.
+        """
+        try:
+            snapshot = await self._fetch_page(client, url)
+            return await asyncio.to_thread(snapshot.get_data_from_page_elements, self.page.elements)
+        except Exception as error:
+            self._log_page_error(url, error)
+            return None
+
+    @staticmethod
+    def _log_page_error(url: Link, error: Exception):
+        metrics.increment('errors', operation='collect_page')
+        logger.error(f"Page '{url}' has failed: {error.__class__.__name__}: {error}")
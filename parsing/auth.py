@@ -30,7 +30,8 @@ class Authenticator:
         For beginning tries to authentication through cookies if they not exist, then
         authentication through login and password.
         """
-        self.parser.open_page(page_url=self.url, delay_after=1)
+        self.parser.open_page(page_url=self.url)
+        self.parser.wait_until_page_ready(end_of_page=self.page.end_of_page)
 
         try:
             if self.cookies_file.exists():
@@ -48,6 +49,7 @@ class Authenticator:
         """Authentication through cookies"""
         read_cookies_from_file(self.parser.driver, self.cookies_file)
         self.parser.driver.refresh()
+        self.parser.wait_until_page_ready(end_of_page=self.page.end_of_page)
         try:
             self.parser.click_element(self.page.authentication.enter_button_cookies)
         except ElementNotInteractableException:
@@ -58,12 +60,10 @@ class Authenticator:
     def _auth_via_login_password(self):
         """Authentication through login and password"""
         self.parser.fill_in_field(field=self.page.authentication.login_field,
-                                  data=self.login,
-                                  delay_after=1)
+                                  data=self.login)
 
         self.parser.fill_in_field(field=self.page.authentication.password_field,
-                                  data=self.password,
-                                  delay_after=1)
+                                  data=self.password)
 
         self.parser.click_element(self.page.authentication.enter_button_login_password)
         error_message = self.parser.find_arising_element(elem=self.page.authentication.err_message,
@@ -0,0 +1,82 @@
+import sqlite3
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import NoReturn
+
+from utils.type_hinting import Link
+
+
+@dataclass
+class CheckpointStore:
+    """
+    Durable progress of the crawls in the SQLite file:
+    - completed links of collect_data_from_links,
+    - the last pagination page and the page counter of collect_data_by_click_next_page.
+    One file can keep the progress of several jobs, they are separated by job_name.
+    """
+    db_file: Path
+    job_name: str = 'default'
+
+    def __post_init__(self):
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        # the store is shared by the pool threads, so the connection is guarded by the lock
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.db_file, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute("CREATE TABLE IF NOT EXISTS completed_links ("
+                                     "job_name TEXT, url TEXT, PRIMARY KEY (job_name, url))")
+            self._connection.execute("CREATE TABLE IF NOT EXISTS pagination ("
+                                     "job_name TEXT, start_page TEXT, page_url TEXT, page_counter INTEGER, "
+                                     "finished INTEGER, PRIMARY KEY (job_name, start_page))")
+
+    def get_completed_links(self) -> set[Link]:
+        """Returns all completed links of the job"""
+        with self._lock:
+            rows = self._connection.execute("SELECT url FROM completed_links WHERE job_name = ?",
+                                            (self.job_name,)).fetchall()
+        return {url for url, in rows}
+
+    def mark_completed(self, url: Link) -> NoReturn:
+        """Saves the link as completed"""
+        with self._lock, self._connection:
+            self._connection.execute("INSERT OR IGNORE INTO completed_links VALUES (?, ?)",
+                                     (self.job_name, url))
+
+    def clear_completed_links(self) -> NoReturn:
+        """Removes all completed links of the job"""
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM completed_links WHERE job_name = ?", (self.job_name,))
+
+    def save_pagination(self, start_page: Link, page_url: Link, page_counter: int,
+                        finished: bool = False) -> NoReturn:
+        """
+        Saves the page, that pagination has to continue from, and the number of completed pages.
+        finished=True means that the last page has been reached.
+        """
+        with self._lock, self._connection:
+            self._connection.execute("INSERT OR REPLACE INTO pagination VALUES (?, ?, ?, ?, ?)",
+                                     (self.job_name, start_page, page_url, page_counter, finished))
+
+    def get_pagination(self, start_page: Link) -> tuple[Link, int, bool] | None:
+        """
+        Returns the page to continue from, the number of completed pages and the finished flag,
+        None if there is no saved pagination.
+        """
+        with self._lock:
+            row = self._connection.execute("SELECT page_url, page_counter, finished FROM pagination "
+                                           "WHERE job_name = ? AND start_page = ?",
+                                           (self.job_name, start_page)).fetchone()
+        return None if row is None else (row[0], row[1], bool(row[2]))
+
+    def close(self) -> NoReturn:
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,182 @@
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from types import CodeType, FunctionType
+from typing import NoReturn
+
+from selenium.webdriver.remote.command import Command
+
+from parsing.general_methods import PageParser
+from utils.type_hinting import Second, Link
+
+# commands after which the browser can be on another page
+NAVIGATION_COMMANDS: frozenset[str] = frozenset({Command.GET, Command.CLICK_ELEMENT, Command.GO_BACK,
+                                                 Command.GO_FORWARD, Command.REFRESH})
+
+
+@dataclass
+class TracedCommand:
+    command: str
+    method: str | None
+    duration: Second
+
+
+@dataclass
+class PageTrace:
+    """WebDriver commands, that were sent while the browser was on the page"""
+    url: Link | None
+    commands: list[TracedCommand] = field(default_factory=list)
+
+
+@dataclass
+class CommandTracer:
+    """
+    Opt-in tracer of WebDriver commands.
+    Wraps driver.execute of the parser, every command (also of the found elements) goes through it.
+    Each command is timed and linked to the public PageParser method, that sent it,
+    and to the page URL. The URL of the page, that was opened by a click, is got by the untraced
+    command when the browser leaves the page or when the report is made.
+    The methods are found by the code objects of the parser methods, that are collected once,
+    so the frames are not inspected further than their code.
+    """
+    parser: PageParser
+
+    def __post_init__(self):
+        self.pages: list[PageTrace] = []
+        self._lock = threading.Lock()
+        self._execute = None
+        self._method_names: dict[CodeType, str] = get_method_names(type(self.parser))
+
+    def attach(self) -> 'CommandTracer':
+        if self._execute is None:
+            self._execute = self.parser.driver.execute
+            self.parser.driver.execute = self._traced_execute
+        return self
+
+    def detach(self) -> NoReturn:
+        if self._execute is not None:
+            with self._lock:
+                self._resolve_page_url()
+            self.parser.driver.execute = self._execute
+            self._execute = None
+
+    def reset(self) -> NoReturn:
+        with self._lock:
+            self.pages.clear()
+
+    def get_report(self) -> list[dict]:
+        """
+        Returns the commands statistics per page URL:
+        commands count, time on the wire and commands count per command and per parser method.
+        """
+        report: dict[Link | None, dict] = {}
+        with self._lock:
+            if self._execute is not None:
+                self._resolve_page_url()
+            for page in self.pages:
+                page_report = report.setdefault(page.url, {'url': page.url,
+                                                           'commands': 0,
+                                                           'wire_time': 0.0,
+                                                           'by_command': Counter(),
+                                                           'by_method': Counter()})
+                for traced_command in page.commands:
+                    page_report['commands'] += 1
+                    page_report['wire_time'] += traced_command.duration
+                    page_report['by_command'][traced_command.command] += 1
+                    page_report['by_method'][traced_command.method] += 1
+        return [{**page_report,
+                 'by_command': dict(page_report['by_command'].most_common()),
+                 'by_method': dict(page_report['by_method'].most_common())}
+                for page_report in report.values()]
+
+    def print_report(self) -> NoReturn:
+        for page_report in self.get_report():
+            print(f"{page_report['url']}: {page_report['commands']} commands, "
+                  f"{page_report['wire_time'] * 1000:.1f} ms on the wire")
+            for method, commands_count in page_report['by_method'].items():
+                print(f"\t{method}: {commands_count}")
+
+    def _traced_execute(self, driver_command: str, params: dict = None):
+        method = self._get_parser_method()
+        is_navigation = driver_command in NAVIGATION_COMMANDS
+        if is_navigation:
+            with self._lock:
+                if not self.pages and driver_command != Command.GET:
+                    self.pages.append(PageTrace(url=None))
+                # the browser leaves the page, that may have been opened by a click
+                self._resolve_page_url()
+                if driver_command == Command.GET:
+                    self.pages.append(PageTrace(url=params['url']))
+
+        start = time.perf_counter()
+        try:
+            return self._execute(driver_command, params)
+        finally:
+            duration = time.perf_counter() - start
+            with self._lock:
+                if not self.pages:
+                    self.pages.append(PageTrace(url=None))
+                self.pages[-1].commands.append(TracedCommand(command=driver_command,
+                                                             method=method,
+                                                             duration=duration))
+                if is_navigation and driver_command != Command.GET:
+                    self.pages.append(PageTrace(url=None))
+
+    def _resolve_page_url(self) -> NoReturn:
+        """Gets the URL of the current page by the untraced command, if it is unknown; is called under the lock"""
+        if self.pages and self.pages[-1].url is None:
+            self.pages[-1].url = self._execute(Command.GET_CURRENT_URL)['value']
+
+    def _get_parser_method(self) -> str | None:
+        """Returns the name of the nearest public method of the parser in the call stack"""
+        frame = sys._getframe(2)
+        while frame is not None:
+            method_name = self._method_names.get(frame.f_code)
+            if method_name is not None:
+                return method_name
+            frame = frame.f_back
+        return None
+
+    def __enter__(self):
+        return self.attach()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.detach()
+
+
+def get_method_names(parser_class: type) -> dict[CodeType, str]:
+    """
+    Returns the names of the public methods of the parser class by the code objects of their functions.
+    The methods are wrapped by the decorators (write_log, handle_page_parser_exceptions),
+    so the decorated function is looked for in the closures of the wrappers.
+    """
+    method_names: dict[CodeType, str] = {}
+    for cls in reversed(parser_class.__mro__):
+        for name, attribute in vars(cls).items():
+            if name.startswith('_') or not isinstance(attribute, FunctionType):
+                continue
+            func = find_decorated_function(attribute, name)
+            if func is not None:
+                method_names[func.__code__] = name
+    return method_names
+
+
+def find_decorated_function(func: FunctionType, name: str,
+                            visited: set[CodeType] = None) -> FunctionType | None:
+    """Returns the function with the name, that is func itself or is wrapped by it"""
+    if func.__name__ == name:
+        return func
+    visited = visited if visited is not None else set()
+    visited.add(func.__code__)
+    for cell in func.__closure__ or ():
+        try:
+            wrapped = cell.cell_contents
+        except ValueError:
+            continue
+        if isinstance(wrapped, FunctionType) and wrapped.__code__ not in visited:
+            found = find_decorated_function(wrapped, name, visited)
+            if found is not None:
+                return found
+    return None
@@ -1,25 +1,82 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
 from dataclasses import dataclass
-from typing import Iterator
+from typing import Iterator, NoReturn
 
 from parsing.general_methods import PageParser, Page, Pagination
+from parsing.parser_pool import ParserPool
+from parsing.checkpoint import CheckpointStore
+from parsing.fingerprints import FingerprintStore
+from parsing.page_archive import PageArchive
+from parsing.snapshot import PageSnapshot
+from parsing.retry import RetryEngine, raising_parser_errors
 from parsing.exceptions import (
     ElementNotFound,
+    RetriesExhausted,
     ValueIsEmpty,
     ValueIsWrong
 )
 from utils.type_hinting import Link
 from utils.decorators import write_log
+from utils.metrics import metrics
 from utils.progress_bars import set_progress_bar
+from web_parser_logger.main import logger
+
+
+@dataclass
+class CollectedPage:
+    """
+    Result of collecting one page.
+    The unchanged page has no data, the fingerprint is None if the fingerprints are not used.
+    """
+    page_data: dict[str, dict | list | str] | None
+    fingerprint: str | None = None
+    unchanged: bool = False
 
 
 @dataclass
 class PageDataCollector:
     """
     Class for collecting data from identical pages.
+    If the pool is set, links are collected in parallel by the pool parsers:
+    - ordered=True - data is returned in the order of links,
+    - ordered=False - data is returned as soon as a page is collected;
+    pagination is sequential, so it is done by the parser, the pool is not used for it.
+    If the checkpoint is set, the progress is saved after each returned page,
+    with resume=True the completed links are skipped and pagination continues from the last saved page.
+    If the fingerprints store is set, pages that have not changed since the last collection
+    are not extracted and not returned, their number is in skipped_pages_count.
+    If the recorder is set, the rendered page of every visited page is saved to it,
+    the pages can be extracted again without a browser by ReplayPageParser or PageArchive.replay.
+    If the retry engine is set, the parser errors are raised inside the collection of a link
+    (inside the extraction in pagination) instead of being swallowed, the failed pages are retried
+    by the error class and the pages, that have failed for good, are skipped and saved to the dead-letter
+    queue of the engine;
+    collected links are removed from the dead-letter queue, so it can be collected again.
+    If prefetch is True, pagination opens the next page in the background, while the current one is
+    extracted from its snapshot, so a page takes about max(load, extraction) instead of their sum;
+    the next page is opened by the link of the "next page" button, the button without a link is clicked
+    after the extraction.
     """
     parser: PageParser
     page: Page
     pages_count: int = None
+    pool: ParserPool = None
+    ordered: bool = True
+    checkpoint: CheckpointStore = None
+    resume: bool = False
+    fingerprints: FingerprintStore = None
+    recorder: PageArchive = None
+    retry: RetryEngine = None
+    prefetch: bool = False
+
+    def __post_init__(self):
+        if self.parser is None and self.pool is None:
+            raise ValueIsEmpty("Set 'PageDataCollector.parser' or 'PageDataCollector.pool'")
+        self.skipped_pages_count = 0
+        # the pool threads count the skipped pages
+        self._skipped_pages_lock = threading.Lock()
 
     @set_progress_bar(known_amount=True)
     @write_log(before_msg="Collecting data by URLs...",
@@ -34,14 +91,128 @@ class PageDataCollector:
         if number_of_pages == 0:
             raise ValueIsEmpty("'PageDataCollector.collect_data_by_urls.page_links' cannot be empty")
 
-        for page_number, url in enumerate(page_links, start=1):
-            if page_number > number_of_pages:
-                break
-            self.parser.open_page(page_url=url, delay_after=2)
-            self.parser.find_element_by_scroll(elem=self.page.end_of_page,
-                                               stop_scroll_elem=self.page.end_of_page,
-                                               delay_after=1)
-            yield self.parser.get_data_from_page_elements(elements=self.page.elements)
+        page_links = self._skip_completed_links(page_links[:number_of_pages])
+        if self.pool:
+            collected_pages = self._collect_data_from_links_by_pool(page_links)
+        else:
+            collected_pages = ((url, self._collect_data_from_link_with_retry(self.parser, url))
+                               for url in page_links)
+
+        self.skipped_pages_count = 0
+        for url, collected_page in collected_pages:
+            # the failed page is not completed, so it is collected again on resume
+            if collected_page is None or (collected_page.page_data is None and not collected_page.unchanged):
+                continue
+            if collected_page.page_data is not None:
+                metrics.count_page(collected_page.page_data)
+                yield collected_page.page_data
+            self._save_progress(url, collected_page.fingerprint)
+        self._report_skipped_pages()
+
+    def _save_progress(self, url: Link, fingerprint: str | None) -> NoReturn:
+        """Saves the returned (or skipped) page as completed and its fingerprint."""
+        if self.checkpoint:
+            self.checkpoint.mark_completed(url)
+        if self.retry and self.retry.dead_letters:
+            self.retry.dead_letters.remove(url)
+        if fingerprint:
+            self.fingerprints.save_fingerprint(url, fingerprint)
+
+    def _report_skipped_pages(self) -> NoReturn:
+        if self.fingerprints:
+            logger.info(f"Unchanged pages skipped: {self.skipped_pages_count}")
+            print(f"Unchanged pages skipped: {self.skipped_pages_count}")
+
+    def _record_page(self, parser: PageParser, url: Link) -> NoReturn:
+        """Saves the rendered page to the recorder."""
+        if self.recorder:
+            self.recorder.record(url, parser.take_page_snapshot())
+
+    def _check_page_fingerprint(self, parser: PageParser, url: Link) -> tuple[bool, str | None]:
+        """
+        Returns if the page is unchanged since the last collection and the new page fingerprint.
+        The fingerprint is None if the fingerprints are not used or it cannot be got,
+        then the page is collected as changed.
+        """
+        if not self.fingerprints:
+            return False, None
+
+        fingerprint = parser.get_page_fingerprint(elements=self.page.elements)
+        if fingerprint is not None and self.fingerprints.is_unchanged(url, fingerprint):
+            with self._skipped_pages_lock:
+                self.skipped_pages_count += 1
+            return True, None
+        return False, fingerprint
+
+    def _skip_completed_links(self, page_links: list[Link]) -> list[Link]:
+        """
+        Removes the completed links if the collection is resumed,
+        otherwise the saved progress is cleared.
+        """
+        if not self.checkpoint:
+            return page_links
+
+        if not self.resume:
+            self.checkpoint.clear_completed_links()
+            return page_links
+
+        completed_links: set[Link] = self.checkpoint.get_completed_links()
+        return [url for url in page_links if url not in completed_links]
+
+    def _collect_data_from_links_by_pool(self, page_links: list[Link]
+                                         ) -> Iterator[tuple[Link, CollectedPage | None]]:
+        """
+        Distributes links between the pool parsers.
+        If an error occurs, all browsers of the pool are closed.
+        """
+        executor = ThreadPoolExecutor(max_workers=self.pool.size)
+        futures = {executor.submit(self._collect_data_from_link_by_pool, url): url for url in page_links}
+        try:
+            for future in (futures if self.ordered else as_completed(futures)):
+                yield futures[future], future.result()
+        except (Exception, KeyboardInterrupt):
+            executor.shutdown(wait=True, cancel_futures=True)
+            self.pool.close()
+            raise
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _collect_data_from_link_by_pool(self, url: Link) -> CollectedPage | None:
+        """Collects data from one link by an idle parser of the pool."""
+        with self.pool.get_parser() as parser:
+            return self._collect_data_from_link_with_retry(parser, url)
+
+    def _collect_data_from_link_with_retry(self, parser: PageParser, url: Link) -> CollectedPage | None:
+        """
+        Collects data from the link, retrying it if the retry engine is set.
+        Returns None if the page has failed for good.
+        """
+        if not self.retry:
+            return self._collect_data_from_link(parser, url)
+
+        try:
+            with raising_parser_errors(parser):
+                return self.retry.call(url, self._collect_data_from_link, parser, url)
+        except RetriesExhausted:
+            return None
+
+    def _collect_data_from_link(self, parser: PageParser, url: Link) -> CollectedPage | None:
+        """
+        Opens the link and collects data from the page.
+        Returns None if the page is not opened, so the previous page is not returned for it.
+        The data is None if the page is unchanged or the extraction has failed.
+        """
+        if not parser.open_page(page_url=url):
+            return None
+        parser.wait_until_page_ready(end_of_page=self.page.end_of_page)
+        parser.find_element_by_scroll(elem=self.page.end_of_page,
+                                      stop_scroll_elem=self.page.end_of_page)
+        self._record_page(parser, url)
+        unchanged, fingerprint = self._check_page_fingerprint(parser, url)
+        if unchanged:
+            return CollectedPage(page_data=None, unchanged=True)
+        return CollectedPage(page_data=parser.get_data_from_page_elements(elements=self.page.elements),
+                             fingerprint=fingerprint)
 
     @set_progress_bar()
     @write_log(before_msg="Collecting data by click 'next page'...",
@@ -58,8 +229,67 @@ class PageDataCollector:
         if not self.page.pagination.next_page_button:
             raise ValueIsEmpty("Attribute 'page.pagination.next_page_button' cannot be empty")
 
+        if self.parser is None:
+            raise ValueIsEmpty("Pagination is sequential, so it needs 'PageDataCollector.parser', "
+                               "the pool is only used by collect_data_from_links")
+
+        self.skipped_pages_count = 0
+        if self.prefetch:
+            yield from self._collect_data_with_prefetch(start_page)
+            return
+
         for page_number, _ in enumerate(self._paginate(start_page, self.page.pagination), start=1):
-            yield self.parser.get_data_from_page_elements(elements=self.page.elements)
+            page_url = self.parser.get_current_url()
+            self._record_page(self.parser, page_url)
+            unchanged, fingerprint = self._check_page_fingerprint(self.parser, page_url)
+            if unchanged:
+                continue
+            page_data = self._get_page_data_with_retry(page_url)
+            if page_data is None:
+                continue
+            metrics.count_page(page_data)
+            yield page_data
+            if fingerprint:
+                self.fingerprints.save_fingerprint(page_url, fingerprint)
+        self._report_skipped_pages()
+
+    def _collect_data_with_prefetch(self, start_page: Link) -> Iterator[dict[str, dict | str]]:
+        """
+        Extracts data from the page snapshots, while the next pages are being opened.
+        Returns data from one page and waits for the execution of the higher function.
+        """
+        for page_url, snapshot, (unchanged, fingerprint) in self._paginate_with_prefetch(start_page,
+                                                                                        self.page.pagination):
+            if self.recorder:
+                self.recorder.record(page_url, snapshot)
+            if unchanged:
+                continue
+            page_data = self._get_page_data_with_retry(page_url, source=snapshot)
+            if page_data is None:
+                continue
+            metrics.count_page(page_data)
+            yield page_data
+            if fingerprint:
+                self.fingerprints.save_fingerprint(page_url, fingerprint)
+        self._report_skipped_pages()
+
+    def _get_page_data_with_retry(self, page_url: Link,
+                                  source: PageParser | PageSnapshot = None) -> dict[str, dict | str] | None:
+        """
+        Extracts data from the opened page (or from its snapshot), retrying it if the retry engine is set.
+        Returns None if the page has failed for good.
+        """
+        source = source or self.parser
+        if not self.retry:
+            return source.get_data_from_page_elements(elements=self.page.elements)
+
+        # the snapshot raises the errors itself, the parser raises them only inside the retried call,
+        # so the navigation errors are handled as usual and the next page can be opened meanwhile
+        try:
+            with raising_parser_errors(source) if source is self.parser else nullcontext():
+                return self.retry.call(page_url, source.get_data_from_page_elements, elements=self.page.elements)
+        except RetriesExhausted:
+            return None
 
     def _paginate(self, start_page: Link, pagination: Pagination) -> Iterator:
         """
@@ -67,27 +297,114 @@ class PageDataCollector:
         Iterates through pages by clicking the "next page" button.
         Returns None and waits for the execution of the higher function.
         """
-        self.parser.open_page(page_url=start_page, delay_after=2)
-        page_counter = 0
+        page_url, page_counter, finished = self._get_pagination_start(start_page)
+        if finished:
+            print("The last page has already been reached")
+            return
+
+        if not self.parser.open_page(page_url=page_url):
+            logger.error(f"Pagination is stopped, the page '{page_url}' is not opened")
+            return
 
         while True:
-            if not self.parser.find_element_by_scroll(elem=pagination.pagination_elem,
-                                                      stop_scroll_elem=self.page.end_of_page,
-                                                      delay_after=1):
+            self.parser.wait_until_page_ready(end_of_page=self.page.end_of_page)
+            if self.parser.find_element_by_scroll(elem=pagination.pagination_elem,
+                                                  stop_scroll_elem=self.page.end_of_page) is None:
                 raise ElementNotFound(f"Element '{pagination.pagination_elem}' not found.")
 
             yield
 
             page_counter += 1
 
-            if not self.parser.find_element_by_scroll(elem=pagination.next_page_button,
-                                                      stop_scroll_elem=self.page.end_of_page,
-                                                      delay_after=1):
+            if self.parser.find_element_by_scroll(elem=pagination.next_page_button,
+                                                  stop_scroll_elem=self.page.end_of_page) is None:
                 print("Reached the last page")
+                self._save_pagination(start_page, page_counter, finished=True)
                 break
 
             elif self.pages_count and (self.pages_count == page_counter):
+                self._save_pagination(start_page, page_counter, finished=True)
                 break
 
+            # the page is saved only when it has been left, otherwise the old URL would be saved
+            elif self.parser.open_page_by_click(elem=pagination.next_page_button):
+                self._save_pagination(start_page, page_counter)
+
             else:
-                self.parser.click_element(elem=pagination.next_page_button)
+                logger.error(f"Pagination is stopped, the next page is not opened after page {page_counter}")
+                break
+
+    def _paginate_with_prefetch(self, start_page: Link, pagination: Pagination
+                                ) -> Iterator[tuple[Link, PageSnapshot, tuple[bool, str | None]]]:
+        """
+        This is paginator with the next page prefetch.
+        Takes the snapshot of the opened page and starts opening the next page in another thread,
+        the higher function extracts the snapshot meanwhile, the browser is not used by it.
+        Returns the page URL, its snapshot and the result of the fingerprint check (see _check_page_fingerprint).
+        """
+        page_url, page_counter, finished = self._get_pagination_start(start_page)
+        if finished:
+            print("The last page has already been reached")
+            return
+
+        if not self.parser.open_page(page_url=page_url):
+            logger.error(f"Pagination is stopped, the page '{page_url}' is not opened")
+            return
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            while True:
+                self.parser.wait_until_page_ready(end_of_page=self.page.end_of_page)
+                if self.parser.find_element_by_scroll(elem=pagination.pagination_elem,
+                                                      stop_scroll_elem=self.page.end_of_page) is None:
+                    raise ElementNotFound(f"Element '{pagination.pagination_elem}' not found.")
+                has_next_page = self.parser.find_element_by_scroll(elem=pagination.next_page_button,
+                                                                   stop_scroll_elem=self.page.end_of_page) is not None
+                page_url = self.parser.get_current_url()
+                snapshot = self.parser.take_page_snapshot()
+                fingerprint_check = self._check_page_fingerprint(self.parser, page_url)
+                page_counter += 1
+                last_page_reached = not has_next_page or (self.pages_count and self.pages_count == page_counter)
+
+                # the link is read from the found button, so the snapshot is not parsed before the next page loading
+                next_page = None
+                next_page_link = (None if last_page_reached
+                                  else self.parser.get_element_link(elem=pagination.next_page_button))
+                if next_page_link:
+                    next_page = executor.submit(self.parser.open_page, page_url=next_page_link)
+
+                yield page_url, snapshot, fingerprint_check
+
+                if not has_next_page:
+                    print("Reached the last page")
+                    self._save_pagination(start_page, page_counter, finished=True)
+                    break
+
+                elif last_page_reached:
+                    self._save_pagination(start_page, page_counter, finished=True)
+                    break
+
+                # the button without a link is clicked after the extraction
+                next_page_opened = (next_page.result() if next_page
+                                    else self.parser.open_page_by_click(elem=pagination.next_page_button))
+                # the page is saved only when the next page is opened, otherwise the current one would be returned again
+                if not next_page_opened:
+                    logger.error(f"Pagination is stopped, the next page is not opened after page {page_counter}")
+                    break
+                self._save_pagination(start_page, page_counter)
+
+    def _get_pagination_start(self, start_page: Link) -> tuple[Link, int, bool]:
+        """Returns the page to start pagination from, the number of passed pages and if the last page is passed."""
+        if self.checkpoint and self.resume and self.checkpoint.get_pagination(start_page):
+            return self.checkpoint.get_pagination(start_page)
+        return start_page, 0, False
+
+    def _save_pagination(self, start_page: Link, page_counter: int, finished: bool = False):
+        """
+        Saves the current page as the page to continue pagination from.
+        finished=True is saved when the last page or pages_count is reached, so resume does not repeat pages.
+        """
+        if self.checkpoint:
+            self.checkpoint.save_pagination(start_page=start_page,
+                                            page_url=self.parser.get_current_url(),
+                                            page_counter=page_counter,
+                                            finished=finished)
@@ -0,0 +1,83 @@
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import NoReturn
+
+from utils.type_hinting import Link
+
+
+@dataclass
+class DeadLetter:
+    url: Link
+    error_class: str
+    error_message: str
+    attempts: int
+    failed_at: float
+
+
+@dataclass
+class DeadLetterQueue:
+    """
+    Pages, that have failed after all retries, in the SQLite file.
+    The links can be collected again by collect_data_from_links(page_links=dead_letters.get_links()),
+    the collector removes every collected link from the queue.
+    One file can keep the pages of several jobs, they are separated by job_name.
+    """
+    db_file: Path
+    job_name: str = 'default'
+
+    def __post_init__(self):
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        # the queue is shared by the pool threads, so the connection is guarded by the lock
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.db_file, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute("CREATE TABLE IF NOT EXISTS dead_letters ("
+                                     "job_name TEXT, url TEXT, error_class TEXT, error_message TEXT, "
+                                     "attempts INTEGER, failed_at REAL, PRIMARY KEY (job_name, url))")
+
+    def add(self, url: Link, error_class: str, error_message: str, attempts: int) -> NoReturn:
+        """Saves the failed page, the previous failure of the page is replaced"""
+        with self._lock, self._connection:
+            self._connection.execute("INSERT OR REPLACE INTO dead_letters VALUES (?, ?, ?, ?, ?, ?)",
+                                     (self.job_name, url, error_class, error_message, attempts, time.time()))
+
+    def get_dead_letters(self) -> list[DeadLetter]:
+        """Returns the failed pages of the job in the order of failure"""
+        with self._lock:
+            rows = self._connection.execute("SELECT url, error_class, error_message, attempts, failed_at "
+                                            "FROM dead_letters WHERE job_name = ? ORDER BY failed_at",
+                                            (self.job_name,)).fetchall()
+        return [DeadLetter(*row) for row in rows]
+
+    def get_links(self) -> list[Link]:
+        return [dead_letter.url for dead_letter in self.get_dead_letters()]
+
+    def remove(self, url: Link) -> NoReturn:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM dead_letters WHERE job_name = ? AND url = ?",
+                                     (self.job_name, url))
+
+    def clear(self) -> NoReturn:
+        """Removes all failed pages of the job"""
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM dead_letters WHERE job_name = ?", (self.job_name,))
+
+    def close(self) -> NoReturn:
+        with self._lock:
+            self._connection.close()
+
+    def count(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM dead_letters WHERE job_name = ?",
+                                            (self.job_name,)).fetchone()[0]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -33,6 +33,12 @@ class ValueIsWrong(ValueError):
     text_err: str
 
 
+@dataclass
+class PageNotFound(ValueError):
+    """Raises if the page is not found in the archive"""
+    text_err: str
+
+
 @dataclass
 class AuthCookiesIncorrect(Exception):
     """Raise if given an incorrect cookies"""
@@ -49,3 +55,9 @@ class AuthLoginPasswordIncorrect(Exception):
 class BreakOut(Exception):
     """Raise if necessary to stop the driver"""
     text_err: str
+
+
+@dataclass
+class RetriesExhausted(Exception):
+    """Raises if all attempts to collect the page have failed"""
+    text_err: str
@@ -0,0 +1,64 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import NoReturn
+
+from utils.type_hinting import Link
+
+
+def hash_content(content: str) -> str:
+    """Returns the content hash, that is used as the page fingerprint"""
+    return hashlib.sha256(content.encode('utf8')).hexdigest()
+
+
+@dataclass
+class FingerprintStore:
+    """
+    Fingerprints of the collected pages in the SQLite file.
+    The fingerprint is the hash of the extracted region of the page
+    or the ETag / Last-Modified header, if the fetch backend gets them.
+    """
+    db_file: Path
+
+    def __post_init__(self):
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        # the store is shared by the pool threads, so the connection is guarded by the lock
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.db_file, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute("CREATE TABLE IF NOT EXISTS fingerprints ("
+                                     "url TEXT PRIMARY KEY, fingerprint TEXT, updated_at REAL)")
+
+    def get_fingerprint(self, url: Link) -> str | None:
+        """Returns the saved page fingerprint, None if the page has not been collected"""
+        with self._lock:
+            row = self._connection.execute("SELECT fingerprint FROM fingerprints WHERE url = ?",
+                                           (url,)).fetchone()
+        return None if row is None else row[0]
+
+    def is_unchanged(self, url: Link, fingerprint: str | None) -> bool:
+        """
+        Checks if the page has the same fingerprint as at the last collection.
+        The page without a fingerprint (or never collected) is changed.
+        """
+        return fingerprint is not None and self.get_fingerprint(url) == fingerprint
+
+    def save_fingerprint(self, url: Link, fingerprint: str) -> NoReturn:
+        with self._lock, self._connection:
+            self._connection.execute("INSERT OR REPLACE INTO fingerprints VALUES (?, ?, ?)",
+                                     (url, fingerprint, time.time()))
+
+    def close(self) -> NoReturn:
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -1,25 +1,50 @@
+from __future__ import annotations
+
+import logging
 import time
-from dataclasses import dataclass
-from typing import NoReturn, Sequence
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, NoReturn, Sequence, TYPE_CHECKING
 
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.common.action_chains import ActionChains
-from selenium.webdriver.remote.webelement import WebElement
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as ec
-from selenium.common.exceptions import TimeoutException
-
-from parsing.exceptions import (
-    NotSupportedAttribute,
-    ElementNotFound
+from selenium.common.exceptions import (
+    JavascriptException,
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException
 )
+
+from parsing.exceptions import NotSupportedAttribute
 from utils.type_hinting import (
     Second,
+    Html,
     Link,
     Element_for_parsing,
+    Extraction_mode,
+    Ready_state,
+)
+from parsing.scripts import (
+    EXTRACT_PAGE_ELEMENTS,
+    GET_PAGE_SOURCE,
+    WAIT_UNTIL_PAGE_READY,
+    SCROLL_TO_ELEMENT,
+    GET_ELEMENTS_HTML,
+    GET_PAGE_STATE,
+    GET_ELEMENT_LINK,
+    WRITE_PAGE_SOURCE
 )
+from parsing.fingerprints import hash_content
+from parsing.response_cache import ResponseCache, make_static_page_source
+from parsing.snapshot import PageSnapshot
 from utils.decorators import handle_page_parser_exceptions, write_log
+from utils.for_building_input_data import ContainerElem
+from web_parser_logger.main import logger
+
+if TYPE_CHECKING:
+    # the remote webdriver modules are slow to import, they are imported by the driver itself
+    from selenium.webdriver.remote.webelement import WebElement
+    from selenium.webdriver.support.ui import WebDriverWait
 
 
 @dataclass
@@ -74,19 +99,169 @@ class Page:
     end_of_page: Element_for_parsing
 
 
+@dataclass
+class PageReadiness:
+    """
+    Conditions under which the page is considered ready:
+    - document.readyState reached ready_state,
+    - end of page element is present (if it is given),
+    - no new resources were loaded during network_quiet_time (0 - do not wait),
+    The waiting stops after timeout even if the page is not ready.
+    fallback_delay is the opt-in fixed delay after the page is ready.
+    """
+    ready_state: Ready_state = 'complete'
+    network_quiet_time: float = 0
+    timeout: Second = 10
+    fallback_delay: Second = 0
+
+
+@dataclass
+class PageScrolling:
+    """
+    Settings of the scroll engine:
+    - step - scroll step in pixels,
+    - pause - pause between steps for lazy loading, in seconds,
+    - timeout and max_steps - guards against endless scrolling.
+    """
+    step: int = 1000
+    pause: float = 0.1
+    timeout: Second = 10
+    max_steps: int = 200
+
+
+@dataclass
+class ScrollReport:
+    """
+    Result of the scrolling:
+    - element - found element or None,
+    - steps - number of scroll steps,
+    - elapsed - scrolling time in seconds,
+    - reason - found, stop_element, end_of_page, timeout or max_steps.
+    """
+    element: WebElement | None
+    steps: int
+    elapsed: float
+    reason: str
+
+
+@lru_cache(maxsize=128)
+def get_extraction_schema(elements: tuple[Element_for_parsing, ...]) -> list[list]:
+    """Returns the schema of EXTRACT_PAGE_ELEMENTS, it is built once for the same elements"""
+    schema: list[list] = []
+    for elem in elements:
+        if not hasattr(elem.value, 'xpath'):
+            print(f" {elem.name} has no 'xpath' attribute")
+            raise NotSupportedAttribute
+        fields: list[list] | None = None
+        if isinstance(elem.value, ContainerElem):
+            fields = [[name, field_elem.xpath, field_elem.extracted_data_type,
+                       field_elem.extracted_tag, field_elem.many]
+                      for name, field_elem in elem.value.fields.items()]
+        schema.append([elem.name, elem.value.xpath, elem.value.extracted_data_type,
+                       elem.value.extracted_tag, elem.value.many, fields])
+    return schema
+
+
 @handle_page_parser_exceptions
 @dataclass
 class PageParser:
+    """
+    Works with website pages through the selenium driver.
+    Extraction modes:
+    - element - each element is found and read by separate WebDriver commands;
+    - batch - all page elements are extracted by one script in the browser;
+    - snapshot - the page source is taken once and parsed locally by lxml.
+    Readiness sets the conditions of wait_until_page_ready,
+    scrolling sets the settings of scroll_to_element.
+    If the cache is set, the pages opened by open_page are cached (see open_page).
+    If cache_elements is True, the found elements are reused until the page is changed:
+    the element cache is cleared by open_page, wait_until_page_ready, scrolling and clicks,
+    and when a cached element is stale. Call clear_element_cache if the page is changed
+    by the driver directly.
+    If raise_errors is True, the errors of the methods are raised instead of being logged and swallowed.
+    """
     driver: webdriver
+    extraction_mode: Extraction_mode = 'element'
+    readiness: PageReadiness = field(default_factory=PageReadiness)
+    scrolling: PageScrolling = field(default_factory=PageScrolling)
+    cache: ResponseCache = None
+    cache_elements: bool = True
+    raise_errors: bool = False
+
+    def __post_init__(self):
+        # waiting and scrolling run as async scripts, so they must not be stopped by the script timeout
+        self.driver.set_script_timeout(max(self.readiness.timeout, self.scrolling.timeout) + 5)
+        self._page_to_cache: Link | None = None
+        self._cached_page_url: Link | None = None
+        self._request_headers: dict[str, str] | None = None
+        self._found_elements: dict[tuple[str, bool], WebElement | list[WebElement]] = {}
 
     @write_log(before_msg="Page opening...", after_msg="Page opened.")
-    def open_page(self, page_url: Link, delay_after: Second = 0) -> NoReturn:
+    def open_page(self, page_url: Link, delay_after: Second = 0) -> bool:
         """
-        Open website page by link.
+        Open website page by link, returns True if the page is opened.
+        If the cache is set and the page is cached, the cached page source (without scripts)
+        is written to the blank page instead of loading the page; otherwise the rendered
+        page source is cached, when the ready page is extracted by get_data_from_page_elements
+        or its snapshot is taken, so the content loaded by scrolling is cached too.
         You can set a delay after opening the page.
         """
-        self.driver.get(url=page_url)
+        self._page_to_cache = self._cached_page_url = None
+        self.clear_element_cache()
+        cached_response = self.cache.get(page_url, self._get_request_headers()) if self.cache else None
+        if cached_response:
+            self.driver.get(url='about:blank')
+            self.driver.execute_script(WRITE_PAGE_SOURCE,
+                                       make_static_page_source(cached_response.page_source, cached_response.url))
+            self._cached_page_url = cached_response.url
+        else:
+            self.driver.get(url=page_url)
+            self._page_to_cache = page_url if self.cache else None
         time.sleep(delay_after)
+        return True
+
+    def get_current_url(self) -> Link:
+        """Returns URL of the current page"""
+        return self._cached_page_url or self.driver.current_url
+
+    def _get_request_headers(self) -> dict[str, str]:
+        """Returns the browser request headers, that the cache key depends on"""
+        if self._request_headers is None:
+            self._request_headers = {'User-Agent': self.driver.execute_script("return navigator.userAgent")}
+        return self._request_headers
+
+    def _cache_page(self, page_source: Html = None, page_url: Link = None) -> NoReturn:
+        """
+        Saves the rendered source of the opened page to the cache,
+        the page source is taken from the browser if it is not given.
+        """
+        if page_source is None:
+            page_source, page_url = self.driver.execute_script(GET_PAGE_SOURCE)
+        self.cache.put(self._page_to_cache, page_source,
+                       final_url=page_url,
+                       headers=self._get_request_headers())
+        self._page_to_cache = None
+
+    @write_log(before_msg="Waiting for the page to be ready...", after_msg="Page is ready.")
+    def wait_until_page_ready(self, end_of_page: Element_for_parsing = None) -> bool:
+        """
+        Waits in the browser until the page meets the readiness conditions,
+        returns as soon as the page is usable.
+        Returns False if the page is not ready after readiness.timeout.
+        """
+        self.clear_element_cache()
+        xpath = end_of_page.value.xpath if end_of_page else None
+        state: dict = self.driver.execute_async_script(WAIT_UNTIL_PAGE_READY,
+                                                       self.readiness.ready_state,
+                                                       xpath,
+                                                       self.readiness.network_quiet_time * 1000,
+                                                       self.readiness.timeout * 1000)
+        if not state['ready']:
+            logger.warning(f"Page is not ready after {self.readiness.timeout} seconds: {state}")
+            # the page, that is not ready, is not cached
+            self._page_to_cache = None
+        time.sleep(self.readiness.fallback_delay)
+        return state['ready']
 
     @write_log(before_msg="Closing browser window...", after_msg="Browser window has been closed.")
     def close_browser_window(self) -> NoReturn:
@@ -101,7 +276,7 @@ class PageParser:
         If element not found returns None.
         """
         if hasattr(elem.value, 'xpath'):
-            return self.driver.find_element(by=By.XPATH, value=elem.value.xpath)
+            return self._find_by_xpath(elem.value.xpath, many=False)
         else:
             print(f" {elem.name} has no 'xpath' attribute")
             raise NotSupportedAttribute
@@ -113,7 +288,7 @@ class PageParser:
         If no elements are found, empty list is returned.
         """
         if hasattr(elem.value, 'xpath'):
-            return self.driver.find_elements(by=By.XPATH, value=elem.value.xpath)
+            return self._find_by_xpath(elem.value.xpath, many=True)
         else:
             print(f" {elem.name} has no 'xpath' attribute")
             raise NotSupportedAttribute
@@ -124,37 +299,55 @@ class PageParser:
                                delay_after: Second = 0) -> WebElement | None:
         """
         Scrolls page until find stop_scroll_elem or elem.
-        If stop_scroll_elem is found then the loop is stops.
-        So stop_scroll_elem always has to be on the page, otherwise the loop will continue indefinitely.
+        If stop_scroll_elem is found then the scrolling stops and None is returned.
         Stop_scroll_elem must be below the elem.
         Most often elements stop_scroll_elem and elem are match.
         You can set a delay after the element is found.
         """
-        actions = ActionChains(self.driver)
-        stop_block: WebElement = self.find_element(elem=stop_scroll_elem)
-        block: WebElement = self.find_element(elem=elem)
-        while not stop_block:
-            if block:
-                actions.scroll_to_element(block).perform()
-                break
-            else:
-                self.driver.execute_script(
-                    'window.scrollTo(0, window.scrollY + 1000)'
-                )
-        else:
-            if block:
-                actions.scroll_to_element(block).perform()
-            elif stop_block:
-                actions.scroll_to_element(stop_block).perform()
-            else:
-                raise ElementNotFound
+        report: ScrollReport = self.scroll_to_element(elem=elem, stop_scroll_elem=stop_scroll_elem)
+        if report.element:
             time.sleep(delay_after)
-        return block if block else None
+        return report.element
+
+    @write_log(before_msg="Scrolling to element...", after_msg="Scrolling completed.")
+    def scroll_to_element(self, elem: Element_for_parsing,
+                          stop_scroll_elem: Element_for_parsing) -> ScrollReport:
+        """
+        Scrolls page in the browser by one async script until elem or stop_scroll_elem appears,
+        the page height stops growing, scrolling.timeout expires or scrolling.max_steps are made.
+        The found element is scrolled into view.
+        """
+        if not hasattr(elem.value, 'xpath') or not hasattr(stop_scroll_elem.value, 'xpath'):
+            print(f" {elem.name} or {stop_scroll_elem.name} has no 'xpath' attribute")
+            raise NotSupportedAttribute
+
+        # scrolling can load new content, so the found elements are not reused
+        self.clear_element_cache()
+        result: dict = self.driver.execute_async_script(SCROLL_TO_ELEMENT,
+                                                        elem.value.xpath,
+                                                        stop_scroll_elem.value.xpath,
+                                                        self.scrolling.step,
+                                                        self.scrolling.pause * 1000,
+                                                        self.scrolling.timeout * 1000,
+                                                        self.scrolling.max_steps)
+        report = ScrollReport(element=result['element'],
+                              steps=result['steps'],
+                              elapsed=result['elapsed_ms'] / 1000,
+                              reason=result['reason'])
+        if report.element and self.cache_elements:
+            self._found_elements[elem.value.xpath, False] = report.element
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Scrolling to '{elem.name}': {report.reason}, "
+                         f"{report.steps} steps, {report.elapsed:.3f} seconds")
+        return report
 
     @write_log(before_msg="Looking for arising element...", after_msg="Arising element found.")
     def find_arising_element(self, elem: Element_for_parsing,
                              appearance_delay: Second = 5) -> WebDriverWait | None:
         """Looks for the element that appears on the page"""
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as ec
+
         try:
             result = WebDriverWait(self.driver, appearance_delay).until(
                 ec.presence_of_element_located((By.XPATH, elem.value.xpath))
@@ -168,24 +361,86 @@ class PageParser:
     def fill_in_field(self, field: Element_for_parsing, data: str,
                       delay_after: Second = 0) -> NoReturn:
         """Fills the field after clearing it"""
-        field: WebElement = self.find_element(field)
-        field.clear()
-        field.send_keys(data)
+        def fill_in(element: WebElement):
+            element.clear()
+            element.send_keys(data)
+
+        self._use_found_element(field, fill_in)
         time.sleep(delay_after)
 
     @write_log(before_msg="Clicking on element...", after_msg="Click completed.")
     def click_element(self, elem: Element_for_parsing) -> NoReturn:
         """Looks for element on a website page and then clicks on it."""
-        element: WebElement = self.find_element(elem)
-        element.click()
+        self._use_found_element(elem, lambda element: element.click())
+        # the click can open another page
+        self.clear_element_cache()
+
+    @write_log(before_msg="Getting element link...", after_msg="Element link has been got.")
+    def get_element_link(self, elem: Element_for_parsing) -> Link | None:
+        """
+        Returns the absolute link of the element (or of the link around it) in one WebDriver round trip,
+        the element found by scrolling is not looked for again.
+        Returns None if the element has no link to another page.
+        """
+        return self._use_found_element(elem, lambda element: self.driver.execute_script(GET_ELEMENT_LINK, element))
+
+    @write_log(before_msg="Opening page by click...", after_msg="Page opened by click.")
+    def open_page_by_click(self, elem: Element_for_parsing) -> bool:
+        """
+        Clicks on the element, that opens another page (e.g. "next page" button),
+        and waits until the page is changed, so the readiness of the old page
+        is not taken for the readiness of the new one.
+        The page is changed when another document is loaded, the URL is changed or,
+        if the page is changed in the same document (AJAX pagination), when the body content is changed.
+        Returns False if the page is not changed after readiness.timeout.
+        """
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        old_state: list = self.driver.execute_script(GET_PAGE_STATE)
+        self._use_found_element(elem, lambda element: element.click())
+        self.clear_element_cache()
+        try:
+            # the scripts can fail, while the old document is unloaded
+            WebDriverWait(self.driver, self.readiness.timeout, poll_frequency=0.05,
+                          ignored_exceptions=(JavascriptException,)).until(
+                lambda driver: driver.execute_script(GET_PAGE_STATE) != old_state
+            )
+        except TimeoutException:
+            logger.warning(f"Page is not changed after clicking '{elem.name}' "
+                           f"in {self.readiness.timeout} seconds")
+            return False
+        return True
+
+    @write_log(before_msg="Taking page snapshot...", after_msg="Page snapshot has been taken.")
+    def take_page_snapshot(self) -> PageSnapshot:
+        """
+        Takes the page source in one WebDriver round trip.
+        The snapshot is parsed on the first query, so it can be done
+        while the browser loads the next page.
+        """
+        page_source, page_url = self.driver.execute_script(GET_PAGE_SOURCE)
+        if self._page_to_cache:
+            self._cache_page(page_source, page_url)
+        # the cached page is written to 'about:blank', so its links are resolved by the cached URL
+        return PageSnapshot(page_source=page_source, page_url=self._cached_page_url or page_url)
+
+    @write_log(before_msg="Getting page fingerprint...", after_msg="Page fingerprint has been got.")
+    def get_page_fingerprint(self, elements: Sequence[Element_for_parsing]) -> str:
+        """Returns the hash of html of the page elements, that is taken in one WebDriver round trip."""
+        xpaths: list[str] = [elem.value.xpath for elem in elements]
+        return hash_content(self.driver.execute_script(GET_ELEMENTS_HTML, xpaths))
 
     @write_log(before_msg="Collecting data from element...", after_msg="Element data has been collected.")
-    def get_data_from_identical_elements(self, elem: Element_for_parsing) -> dict[int, str] | str:
+    def get_data_from_identical_elements(self, elem: Element_for_parsing
+                                         ) -> dict[int, str] | str | list[dict[str, list[str] | str | None]]:
         """
         Gets data from page element.
-        :return: dict if there are many elements, str if there is one element.
+        :return: dict if there are many elements, str if there is one element,
+                 list of records if the element is a container.
         """
-        if elem.value.many:
+        if isinstance(elem.value, ContainerElem):
+            result = self._extract_records(elem)
+        elif elem.value.many:
             result = self._extract_data_from_elements(elem)
         else:
             result = self._extract_data_from_element(elem)
@@ -195,23 +450,49 @@ class PageParser:
     def get_data_from_page_elements(self, elements: Sequence[Element_for_parsing]
                                     ) -> dict[str, dict | str]:
         """Gets data for each element from a sequence."""
-        return {elem.name: self.get_data_from_identical_elements(elem) for elem in elements}
+        # the page is cached just before the extraction, after the lazy content is loaded by scrolling;
+        # the snapshot mode caches the page source, that it takes
+        if self._page_to_cache and self.extraction_mode != 'snapshot':
+            self._cache_page()
+        match self.extraction_mode:
+            case 'batch':
+                return self._extract_data_by_script(elements)
+            case 'snapshot':
+                return self.take_page_snapshot().get_data_from_page_elements(elements)
+            case _:
+                return {elem.name: self.get_data_from_identical_elements(elem) for elem in elements}
 
-    def _extract_data_from_element(self, elem: Element_for_parsing) -> str:
+    def _extract_data_by_script(self, elements: Sequence[Element_for_parsing]) -> dict[str, dict | str]:
+        """
+        Extracts data from all elements in one WebDriver round trip.
+        The result has the same shape as in the 'element' extraction mode.
+        """
+        schema: list[list] = get_extraction_schema(tuple(elements))
+        extracted_data: dict = self.driver.execute_script(EXTRACT_PAGE_ELEMENTS, schema)
+        return {elem.name: (dict(enumerate(extracted_data[elem.name], start=1))
+                            if elem.value.many and not isinstance(elem.value, ContainerElem)
+                            else extracted_data[elem.name])
+                for elem in elements}
+
+    def _extract_data_from_element(self, elem: Element_for_parsing) -> str | None:
         """
         Extracts data from element in depending on data type
         specified in the element.value.extracted_data_type.
+        The missing element is None, as in the batch and snapshot modes, even if the errors are raised.
         """
-        match elem.value.extracted_data_type:
-            case 'text':
-                selenium_elem: WebElement = self.find_element(elem)
-                return selenium_elem.text
-            case 'url':
-                selenium_elem: WebElement = self.find_element(elem)
-                return selenium_elem.get_attribute(elem.value.extracted_tag)
-            case _:
-                selenium_elem: WebElement = self.find_element(elem)
-                return selenium_elem.get_attribute("innerHTML")
+        try:
+            match elem.value.extracted_data_type:
+                case 'text':
+                    return self._use_found_element(elem, lambda selenium_elem: selenium_elem.text)
+                case 'url':
+                    return self._use_found_element(
+                        elem, lambda selenium_elem: selenium_elem.get_attribute(elem.value.extracted_tag)
+                    )
+                case _:
+                    return self._use_found_element(elem,
+                                                   lambda selenium_elem: selenium_elem.get_attribute("innerHTML"))
+        except NoSuchElementException:
+            return None
 
     def _extract_data_from_elements(self, elem: Element_for_parsing) -> dict[int, str]:
         """
@@ -220,14 +501,61 @@ class PageParser:
         """
         match elem.value.extracted_data_type:
             case 'text':
-                selenium_elements: list[WebElement] = self.find_elements(elem)
-                return {number: selenium_elem.text
-                        for number, selenium_elem in enumerate(selenium_elements, start=1)}
+                return self._use_found_elements(elem, lambda selenium_elem: selenium_elem.text)
             case 'url':
-                selenium_elements: list[WebElement] = self.find_elements(elem)
-                return {number: selenium_elem.get_attribute(elem.value.extracted_tag)
-                        for number, selenium_elem in enumerate(selenium_elements, start=1)}
+                return self._use_found_elements(
+                    elem, lambda selenium_elem: selenium_elem.get_attribute(elem.value.extracted_tag)
+                )
             case _:
-                selenium_elements: list[WebElement] = self.find_elements(elem)
-                return {number: selenium_elem.get_attribute("innerHTML")
-                        for number, selenium_elem in enumerate(selenium_elements, start=1)}
+                return self._use_found_elements(elem, lambda selenium_elem: selenium_elem.get_attribute("innerHTML"))
+
+    def _extract_records(self, elem: Element_for_parsing) -> list[dict[str, list[str] | str | None]]:
+        """
+        Extracts the records of all found containers in one WebDriver round trip,
+        the fields are looked for inside the container by relative xpaths.
+        Reading them by separate commands would cost a round trip per field of every container.
+        """
+        schema: list[list] = get_extraction_schema((elem,))
+        return self.driver.execute_script(EXTRACT_PAGE_ELEMENTS, schema)[elem.name]
+
+    def clear_element_cache(self) -> NoReturn:
+        """Forgets the found elements, they are found again on the next use"""
+        self._found_elements.clear()
+
+    def _find_by_xpath(self, xpath: str, many: bool) -> WebElement | list[WebElement]:
+        """Looks for the element (or elements if many is True) in the element cache, then on the page"""
+        key = (xpath, many)
+        if self.cache_elements and key in self._found_elements:
+            return self._found_elements[key]
+
+        if many:
+            found = self.driver.find_elements(by=By.XPATH, value=xpath)
+        else:
+            found = self.driver.find_element(by=By.XPATH, value=xpath)
+        if self.cache_elements:
+            self._found_elements[key] = found
+        return found
+
+    def _use_found_element(self, elem: Element_for_parsing, use: Callable[[WebElement], Any]) -> Any:
+        """
+        Finds the element and returns the result of use(element).
+        If the cached element is stale, the element cache is cleared and the element is found again.
+        """
+        try:
+            return use(self.find_element(elem))
+        except StaleElementReferenceException:
+            self.clear_element_cache()
+            return use(self.find_element(elem))
+
+    def _use_found_elements(self, elem: Element_for_parsing, use: Callable[[WebElement], Any]) -> dict[int, Any]:
+        """
+        Finds the identical elements and returns {number: use(element)}.
+        If a cached element is stale, the element cache is cleared and the elements are found again.
+        """
+        try:
+            return {number: use(selenium_elem)
+                    for number, selenium_elem in enumerate(self.find_elements(elem), start=1)}
+        except StaleElementReferenceException:
+            self.clear_element_cache()
+            return {number: use(selenium_elem)
+                    for number, selenium_elem in enumerate(self.find_elements(elem), start=1)}
@@ -0,0 +1,65 @@
+from dataclasses import dataclass
+from typing import NoReturn
+
+import httpx
+
+from parsing.snapshot import PageSnapshot
+from parsing.snapshot_parser import SnapshotPageParser
+from parsing.response_cache import ResponseCache
+from utils.type_hinting import Second, Link
+from utils.decorators import handle_page_parser_exceptions, write_log
+
+
+@handle_page_parser_exceptions
+@dataclass
+class HttpPageParser(SnapshotPageParser):
+    """
+    Works with static website pages without a browser.
+    Has the same surface as PageParser, so PageDataCollector works with it unchanged.
+    Pages are fetched by the pooled keep-alive HTTP client and parsed locally by lxml.
+    If the cache is set, the cached pages are not fetched again.
+    """
+    headers: dict[str, str] = None
+    max_connections: int = 10
+    timeout: Second = 10
+    cache: ResponseCache = None
+
+    def __post_init__(self):
+        super().__post_init__()
+        self.client = httpx.Client(headers=self.headers,
+                                   timeout=self.timeout,
+                                   follow_redirects=True,
+                                   limits=httpx.Limits(max_connections=self.max_connections,
+                                                       max_keepalive_connections=self.max_connections))
+
+    @write_log(before_msg="Page opening...", after_msg="Page opened.")
+    def open_page(self, page_url: Link, delay_after: Second = 0) -> bool:
+        """
+        Fetches website page by link, returns True if the page is opened.
+        If the page is not fetched, there is no snapshot, so the previous page is not taken for it.
+        delay_after is accepted for compatibility with PageParser and ignored:
+        nothing is rendered, so there is nothing to wait for.
+        """
+        self.snapshot = None
+        self.response_headers = {}
+        cached_response = self.cache.get(page_url, self.client.headers) if self.cache else None
+        if cached_response:
+            self.response_headers = cached_response.headers
+            self.snapshot = PageSnapshot(page_source=cached_response.page_source, page_url=cached_response.url)
+            return True
+
+        response = self.client.get(page_url)
+        response.raise_for_status()
+        self.response_headers = dict(response.headers)
+        self.snapshot = PageSnapshot(page_source=response.text, page_url=str(response.url))
+        if self.cache:
+            self.cache.put(page_url, response.text,
+                           final_url=str(response.url),
+                           headers=self.client.headers,
+                           response_headers=self.response_headers)
+        return True
+
+    @write_log(before_msg="Closing HTTP client...", after_msg="HTTP client has been closed.")
+    def close_browser_window(self) -> NoReturn:
+        """Closes the HTTP client and all its connections"""
+        self.client.close()
@@ -0,0 +1,175 @@
+import gzip
+import json
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, Future
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, NoReturn, Sequence
+
+from parsing.exceptions import PageNotFound
+from parsing.snapshot import PageSnapshot
+from parsing.snapshot_parser import SnapshotPageParser
+from utils.ndjson_sink import NdjsonSink
+from utils.type_hinting import Second, Link, Element_for_parsing
+from utils.decorators import handle_page_parser_exceptions, write_log
+
+
+@dataclass
+class PageArchive:
+    """
+    Archive of the rendered pages.
+    Every page is one NDJSON record with url, page_url (after redirects), recorded_at,
+    metadata and page_source; the records are written to gzip files rotated by rotate_size:
+    'pages.00001.ndjson.gz', 'pages.00002.ndjson.gz', ... ('pages.ndjson.gz' if rotate_size is None).
+    The records can be read while the archive is being recorded.
+    Example:
+    PageArchive(Path('archive', 'pages.ndjson'))
+    """
+    archive_path: Path
+    rotate_size: int = 256 * 1024 ** 2
+
+    def __post_init__(self):
+        # the archive is shared by the pool threads, so the writing is guarded by the lock
+        self._lock = threading.Lock()
+        self._readers: dict[Path, gzip.GzipFile] = {}
+        self._sink = NdjsonSink(file_path=self.archive_path,
+                                compression='gzip',
+                                buffer_size=1024 ** 2,
+                                rotate_size=self.rotate_size,
+                                fsync='rotate')
+
+    def record(self, url: Link, snapshot: PageSnapshot, metadata: dict = None) -> NoReturn:
+        """Saves the page snapshot, url is the link that the page was opened by"""
+        with self._lock:
+            self._sink.write({'url': url,
+                              'page_url': snapshot.page_url,
+                              'recorded_at': time.time(),
+                              'metadata': metadata or {},
+                              'page_source': snapshot.page_source})
+
+    def get_archive_files(self) -> list[Path]:
+        """Returns the archive files in the order of recording"""
+        unrotated_file = self.archive_path.with_name(f"{self.archive_path.name}.gz")
+        rotated_files = sorted(self.archive_path.parent.glob(f"{self.archive_path.stem}.*"
+                                                             f"{self.archive_path.suffix}.gz"))
+        return [unrotated_file, *rotated_files] if unrotated_file.exists() else rotated_files
+
+    def iter_records(self) -> Iterator[dict]:
+        """Iterates over all records of the archive in the order of recording"""
+        for _, _, record in self.iter_indexed_records():
+            yield record
+
+    def iter_indexed_records(self) -> Iterator[tuple[Path, int, dict]]:
+        """
+        Iterates over all records of the archive with their positions:
+        the archive file and the offset of the record in the uncompressed file (see read_record).
+        """
+        with self._lock:
+            # the recorded pages are written and their gzip stream is ended, so they can be read
+            self._sink.end_stream()
+            # the files could grow since they were opened
+            for reader in self._readers.values():
+                reader.close()
+            self._readers.clear()
+        for archive_file in self.get_archive_files():
+            with gzip.open(archive_file, mode='rb') as lines:
+                while True:
+                    offset = lines.tell()
+                    line = lines.readline()
+                    if not line:
+                        break
+                    yield archive_file, offset, json.loads(line)
+
+    def read_record(self, archive_file: Path, offset: int) -> dict:
+        """
+        Reads one record by its position (see iter_indexed_records).
+        The archive files are kept open, so the records, that are read in the order of recording,
+        are not decompressed from the beginning of the file.
+        """
+        with self._lock:
+            reader = self._readers.get(archive_file)
+            if reader is None:
+                reader = self._readers[archive_file] = gzip.open(archive_file, mode='rb')
+            reader.seek(offset)
+            return json.loads(reader.readline())
+
+    @write_log(before_msg="Replaying archived pages...",
+               after_msg="Archived pages have been replayed.")
+    def replay(self, elements: Sequence[Element_for_parsing], workers: int = 1
+               ) -> Iterator[dict[str, dict | str]]:
+        """
+        Extracts data from every archived page without a browser.
+        With workers > 1 pages are parsed by several processes.
+        Returns data in the same format as PageDataCollector.
+        """
+        snapshots = ((record['page_source'], record['page_url']) for record in self.iter_records())
+        if workers <= 1:
+            for page_source, page_url in snapshots:
+                yield _extract_data_from_snapshot(page_source, page_url, elements)
+            return
+
+        # the number of pages in work is limited, so the whole archive is not loaded into memory
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures: deque[Future] = deque()
+            for page_source, page_url in snapshots:
+                futures.append(executor.submit(_extract_data_from_snapshot, page_source, page_url, elements))
+                if len(futures) >= workers * 4:
+                    yield futures.popleft().result()
+            while futures:
+                yield futures.popleft().result()
+
+    def close(self) -> NoReturn:
+        with self._lock:
+            self._sink.close()
+            for reader in self._readers.values():
+                reader.close()
+            self._readers.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def _extract_data_from_snapshot(page_source: str, page_url: Link,
+                                elements: Sequence[Element_for_parsing]) -> dict[str, dict | str]:
+    return PageSnapshot(page_source=page_source, page_url=page_url).get_data_from_page_elements(elements)
+
+
+@handle_page_parser_exceptions
+@dataclass
+class ReplayPageParser(SnapshotPageParser):
+    """
+    Opens pages from the archive instead of the website, so PageDataCollector
+    can extract data from the recorded pages without a browser.
+    If the page was recorded several times, the last record is used.
+    Only the positions of the records are kept in memory, the pages are read from the archive when opened.
+    """
+    archive: PageArchive = None
+
+    def __post_init__(self):
+        super().__post_init__()
+        self._records: dict[Link, tuple[Path, int]] = {}
+        for archive_file, offset, record in self.archive.iter_indexed_records():
+            self._records[record['url']] = self._records[record['page_url']] = (archive_file, offset)
+
+    @property
+    def archived_links(self) -> list[Link]:
+        """Links of all archived pages"""
+        return list(self._records)
+
+    @write_log(before_msg="Page opening from archive...", after_msg="Page opened.")
+    def open_page(self, page_url: Link, delay_after: Second = 0) -> bool:
+        """
+        Opens the archived page by link, returns True if the page is opened.
+        delay_after is accepted for compatibility with PageParser and ignored.
+        """
+        self.snapshot = None
+        if page_url not in self._records:
+            raise PageNotFound(f"Page '{page_url}' is not archived.")
+        record = self.archive.read_record(*self._records[page_url])
+        self.snapshot = PageSnapshot(page_source=record['page_source'], page_url=record['page_url'])
+        return True
@@ -0,0 +1,83 @@
+from contextlib import contextmanager
+from dataclasses import dataclass
+from queue import Queue
+from typing import Callable, Iterator, NoReturn
+
+from parsing.general_methods import PageParser
+from parsing.exceptions import ValueIsWrong
+from selenium_drivers.driver_factory import DriverFactory
+from utils.decorators import write_log
+
+
+@dataclass
+class ParserPool:
+    """
+    Pool of parsers, each with its own driver.
+    Every parser is used by one thread at a time.
+    With driver_factory the drivers are taken from the factory, so the pre-launched browsers are used,
+    create_parser then makes the parser for the driver (PageParser by default);
+    the drivers are given back to the factory, when the pool is closed.
+    Example:
+    ParserPool(create_parser=lambda: PageParser(driver=create_google_chrome_driver(mode='prod')), size=4)
+    ParserPool(driver_factory=DriverFactory(create_driver=create_google_chrome_driver, idle_count=4), size=4)
+    """
+    create_parser: Callable[..., PageParser] = None
+    size: int = 2
+    driver_factory: DriverFactory = None
+
+    def __post_init__(self):
+        if self.size < 1:
+            raise ValueIsWrong("Attribute 'ParserPool.size' must be greater than 0")
+        if self.create_parser is None and self.driver_factory is None:
+            raise ValueIsWrong("Set 'ParserPool.create_parser' or 'ParserPool.driver_factory'")
+
+        self.parsers: list[PageParser] = []
+        self._idle_parsers: Queue = Queue()
+        self._start_parsers()
+
+    @write_log(before_msg="Starting parsers pool...", after_msg="Parsers pool started.")
+    def _start_parsers(self) -> NoReturn:
+        """Creates all parsers, if one of them cannot be created, the created ones are closed."""
+        try:
+            for _ in range(self.size):
+                parser = self._create_parser()
+                self.parsers.append(parser)
+                self._idle_parsers.put(parser)
+        except Exception:
+            self.close()
+            raise
+
+    def _create_parser(self) -> PageParser:
+        if self.driver_factory is None:
+            return self.create_parser()
+        driver = self.driver_factory.acquire()
+        try:
+            return (self.create_parser or PageParser)(driver=driver)
+        except Exception:
+            self.driver_factory.release(driver)
+            raise
+
+    @contextmanager
+    def get_parser(self) -> Iterator[PageParser]:
+        """Takes an idle parser, waits if all parsers are busy, and gives it back after use."""
+        parser = self._idle_parsers.get()
+        try:
+            yield parser
+        finally:
+            self._idle_parsers.put(parser)
+
+    @write_log(before_msg="Closing parsers pool...", after_msg="Parsers pool has been closed.")
+    def close(self) -> NoReturn:
+        """Closes browser windows and drivers of all parsers, or gives the drivers back to the driver_factory"""
+        while self.parsers:
+            parser = self.parsers.pop()
+            if self.driver_factory is None:
+                parser.close_browser_window()
+            else:
+                self.driver_factory.release(parser.driver)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
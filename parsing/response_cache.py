@@ -0,0 +1,161 @@
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Mapping, NoReturn
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from lxml import html
+
+from utils.type_hinting import Second, Html, Link
+
+default_ports: dict[str, int] = {'http': 80, 'https': 443}
+
+
+def normalize_url(url: Link) -> Link:
+    """
+    Normalizes URL for the cache key:
+    lowercase scheme and host, no default port, no fragment, sorted query parameters.
+    """
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    netloc = (parts.hostname or '').lower()
+    if parts.port and parts.port != default_ports.get(scheme):
+        netloc = f"{netloc}:{parts.port}"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, netloc, parts.path or '/', query, ''))
+
+
+def make_static_page_source(page_source: Html, page_url: Link) -> Html:
+    """
+    Prepares the cached rendered page for writing to the browser:
+    removes scripts, so they are not executed again, and adds <base>, so relative links work.
+    """
+    document = html.document_fromstring(page_source)
+    for script in document.xpath('//script'):
+        script.drop_tree()
+    head = document.find('head')
+    if head is None:
+        head = html.Element('head')
+        document.insert(0, head)
+    head.insert(0, html.Element('base', href=page_url))
+    return html.tostring(document, encoding='unicode', method='html')
+
+
+@dataclass
+class CachedResponse:
+    url: Link
+    page_source: Html
+    headers: dict[str, str]
+
+
+@dataclass
+class ResponseCache:
+    """
+    Persistent cache of page responses in the SQLite file.
+    The key is the normalized URL plus values of vary_headers, the page sources are compressed by zlib.
+    Responses older than ttl are not returned; when the cache grows over max_size bytes,
+    the least recently used responses are evicted.
+    """
+    db_file: Path
+    ttl: Second = 24 * 60 * 60
+    max_size: int = 512 * 1024 ** 2
+    vary_headers: tuple[str, ...] = ('User-Agent', 'Accept-Language')
+
+    def __post_init__(self):
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        # the cache is shared by the pool threads, so the connection is guarded by the lock
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.db_file, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute("CREATE TABLE IF NOT EXISTS responses ("
+                                     "key TEXT PRIMARY KEY, url TEXT, body BLOB, headers TEXT, "
+                                     "size INTEGER, created_at REAL, accessed_at REAL)")
+            self._connection.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at "
+                                     "ON responses (accessed_at)")
+            # the size of the cache is kept up to date by put, so it is not summed up on every put
+            self._size: int = self._get_size()
+
+    def get(self, url: Link, headers: Mapping[str, str] = None) -> CachedResponse | None:
+        """Returns the cached response, None if it is not cached or expired"""
+        key = self._get_key(url, headers)
+        now = time.time()
+        with self._lock, self._connection:
+            row = self._connection.execute("SELECT url, body, headers FROM responses "
+                                           "WHERE key = ? AND created_at > ?",
+                                           (key, now - self.ttl)).fetchone()
+            if row is None:
+                return None
+            self._connection.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+
+        final_url, body, response_headers = row
+        return CachedResponse(url=final_url,
+                              page_source=zlib.decompress(body).decode('utf8'),
+                              headers=json.loads(response_headers))
+
+    def put(self, url: Link, page_source: Html, final_url: Link = None,
+            headers: Mapping[str, str] = None,
+            response_headers: Mapping[str, str] = None) -> NoReturn:
+        """
+        Saves the response.
+        url and headers are the request URL and headers, final_url is the URL after redirects.
+        """
+        key = self._get_key(url, headers)
+        body = zlib.compress(page_source.encode('utf8'))
+        now = time.time()
+        with self._lock, self._connection:
+            replaced_row = self._connection.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._connection.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                     (key, final_url or url, body,
+                                      json.dumps(dict(response_headers or {})), len(body), now, now))
+            self._size += len(body) - (replaced_row[0] if replaced_row else 0)
+            if self._size > self.max_size:
+                self._evict()
+
+    def clear(self) -> NoReturn:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM responses")
+            self._size = 0
+
+    def close(self) -> NoReturn:
+        with self._lock:
+            self._connection.close()
+
+    def _get_key(self, url: Link, headers: Mapping[str, str] = None) -> str:
+        headers = {name.lower(): value for name, value in (headers or {}).items()}
+        vary_values = [f"{name.lower()}={headers.get(name.lower(), '')}" for name in self.vary_headers]
+        return '\n'.join([normalize_url(url), *vary_values])
+
+    def _get_size(self) -> int:
+        return self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def _evict(self) -> NoReturn:
+        """
+        Removes expired responses and the least recently used ones, while the cache is too big.
+        It is called when the cache has grown over max_size, the size is counted again,
+        because the cache file can be shared with other processes.
+        """
+        self._connection.execute("DELETE FROM responses WHERE created_at <= ?", (time.time() - self.ttl,))
+        self._size = self._get_size()
+        if self._size <= self.max_size:
+            return
+
+        rows = self._connection.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall()
+        evicted_keys: list[tuple[str]] = []
+        for key, size in rows:
+            if self._size <= self.max_size:
+                break
+            evicted_keys.append((key,))
+            self._size -= size
+        self._connection.executemany("DELETE FROM responses WHERE key = ?", evicted_keys)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
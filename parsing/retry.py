@@ -0,0 +1,137 @@
+import random
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, Literal
+
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException,
+)
+
+from parsing.dead_letters import DeadLetterQueue
+from parsing.exceptions import ElementNotFound, RetriesExhausted
+from utils.type_hinting import Second, Link
+from utils.metrics import metrics
+from web_parser_logger.main import logger
+
+error_class_type = (Literal['stale_element'] | Literal['timeout'] | Literal['navigation']
+                    | Literal['missing_element'] | Literal['other'])
+
+
+def classify_error(error: BaseException) -> error_class_type:
+    """Returns the class of the error, that defines how the page is retried"""
+    # httpx is not imported here, its errors are recognized by the module name
+    is_httpx_error = type(error).__module__.startswith('httpx')
+    status_code: int | None = getattr(getattr(error, 'response', None), 'status_code', None)
+    match error:
+        case StaleElementReferenceException():
+            return 'stale_element'
+        case TimeoutException() | TimeoutError():
+            return 'timeout'
+        case _ if is_httpx_error and 'Timeout' in type(error).__name__:
+            return 'timeout'
+        case NoSuchElementException() | ElementNotFound():
+            return 'missing_element'
+        case WebDriverException() if 'net::ERR' in str(error.msg):
+            return 'navigation'
+        case ConnectionError():
+            return 'navigation'
+        case _ if is_httpx_error and status_code is not None and status_code < 500 and status_code != 429:
+            # the client errors are not fixed by retries
+            return 'other'
+        case _ if is_httpx_error:
+            return 'navigation'
+        case _:
+            return 'other'
+
+
+@contextmanager
+def raising_parser_errors(parser) -> Iterator:
+    """
+    Makes the parser raise the errors inside the block, so they are retried by the engine;
+    outside the block the parser handles the errors as it is set (see PageParser.raise_errors).
+    The parser is used by one thread at a time, so it is not changed for other threads.
+    """
+    raise_errors: bool = parser.raise_errors
+    parser.raise_errors = True
+    try:
+        yield parser
+    finally:
+        parser.raise_errors = raise_errors
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Retries of one error class:
+    - max_attempts - attempts including the first one,
+    - the delay before the n-th retry is base_delay * multiplier ** (n - 1), but not more than max_delay,
+      the delay is changed by the random part up to jitter, so the workers do not retry at the same time.
+    """
+    max_attempts: int = 3
+    base_delay: Second = 1
+    multiplier: float = 2
+    max_delay: Second = 30
+    jitter: float = 0.1
+
+    def get_delay(self, retry_number: int) -> Second:
+        delay = min(self.base_delay * self.multiplier ** (retry_number - 1), self.max_delay)
+        return delay * (1 + random.uniform(-self.jitter, self.jitter))
+
+
+DEFAULT_RETRY_POLICIES: dict[str, RetryPolicy] = {
+    # the page is collected again at once, the elements are found again
+    'stale_element': RetryPolicy(max_attempts=3, base_delay=0),
+    'timeout': RetryPolicy(max_attempts=3, base_delay=2),
+    'navigation': RetryPolicy(max_attempts=4, base_delay=5, max_delay=60),
+    # the page may not be rendered completely
+    'missing_element': RetryPolicy(max_attempts=2, base_delay=1),
+    'other': RetryPolicy(max_attempts=1),
+}
+
+
+@dataclass
+class RetryEngine:
+    """
+    Calls the page collection until it succeeds or the attempts of the error class run out.
+    The pages, that have failed for good, are saved to the dead-letter queue if it is set.
+    The parser must raise the errors in the called func (see raising_parser_errors),
+    PageDataCollector makes it raise them only inside the retried calls.
+    """
+    policies: dict[str, RetryPolicy] = field(default_factory=lambda: dict(DEFAULT_RETRY_POLICIES))
+    dead_letters: DeadLetterQueue = None
+
+    def call(self, url: Link, func: Callable, *args, **kwargs):
+        """
+        Returns the result of func.
+        :raise RetriesExhausted: if all attempts have failed.
+        """
+        attempts_count = 0
+        while True:
+            attempts_count += 1
+            try:
+                return func(*args, **kwargs)
+            except Exception as error:
+                error_class = classify_error(error)
+                policy = self.policies.get(error_class, DEFAULT_RETRY_POLICIES['other'])
+                if attempts_count >= policy.max_attempts:
+                    self._fail(url, error_class, error, attempts_count)
+                    raise RetriesExhausted(f"Page '{url}' has failed after {attempts_count} attempts: "
+                                           f"{error_class}") from error
+
+                metrics.increment('retries', operation=error_class)
+                delay = policy.get_delay(attempts_count)
+                logger.warning(f"{error_class} on '{url}' ({error.__class__.__name__}: {error}), "
+                               f"attempt {attempts_count} of {policy.max_attempts}, "
+                               f"retry in {delay:.1f} seconds")
+                time.sleep(delay)
+
+    def _fail(self, url: Link, error_class: str, error: Exception, attempts_count: int):
+        metrics.increment('dead_letters', operation=error_class)
+        logger.error(f"Page '{url}' has failed for good: {error_class} "
+                     f"({error.__class__.__name__}: {error})")
+        if self.dead_letters:
+            self.dead_letters.add(url, error_class, f"{error.__class__.__name__}: {error}", attempts_count)
@@ -0,0 +1,204 @@
+#  ---------------------------------------------------------------------------
+#   JavaScript sources that PageParser sends to the browser.
+#   Each script is executed in one WebDriver round trip.
+#  ---------------------------------------------------------------------------
+
+# arguments[0] - list of [name, xpath, extracted_data_type, extracted_tag, many, fields],
+# fields - list of [name, xpath, extracted_data_type, extracted_tag, many] relative to the container or null
+# returns {name: list[str] | str | null}, containers are lists of records {field name: value}
+EXTRACT_PAGE_ELEMENTS = """
+const schema = arguments[0];
+const result = {};
+
+function extract(node, dataType, tag) {
+    switch (dataType) {
+        case 'text':
+            return (node.innerText === undefined ? node.textContent : node.innerText).trim();
+        case 'url': {
+            const value = node[tag];
+            return (value === undefined || value === null) ? node.getAttribute(tag) : String(value);
+        }
+        default:
+            return node.innerHTML;
+    }
+}
+
+function findAll(xpath, contextNode) {
+    const nodes = document.evaluate(
+        xpath, contextNode, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null
+    );
+    const found = [];
+    for (let i = 0; i < nodes.snapshotLength; i++) {
+        found.push(nodes.snapshotItem(i));
+    }
+    return found;
+}
+
+function findFirst(xpath, contextNode) {
+    return document.evaluate(
+        xpath, contextNode, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+    ).singleNodeValue;
+}
+
+function extractRecord(container, fields) {
+    const record = {};
+    for (const [name, xpath, dataType, tag, many] of fields) {
+        if (many) {
+            record[name] = findAll(xpath, container).map(node => extract(node, dataType, tag));
+        } else {
+            const node = findFirst(xpath, container);
+            record[name] = node ? extract(node, dataType, tag) : null;
+        }
+    }
+    return record;
+}
+
+for (const [name, xpath, dataType, tag, many, fields] of schema) {
+    if (fields) {
+        result[name] = findAll(xpath, document).map(container => extractRecord(container, fields));
+    } else if (many) {
+        result[name] = findAll(xpath, document).map(node => extract(node, dataType, tag));
+    } else {
+        const node = findFirst(xpath, document);
+        result[name] = node ? extract(node, dataType, tag) : null;
+    }
+}
+return result;
+"""
+
+# returns [page source, page url]
+GET_PAGE_SOURCE = """
+return [document.documentElement.outerHTML, document.URL];
+"""
+
+# returns [root element of the document, page url, hash of the body content],
+# the page is changed if any of them is changed: another document is loaded, the URL is changed
+# by the history API or the content is replaced in the same document (AJAX pagination)
+GET_PAGE_STATE = """
+const content = document.body ? document.body.innerHTML : '';
+let contentHash = 0;
+for (let i = 0; i < content.length; i++) {
+    contentHash = (contentHash * 31 + content.charCodeAt(i)) | 0;
+}
+return [document.documentElement, document.URL, contentHash];
+"""
+
+# arguments[0] - element
+# returns the absolute link of the element (or of the link around it), null if it has no link to another page
+GET_ELEMENT_LINK = """
+const link = arguments[0].closest('a[href]');
+const href = link ? link.getAttribute('href').trim() : '';
+return (!href || href.startsWith('#') || href.startsWith('javascript:')) ? null : link.href;
+"""
+
+# arguments: ready_state, xpath | null, network_quiet_ms, timeout_ms, callback
+# returns {ready, elapsed_ms, ready_state, element, network_quiet}
+WAIT_UNTIL_PAGE_READY = """
+const [readyState, xpath, networkQuietMs, timeoutMs] = arguments;
+const done = arguments[arguments.length - 1];
+const states = ['loading', 'interactive', 'complete'];
+const start = performance.now();
+let resourcesCount = -1;
+let lastNetworkActivity = start;
+
+function check() {
+    const now = performance.now();
+    const currentResourcesCount = performance.getEntriesByType('resource').length;
+    if (currentResourcesCount !== resourcesCount) {
+        resourcesCount = currentResourcesCount;
+        lastNetworkActivity = now;
+    }
+    const state = {
+        ready_state: states.indexOf(document.readyState) >= states.indexOf(readyState),
+        element: !xpath || document.evaluate(
+            xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+        ).singleNodeValue !== null,
+        network_quiet: now - lastNetworkActivity >= networkQuietMs,
+        elapsed_ms: now - start
+    };
+    state.ready = state.ready_state && state.element && state.network_quiet;
+    if (state.ready || now - start >= timeoutMs) {
+        done(state);
+    } else {
+        setTimeout(check, 50);
+    }
+}
+check();
+"""
+
+# arguments: xpath, stop_xpath, step_px, pause_ms, timeout_ms, max_steps, callback
+# returns {element, steps, elapsed_ms, reason}
+SCROLL_TO_ELEMENT = """
+const [xpath, stopXpath, stepPx, pauseMs, timeoutMs, maxSteps] = arguments;
+const done = arguments[arguments.length - 1];
+const start = performance.now();
+const stableHeightChecks = 3;
+let steps = 0;
+let lastHeight = -1;
+let stableChecks = 0;
+
+function find(path) {
+    return document.evaluate(
+        path, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+    ).singleNodeValue;
+}
+
+function finish(element, reason, scrollTarget) {
+    if (scrollTarget) {
+        scrollTarget.scrollIntoView({block: 'center'});
+    }
+    done({element: element, steps: steps, elapsed_ms: performance.now() - start, reason: reason});
+}
+
+function tick() {
+    const element = find(xpath);
+    if (element) {
+        return finish(element, 'found', element);
+    }
+    const stopElement = find(stopXpath);
+    if (stopElement) {
+        return finish(null, 'stop_element', stopElement);
+    }
+    if (performance.now() - start >= timeoutMs) {
+        return finish(null, 'timeout');
+    }
+    if (steps >= maxSteps) {
+        return finish(null, 'max_steps');
+    }
+    // the page height stops growing, when there is nothing more to load
+    const height = document.documentElement.scrollHeight;
+    const atBottom = window.innerHeight + window.scrollY >= height - 1;
+    stableChecks = (atBottom && height === lastHeight) ? stableChecks + 1 : 0;
+    if (stableChecks >= stableHeightChecks) {
+        return finish(null, 'end_of_page');
+    }
+    lastHeight = height;
+    window.scrollBy(0, stepPx);
+    steps++;
+    setTimeout(tick, pauseMs);
+}
+tick();
+"""
+
+# arguments[0] - list of xpaths
+# returns outerHTML of all found elements joined by new lines
+GET_ELEMENTS_HTML = """
+const parts = [];
+for (const xpath of arguments[0]) {
+    const nodes = document.evaluate(
+        xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null
+    );
+    for (let i = 0; i < nodes.snapshotLength; i++) {
+        const node = nodes.snapshotItem(i);
+        parts.push(node.outerHTML === undefined ? node.textContent : node.outerHTML);
+    }
+}
+return parts.join('\\n');
+"""
+
+# arguments[0] - page source, that replaces the current document
+WRITE_PAGE_SOURCE = """
+document.open();
+document.write(arguments[0]);
+document.close();
+"""
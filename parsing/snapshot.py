@@ -0,0 +1,223 @@
+import re
+from dataclasses import dataclass
+from functools import lru_cache, cached_property
+from typing import Sequence
+from urllib.parse import urljoin
+from html import escape as escape_html
+
+from lxml import etree, html
+
+from parsing.exceptions import NotSupportedAttribute
+from utils.type_hinting import Html, Link, Element_for_parsing
+from utils.decorators import write_log
+from utils.for_building_input_data import HtmlElem, ContainerElem
+
+# Attributes that the browser returns as absolute URLs
+URL_ATTRIBUTES: tuple = ('href', 'src', 'action')
+
+
+@lru_cache(maxsize=None)
+def compile_xpath(xpath: str) -> etree.XPath:
+    """Compiles xpath once, next calls with the same xpath return the compiled one."""
+    return etree.XPath(xpath)
+
+
+# Elements, that are separated from the text around them by line breaks (<p> by an empty line)
+BLOCK_TAGS: frozenset[str] = frozenset({
+    'address', 'article', 'aside', 'blockquote', 'caption', 'dd', 'details', 'dialog', 'div', 'dl', 'dt',
+    'fieldset', 'figcaption', 'figure', 'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header',
+    'hgroup', 'hr', 'li', 'main', 'nav', 'ol', 'p', 'pre', 'section', 'summary', 'table', 'tbody',
+    'tfoot', 'thead', 'tr', 'ul'
+})
+# Elements, whose text is not rendered
+NOT_RENDERED_TAGS: frozenset[str] = frozenset({'head', 'noscript', 'script', 'style', 'template'})
+# Elements, whose whitespace is kept
+PREFORMATTED_TAGS: frozenset[str] = frozenset({'pre', 'textarea'})
+# Whitespace, that is collapsed by the browser, non-breaking space is kept
+COLLAPSIBLE_WHITESPACE = re.compile(r'[ \t\n\r\f]+')
+
+
+def get_inner_text(node: html.HtmlElement) -> str:
+    """
+    Returns the text of the element like innerText of the browser (see _InnerTextBuilder),
+    so 'text' is the same in all extraction modes.
+    """
+    return _InnerTextBuilder(node).get_text()
+
+
+class _InnerTextBuilder:
+    """
+    Builds the text of the element like innerText of the browser:
+    whitespace is collapsed, block elements are separated by line breaks (paragraphs by an empty line),
+    <br> is a line break, table cells are separated by tabs, scripts and styles are skipped.
+    The styles are not applied, so the elements hidden by CSS are not skipped.
+    """
+
+    def __init__(self, node: html.HtmlElement):
+        self._parts: list[str] = []
+        self._line_breaks = 0
+        self._space = False
+        self._add_element(node, preformatted=False)
+
+    def get_text(self) -> str:
+        return ''.join(self._parts).strip()
+
+    def _add_element(self, node: html.HtmlElement, preformatted: bool):
+        # comments and processing instructions have no string tag
+        if not isinstance(node.tag, str) or node.tag in NOT_RENDERED_TAGS:
+            return
+        if node.tag == 'br':
+            self._add_line_break()
+            return
+
+        preformatted = preformatted or node.tag in PREFORMATTED_TAGS
+        line_breaks = (2 if node.tag == 'p' else 1) if node.tag in BLOCK_TAGS else 0
+        self._require_line_breaks(line_breaks)
+        self._add_text(node.text, preformatted)
+        for child in node:
+            self._add_element(child, preformatted)
+            self._add_text(child.tail, preformatted)
+        if node.tag in ('td', 'th') and node.getnext() is not None:
+            self._parts.append('\t')
+            self._space = False
+        self._require_line_breaks(line_breaks)
+
+    def _add_text(self, text: str | None, preformatted: bool):
+        if not text:
+            return
+        if preformatted:
+            self._write_pending()
+            self._parts.append(text)
+            return
+
+        text = COLLAPSIBLE_WHITESPACE.sub(' ', text)
+        self._space = self._space or text.startswith(' ')
+        if text.strip(' '):
+            self._write_pending()
+            self._parts.append(text.strip(' '))
+            self._space = text.endswith(' ')
+
+    def _add_line_break(self):
+        # the space before the line break is not rendered
+        self._space = False
+        self._write_pending()
+        self._parts.append('\n')
+
+    def _require_line_breaks(self, count: int):
+        if count:
+            self._line_breaks = max(self._line_breaks, count)
+            self._space = False
+
+    def _write_pending(self):
+        """Writes the line breaks or the space, that are required before the next text"""
+        if self._line_breaks and self._parts:
+            self._parts.append('\n' * self._line_breaks)
+        elif self._space and self._parts and not self._parts[-1].endswith(('\n', '\t')):
+            self._parts.append(' ')
+        self._line_breaks = 0
+        self._space = False
+
+
+@dataclass
+class PageSnapshot:
+    """
+    Offline copy of the website page.
+    The page source is parsed on the first query, so the snapshot can be taken
+    from the driver quickly and parsed later (for example, in another thread).
+    """
+    page_source: Html
+    page_url: Link = None
+
+    @cached_property
+    def document(self) -> html.HtmlElement:
+        return html.document_fromstring(self.page_source, base_url=self.page_url)
+
+    def find_element(self, elem: Element_for_parsing) -> html.HtmlElement | None:
+        """
+        Looks for element in the page source by xpath.
+        If element not found returns None.
+        """
+        found_elements = self.find_elements(elem)
+        return found_elements[0] if found_elements else None
+
+    def find_elements(self, elem: Element_for_parsing) -> list[html.HtmlElement]:
+        """
+        Looks for identical elements in the page source by xpath.
+        If no elements are found, empty list is returned.
+        """
+        if hasattr(elem.value, 'xpath'):
+            return compile_xpath(elem.value.xpath)(self.document)
+        else:
+            print(f" {elem.name} has no 'xpath' attribute")
+            raise NotSupportedAttribute
+
+    def get_elements_html(self, elements: Sequence[Element_for_parsing]) -> Html:
+        """Returns html of all found elements joined by new lines"""
+        return '\n'.join(etree.tostring(node, encoding='unicode', method='html', with_tail=False)
+                         if isinstance(node, etree.ElementBase) else str(node)
+                         for elem in elements
+                         for node in self.find_elements(elem))
+
+    @write_log(before_msg="Collecting data from page snapshot...",
+               after_msg="Page snapshot data has been collected.",
+               operation='parse_snapshot')
+    def get_data_from_page_elements(self, elements: Sequence[Element_for_parsing]
+                                    ) -> dict[str, dict | str]:
+        """Gets data for each element from a sequence."""
+        return {elem.name: self.get_data_from_identical_elements(elem) for elem in elements}
+
+    def get_data_from_identical_elements(self, elem: Element_for_parsing
+                                         ) -> dict[int, str] | str | list[dict[str, list[str] | str | None]] | None:
+        """
+        Gets data from page element.
+        :return: dict if there are many elements, str if there is one element,
+                 None if the single element is not found, list of records if the element is a container.
+        """
+        if isinstance(elem.value, ContainerElem):
+            return [self._extract_record(node, elem.value.fields) for node in self.find_elements(elem)]
+
+        if elem.value.many:
+            return {number: self._extract_data(elem, node)
+                    for number, node in enumerate(self.find_elements(elem), start=1)}
+
+        node = self.find_element(elem)
+        return None if node is None else self._extract_data(elem, node)
+
+    def _extract_record(self, container: html.HtmlElement,
+                        fields: dict[str, HtmlElem]) -> dict[str, list[str] | str | None]:
+        """Extracts the fields, that are looked for inside the container by relative xpaths"""
+        record: dict[str, list[str] | str | None] = {}
+        for name, field_elem in fields.items():
+            nodes = compile_xpath(field_elem.xpath)(container)
+            if field_elem.many:
+                record[name] = [self._extract_value(field_elem, node) for node in nodes]
+            else:
+                record[name] = self._extract_value(field_elem, nodes[0]) if nodes else None
+        return record
+
+    def _extract_data(self, elem: Element_for_parsing, node: html.HtmlElement) -> str:
+        return self._extract_value(elem.value, node)
+
+    def _extract_value(self, elem_value: HtmlElem, node: html.HtmlElement) -> str:
+        """
+        Extracts data from node in depending on data type
+        specified in the elem_value.extracted_data_type.
+        The semantics are the same as in PageParser: 'text' is the element text as innerText,
+        'url' is the attribute value, anything else is inner html.
+        """
+        if not isinstance(node, etree.ElementBase):
+            # xpath points to an attribute or a text node
+            return str(node)
+
+        match elem_value.extracted_data_type:
+            case 'text':
+                return get_inner_text(node)
+            case 'url':
+                value = node.get(elem_value.extracted_tag)
+                if value is not None and elem_value.extracted_tag in URL_ATTRIBUTES:
+                    value = urljoin(self.page_url or '', value)
+                return value
+            case _:
+                return escape_html(node.text or '', quote=False) + ''.join(
+                    etree.tostring(child, encoding='unicode', method='html') for child in node
+                )
@@ -0,0 +1,155 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import NoReturn, Sequence
+from urllib.parse import urljoin
+
+from lxml import html
+
+from parsing.general_methods import ScrollReport
+from parsing.exceptions import ElementNotFound
+from parsing.snapshot import PageSnapshot
+from parsing.fingerprints import hash_content
+from utils.type_hinting import Second, Link, Element_for_parsing
+from utils.decorators import handle_page_parser_exceptions, write_log
+
+
+@handle_page_parser_exceptions
+@dataclass
+class SnapshotPageParser(ABC):
+    """
+    Base class of the parsers, that work with page snapshots without a browser.
+    Has the same surface as PageParser, so PageDataCollector works with them unchanged.
+    Subclasses get the page in open_page and set the snapshot (and response_headers if they have them),
+    the snapshot is None while the page is not opened.
+    If raise_errors is True, the errors of the methods are raised instead of being logged and swallowed.
+    """
+    raise_errors: bool = False
+
+    def __post_init__(self):
+        self.response_headers: dict[str, str] = {}
+        self.snapshot: PageSnapshot | None = None
+
+    @abstractmethod
+    def open_page(self, page_url: Link, delay_after: Second = 0) -> bool:
+        """Gets the page by link and sets the snapshot, returns True if the page is opened"""
+
+    def close_browser_window(self) -> NoReturn:
+        """There is no browser, so there is nothing to close"""
+
+    def get_current_url(self) -> Link:
+        """Returns URL of the page (after redirects)"""
+        return self.snapshot.page_url
+
+    def wait_until_page_ready(self, end_of_page: Element_for_parsing = None) -> bool:
+        """The page snapshot is ready at once, returns True if end_of_page is present (or not given)"""
+        return end_of_page is None or self.snapshot.find_element(end_of_page) is not None
+
+    @write_log(before_msg="Looking for element...", after_msg="Element found.")
+    def find_element(self, elem: Element_for_parsing) -> html.HtmlElement | None:
+        """
+        Looks for element on a website page by xpath.
+        If element not found returns None.
+        """
+        return self.snapshot.find_element(elem)
+
+    @write_log(before_msg="Looking for elements...", after_msg="Elements found.")
+    def find_elements(self, elem: Element_for_parsing) -> list[html.HtmlElement]:
+        """
+        Looks for identical elements on a website page by xpath.
+        If no elements are found, empty list is returned.
+        """
+        return self.snapshot.find_elements(elem)
+
+    @write_log(before_msg="Looking for elements by scroll...", after_msg="Element found by scrolling.")
+    def find_element_by_scroll(self, elem: Element_for_parsing,
+                               stop_scroll_elem: Element_for_parsing,
+                               delay_after: Second = 0) -> html.HtmlElement | None:
+        """
+        The static page has no lazy loading, so the element is looked up without scrolling.
+        stop_scroll_elem and delay_after are accepted for compatibility with PageParser.
+        """
+        return self.snapshot.find_element(elem)
+
+    @write_log(before_msg="Scrolling to element...", after_msg="Scrolling completed.")
+    def scroll_to_element(self, elem: Element_for_parsing,
+                          stop_scroll_elem: Element_for_parsing) -> ScrollReport:
+        """The static page is not scrolled, the report contains the element if it is present"""
+        element = self.snapshot.find_element(elem)
+        return ScrollReport(element=element,
+                            steps=0,
+                            elapsed=0,
+                            reason='end_of_page' if element is None else 'found')
+
+    @write_log(before_msg="Looking for arising element...", after_msg="Arising element found.")
+    def find_arising_element(self, elem: Element_for_parsing,
+                             appearance_delay: Second = 5) -> html.HtmlElement | None:
+        """Looks for the element, the static page does not change after loading"""
+        return self.snapshot.find_element(elem)
+
+    @write_log(before_msg="Clicking on element...", after_msg="Click completed.")
+    def click_element(self, elem: Element_for_parsing) -> NoReturn:
+        """
+        Looks for the link on a website page and then follows it.
+        Only elements with 'href' can be clicked without a browser.
+        """
+        element = self.snapshot.find_element(elem)
+        if element is None or not element.get('href'):
+            raise ElementNotFound(f"Element '{elem.name}' is not found or has no 'href'.")
+        self.open_page(page_url=urljoin(self.snapshot.page_url, element.get('href')))
+
+    @write_log(before_msg="Getting element link...", after_msg="Element link has been got.")
+    def get_element_link(self, elem: Element_for_parsing) -> Link | None:
+        """
+        Returns the absolute link of the element (or of the link around it).
+        Returns None if the element is not found or it has no link to another page.
+        """
+        element = self.snapshot.find_element(elem)
+        if not hasattr(element, 'xpath'):
+            return None
+        links = element.xpath("ancestor-or-self::a[@href][1]")
+        href: str = links[0].get('href').strip() if links else ''
+        if not href or href.startswith(('#', 'javascript:')):
+            return None
+        return urljoin(self.snapshot.page_url, href)
+
+    @write_log(before_msg="Opening page by click...", after_msg="Page opened by click.")
+    def open_page_by_click(self, elem: Element_for_parsing) -> bool:
+        """
+        Follows the link of the element at once.
+        Returns False if the new page is not opened (the element has no link or the page is not got).
+        """
+        snapshot = self.snapshot
+        self.click_element(elem)
+        return self.snapshot is not None and self.snapshot is not snapshot
+
+    @write_log(before_msg="Taking page snapshot...", after_msg="Page snapshot has been taken.")
+    def take_page_snapshot(self) -> PageSnapshot:
+        """Returns the snapshot of the opened page"""
+        return self.snapshot
+
+    @write_log(before_msg="Getting page fingerprint...", after_msg="Page fingerprint has been got.")
+    def get_page_fingerprint(self, elements: Sequence[Element_for_parsing]) -> str:
+        """
+        Returns ETag or Last-Modified of the response if the server sends them,
+        otherwise the hash of html of the page elements.
+        """
+        headers = {name.lower(): value for name, value in self.response_headers.items()}
+        if headers.get('etag'):
+            return f"etag:{headers['etag']}"
+        if headers.get('last-modified'):
+            return f"last-modified:{headers['last-modified']}"
+        return hash_content(self.snapshot.get_elements_html(elements))
+
+    @write_log(before_msg="Collecting data from element...", after_msg="Element data has been collected.")
+    def get_data_from_identical_elements(self, elem: Element_for_parsing) -> dict[int, str] | str:
+        """
+        Gets data from page element.
+        :return: dict if there are many elements, str if there is one element.
+        """
+        return self.snapshot.get_data_from_identical_elements(elem)
+
+    @write_log(before_msg="Collecting data from elements...", after_msg="Elements data has been collected..")
+    def get_data_from_page_elements(self, elements: Sequence[Element_for_parsing]
+                                    ) -> dict[str, dict | str]:
+        """Gets data for each element from a sequence."""
+        return self.snapshot.get_data_from_page_elements(elements)
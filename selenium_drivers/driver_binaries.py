@@ -0,0 +1,127 @@
+import json
+import os
+import re
+import subprocess
+from pathlib import Path
+from typing import Callable, Literal
+
+from selenium import webdriver
+from selenium.common.exceptions import SessionNotCreatedException
+
+from web_parser_logger.main import logger
+
+browser_type = Literal['chrome'] | Literal['firefox']
+
+# The driver binaries are found once per machine, their paths and versions are cached in this file
+cache_file = Path.home().joinpath('.cache', 'pages_parser', 'driver_binaries.json')
+
+# The path can be set explicitly by the environment variable
+env_variables: dict[str, str] = {
+    'chrome': 'CHROMEDRIVER_PATH',
+    'firefox': 'GECKODRIVER_PATH'
+}
+
+bundled_chromedriver = Path(__file__).parent.joinpath('chromedriver_win32', 'chromedriver')
+
+# The cached paths, that have been checked by this process
+_checked_paths: dict[str, str] = {}
+
+
+def get_driver_path(browser: browser_type) -> str:
+    """
+    Returns the path to the driver binary.
+    The path is looked for in the environment variable, then in the cache file,
+    otherwise the driver is found (or downloaded) by webdriver_manager and the path is cached.
+    The cached binary is used if it reports the cached version, it is checked once per process;
+    :param browser: chrome or firefox;
+    :return: path to the driver binary.
+    """
+    env_path = os.getenv(env_variables[browser])
+    if env_path:
+        return env_path
+    if browser in _checked_paths:
+        return _checked_paths[browser]
+
+    cached_paths: dict[str, dict[str, str]] = read_cached_paths()
+    cached_driver = cached_paths.get(browser)
+    if is_cached_driver_valid(cached_driver):
+        _checked_paths[browser] = cached_driver['path']
+        return cached_driver['path']
+
+    return cache_driver(browser, install_driver(browser))
+
+
+def reinstall_driver(browser: browser_type) -> str:
+    """Installs the driver by webdriver_manager, bypassing the cache and the bundled driver"""
+    return cache_driver(browser, install_driver(browser, use_bundled=False))
+
+
+def start_driver(browser: browser_type, start: Callable[[str], webdriver.Remote]) -> webdriver.Remote:
+    """
+    Starts the driver by the binary path.
+    If the cached binary does not match the browser (e.g. the browser has been updated),
+    the driver is installed again and started once more;
+    :param browser: chrome or firefox;
+    :param start: starts the driver by the binary path;
+    :return: instance of webdriver.
+    """
+    try:
+        return start(get_driver_path(browser))
+    except SessionNotCreatedException as error:
+        if os.getenv(env_variables[browser]):
+            raise
+        logger.warning(f"The {browser} driver does not match the browser, it is installed again: {error.msg}")
+        return start(reinstall_driver(browser))
+
+
+def install_driver(browser: browser_type, use_bundled: bool = True) -> str:
+    """Finds the driver binary, downloads it if necessary"""
+    if browser == 'chrome':
+        if use_bundled and bundled_chromedriver.exists():
+            return str(bundled_chromedriver)
+        from webdriver_manager.chrome import ChromeDriverManager
+        return ChromeDriverManager().install()
+    else:
+        from webdriver_manager.firefox import GeckoDriverManager
+        return GeckoDriverManager().install()
+
+
+def get_driver_version(driver_path: str) -> str | None:
+    """Returns the version, that the driver binary reports, None if it cannot be run"""
+    try:
+        completed = subprocess.run([driver_path, '--version'], capture_output=True, text=True,
+                                   timeout=10, check=True)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    found = re.search(r'\d+(?:\.\d+)+', completed.stdout)
+    return found.group() if found else None
+
+
+def is_cached_driver_valid(cached_driver: dict[str, str] | None) -> bool:
+    """The cached driver is valid if its binary exists and reports the cached version"""
+    if not isinstance(cached_driver, dict) or not Path(cached_driver.get('path', '')).is_file():
+        return False
+    return get_driver_version(cached_driver['path']) == cached_driver.get('version')
+
+
+def cache_driver(browser: browser_type, driver_path: str) -> str:
+    """Writes the driver path and version to the cache file"""
+    cached_paths: dict[str, dict[str, str]] = read_cached_paths()
+    cached_paths[browser] = {'path': driver_path, 'version': get_driver_version(driver_path)}
+    write_cached_paths(cached_paths)
+    _checked_paths[browser] = driver_path
+    return driver_path
+
+
+def read_cached_paths() -> dict[str, dict[str, str]]:
+    """Reads cached driver paths, returns empty dict if the cache file does not exist or is broken"""
+    try:
+        return json.loads(cache_file.read_text(encoding='utf8'))
+    except (OSError, ValueError):
+        return {}
+
+
+def write_cached_paths(paths: dict[str, dict[str, str]]) -> None:
+    """Writes driver paths to the cache file"""
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    cache_file.write_text(json.dumps(paths, indent=2), encoding='utf8')
@@ -0,0 +1,113 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from dataclasses import dataclass
+from queue import Queue, Empty
+from typing import Callable, NoReturn
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+
+from web_parser_logger.main import logger
+
+
+@dataclass
+class DriverFactory:
+    """
+    Keeps idle_count pre-launched browsers ready.
+    acquire() hands out an idle browser (or launches a new one if there are no idle ones),
+    release() resets the browser (cookies, storage, extra windows, about:blank)
+    and keeps it for the next acquire() instead of relaunching.
+    Example:
+    DriverFactory(create_driver=lambda: create_google_chrome_driver(mode='prod'), idle_count=2)
+    """
+    create_driver: Callable[[], webdriver.Remote]
+    idle_count: int = 1
+
+    def __post_init__(self):
+        self._is_closed = False
+        # the released browsers are not kept, while the factory is being closed
+        self._closing_lock = threading.Lock()
+        self._idle_drivers: Queue = Queue()
+        self._launcher = ThreadPoolExecutor(max_workers=max(self.idle_count, 1),
+                                            thread_name_prefix='driver_launcher')
+        self._launches: list[Future] = [self._launcher.submit(self._launch_idle_driver)
+                                        for _ in range(self.idle_count)]
+
+    def acquire(self) -> webdriver.Remote:
+        """
+        Returns an idle browser and launches a new idle one in the background.
+        If browsers are being launched, waits for one of them, otherwise launches a new browser.
+        """
+        while True:
+            try:
+                driver = self._idle_drivers.get(timeout=0.1)
+            except Empty:
+                if not self._is_launching():
+                    return self.create_driver()
+            else:
+                self._launches = [launch for launch in self._launches if not launch.done()]
+                self._launches.append(self._launcher.submit(self._launch_idle_driver))
+                return driver
+
+    def release(self, driver: webdriver.Remote) -> NoReturn:
+        """
+        Resets the browser and keeps it idle,
+        quits it if there are enough idle browsers or the factory is closed.
+        """
+        if self._is_closed or self._idle_drivers.qsize() >= self.idle_count:
+            driver.quit()
+            return
+
+        try:
+            reset_driver(driver)
+        except WebDriverException:
+            logger.exception("Browser cannot be reset, it will be closed.")
+            driver.quit()
+            return
+        with self._closing_lock:
+            if self._is_closed:
+                driver.quit()
+            else:
+                self._idle_drivers.put(driver)
+
+    def close(self) -> NoReturn:
+        """Waits for the launching browsers and closes all idle browsers, the released ones are closed then"""
+        with self._closing_lock:
+            self._is_closed = True
+        self._launcher.shutdown(wait=True, cancel_futures=True)
+        while not self._idle_drivers.empty():
+            self._idle_drivers.get_nowait().quit()
+
+    def _is_launching(self) -> bool:
+        return any(not launch.done() for launch in self._launches)
+
+    def _launch_idle_driver(self) -> NoReturn:
+        if self._idle_drivers.qsize() < self.idle_count:
+            self._idle_drivers.put(self.create_driver())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def reset_driver(driver: webdriver.Remote) -> webdriver.Remote:
+    """
+    Clears the browser state, so it can be used by the next job:
+    closes extra windows, clears storage and cookies and opens about:blank;
+    :param driver: instance of webdriver;
+    :return: instance of webdriver.
+    """
+    for window_handle in driver.window_handles[1:]:
+        driver.switch_to.window(window_handle)
+        driver.close()
+    driver.switch_to.window(driver.window_handles[0])
+
+    # the storage belongs to the current origin, so it is cleared before leaving the page
+    driver.execute_script("try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}")
+    if hasattr(driver, 'execute_cdp_cmd'):
+        driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+    driver.delete_all_cookies()
+    driver.get('about:blank')
+    return driver
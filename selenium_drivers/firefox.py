@@ -1,10 +1,20 @@
+from typing import Sequence
+from urllib.parse import quote
+
 from dotenv import load_dotenv
 
-from webdriver_manager.firefox import GeckoDriverManager
 from selenium import webdriver
 from selenium.webdriver.firefox.service import Service
 
-from .tools import mode_type, user_agent, set_background_mode
+from .driver_binaries import start_driver
+from .tools import (
+    mode_type,
+    page_load_strategy_type,
+    profile_type,
+    user_agent,
+    set_background_mode,
+    LEAN_BLOCKED_URL_PATTERNS
+)
 
 # It is needed for GH_TOKEN, because Firefox driver is located in GitHub
 # GH_TOKEN is stored in .env by default
@@ -12,25 +22,40 @@ from .tools import mode_type, user_agent, set_background_mode
 load_dotenv()
 
 
-def create_firefox_driver(headers: str = user_agent.firefox,
+def create_firefox_driver(headers: str = None,
                           mode: mode_type = 'dev',
+                          page_load_strategy: page_load_strategy_type = 'normal',
+                          profile: profile_type = 'full',
+                          blocked_urls: Sequence[str] = LEAN_BLOCKED_URL_PATTERNS
                           ) -> webdriver.Firefox:
     """
     Creates Firefox driver.
     Sets the Firefox driver options and sets background mode if you select;
     Dev mode and a new version of Firefox are set by default;
-    :param headers: Firefox headers such as 'User agent';
+    :param headers: Firefox headers such as 'User agent', random bundled user agent by default;
     :param mode: dev - show via browser, prod - without browser;
+    :param page_load_strategy: normal - driver.get waits for full loading,
+                               eager - waits for DOM only, none - does not wait;
+    :param profile: full - loads all resources, lean - blocks images, fonts, stylesheets,
+                    media autoplay, trackers and blocked_urls;
+    :param blocked_urls: URL patterns blocked in the lean profile ('*' is a wildcard),
+                         fonts, stylesheets, media and trackers by default;
     :return: instance of webdriver.Firefox.
     """
     options = disable_webdriver_mode()
-    options.add_argument(f"user-agent={headers}")  # set user agent for firefox
+    options.add_argument(f"user-agent={headers or user_agent.firefox}")  # set user agent for firefox
+
+    options.page_load_strategy = page_load_strategy
 
     if mode == "prod":
         set_background_mode(way=1, options=options)
 
-    return webdriver.Firefox(service=Service(GeckoDriverManager().install()),
-                             options=options)
+    if profile == "lean":
+        set_lean_profile(options)
+        block_urls(options, blocked_urls)
+
+    return start_driver('firefox', lambda driver_path: webdriver.Firefox(service=Service(executable_path=driver_path),
+                                                                         options=options))
 
 
 def disable_webdriver_mode() -> webdriver.FirefoxOptions:
@@ -45,3 +70,42 @@ def disable_webdriver_mode() -> webdriver.FirefoxOptions:
     options.set_preference("dom.webdriver.enabled", False)
     options.set_preference('useAutomationExtension', False)
     return options
+
+
+def set_lean_profile(options: webdriver.FirefoxOptions) -> webdriver.FirefoxOptions:
+    """
+    Disables images, stylesheets, downloadable fonts, media autoplay and blocks trackers by the browser preferences.
+    :param options: instance of webdriver.FirefoxOptions;
+    :return: instance of webdriver.FirefoxOptions;
+    """
+    options.set_preference('permissions.default.image', 2)
+    options.set_preference('permissions.default.stylesheet', 2)
+    options.set_preference('gfx.downloadable_fonts.enabled', False)
+    options.set_preference('browser.display.use_document_fonts', 0)
+    options.set_preference('media.autoplay.default', 5)
+    options.set_preference('media.autoplay.blocking_policy', 2)
+    options.set_preference('privacy.trackingprotection.enabled', True)
+    options.set_preference('privacy.trackingprotection.socialtracking.enabled', True)
+    return options
+
+
+def block_urls(options: webdriver.FirefoxOptions, url_patterns: Sequence[str]) -> webdriver.FirefoxOptions:
+    """
+    Blocks URLs by patterns through the proxy auto-config script, as Firefox has no request interception
+    through the driver: the blocked URLs go to the closed local port, the rest are loaded directly.
+    The script replaces the proxy settings of the profile;
+    :param options: instance of webdriver.FirefoxOptions;
+    :param url_patterns: URL patterns, '*' is a wildcard;
+    :return: instance of webdriver.FirefoxOptions;
+    """
+    if not url_patterns:
+        return options
+    conditions = ' || '.join(f'shExpMatch(url, "{pattern}")' for pattern in url_patterns)
+    pac_script = (f'function FindProxyForURL(url, host) {{ '
+                  f'return ({conditions}) ? "PROXY 127.0.0.1:9" : "DIRECT"; }}')
+    options.set_preference('network.proxy.type', 2)
+    options.set_preference('network.proxy.autoconfig_url',
+                           f'data:application/x-ns-proxy-autoconfig,{quote(pac_script)}')
+    # the whole URL is passed to the script, not only the host of the https URLs
+    options.set_preference('network.proxy.autoconfig_url.include_path', True)
+    return options
@@ -1,39 +1,89 @@
-from pathlib import Path
+from typing import Sequence
 
 from packaging.version import parse as parse_ver
 
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 
-from .tools import mode_type, version_type, user_agent, set_background_mode
+from .driver_binaries import start_driver
+from .tools import (
+    mode_type,
+    page_load_strategy_type,
+    profile_type,
+    version_type,
+    user_agent,
+    set_background_mode,
+    LEAN_BLOCKED_URL_PATTERNS
+)
 
 
-parent_dir = Path(__file__).parent
-path_to_driver = parent_dir.joinpath('chromedriver_win32', 'chromedriver')
-
-
-def create_google_chrome_driver(headers: str = user_agent.chrome,
+def create_google_chrome_driver(headers: str = None,
                                 mode: mode_type = 'dev',
-                                version: version_type = 'new'
+                                version: version_type = 'new',
+                                page_load_strategy: page_load_strategy_type = 'normal',
+                                profile: profile_type = 'full',
+                                blocked_urls: Sequence[str] = LEAN_BLOCKED_URL_PATTERNS
                                 ) -> webdriver.Chrome:
     """
     Creates Google Chrome driver.
     Sets the Google Chrome driver options and sets background mode if you select;
     Dev mode and a new version of Google Chrome are set by default;
-    :param headers: Google Chrome headers such as 'User agent';
+    :param headers: Google Chrome headers such as 'User agent', random bundled user agent by default;
     :param mode: dev - show via browser, prod - without browser;
     :param version: Google Chrome version;
+    :param page_load_strategy: normal - driver.get waits for full loading,
+                               eager - waits for DOM only, none - does not wait;
+    :param profile: full - loads all resources, lean - blocks images, media autoplay and blocked_urls;
+    :param blocked_urls: URL patterns blocked in the lean profile ('*' is a wildcard),
+                         fonts, stylesheets, media and trackers by default;
     :return: instance of webdriver.Chrome.
     """
     options = disable_webdriver_mode(google_version=version)
     options.add_experimental_option('excludeSwitches', ['enable-logging'])
-    options.add_argument(f"user-agent={headers}")
+    options.add_argument(f"user-agent={headers or user_agent.chrome}")
+
+    options.page_load_strategy = page_load_strategy
 
     if mode == "prod":
         set_background_mode(way=2, options=options)
 
-    return webdriver.Chrome(service=Service(executable_path=str(path_to_driver)),
-                            options=options)
+    if profile == "lean":
+        set_lean_profile(options)
+
+    driver = start_driver('chrome', lambda driver_path: webdriver.Chrome(service=Service(executable_path=driver_path),
+                                                                        options=options))
+    if profile == "lean":
+        block_urls(driver, blocked_urls)
+    return driver
+
+
+def set_lean_profile(options: webdriver.ChromeOptions) -> webdriver.ChromeOptions:
+    """
+    Disables images and media autoplay by the browser preferences.
+    Chrome has no preferences for stylesheets and fonts, they are blocked by the URL patterns (see block_urls);
+    :param options: instance of webdriver.ChromeOptions;
+    :return: instance of webdriver.ChromeOptions;
+    """
+    blocked = 2
+    options.add_experimental_option('prefs', {
+        'profile.managed_default_content_settings.images': blocked,
+        'profile.managed_default_content_settings.media_stream': blocked,
+    })
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    options.add_argument("--autoplay-policy=user-gesture-required")
+    return options
+
+
+def block_urls(driver: webdriver.Chrome, url_patterns: Sequence[str]) -> webdriver.Chrome:
+    """
+    Intercepts requests through the Chrome DevTools Protocol and blocks URLs by patterns.
+    :param driver: instance of webdriver.Chrome;
+    :param url_patterns: URL patterns, '*' is a wildcard;
+    :return: instance of webdriver.Chrome;
+    """
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': list(url_patterns)})
+    return driver
 
 
 def disable_webdriver_mode(google_version: version_type) -> webdriver.ChromeOptions:
@@ -1,13 +1,27 @@
 from typing import Literal
 from selenium import webdriver
-from fake_useragent import UserAgent
+
+from .user_agents import UserAgentProvider
 
 
 # Type hinting
 mode_type = Literal['prod'] | Literal['dev']  # for driver start mode
 version_type = Literal['new'] | str  # for Google Chrome version
+page_load_strategy_type = Literal['normal'] | Literal['eager'] | Literal['none']  # when driver.get returns
+profile_type = Literal['full'] | Literal['lean']  # full - loads everything, lean - only documents and scripts
+
+# URL patterns blocked in the lean profile: images, fonts, stylesheets, media and trackers
+LEAN_BLOCKED_URL_PATTERNS: tuple[str, ...] = (
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.avif', '*.svg', '*.ico',
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    '*.css',
+    '*.mp4', '*.webm', '*.mp3', '*.ogg', '*.m3u8',
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+    '*mc.yandex.ru*', '*top-fwz1.mail.ru*', '*facebook.net*',
+)
 
-user_agent = UserAgent()
+# user agents are read from the bundled file on the first use
+user_agent = UserAgentProvider()
 
 
 def set_background_mode(way: Literal[1] | Literal[2], options: webdriver):
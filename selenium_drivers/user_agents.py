@@ -0,0 +1,48 @@
+import json
+import random
+from dataclasses import dataclass
+from functools import cached_property
+from pathlib import Path
+from typing import Literal
+
+browser_type = Literal['chrome'] | Literal['firefox']
+
+USER_AGENTS_FILE: Path = Path(__file__).parent.joinpath('user_agents.json')
+
+
+@dataclass
+class UserAgentProvider:
+    """
+    Returns random user agents of the browser from the bundled pool,
+    the pool file is read on the first use and nothing goes to the network.
+    If online is True, the user agents are taken from fake_useragent (it can go to the network),
+    the bundled pool is used when fake_useragent fails.
+    """
+    user_agents_file: Path = USER_AGENTS_FILE
+    online: bool = False
+
+    @cached_property
+    def pool(self) -> dict[str, list[str]]:
+        return json.loads(self.user_agents_file.read_text(encoding='utf8'))
+
+    @cached_property
+    def _online_user_agent(self):
+        try:
+            from fake_useragent import UserAgent
+            return UserAgent()
+        except Exception as error_message:
+            print(f"fake_useragent cannot be used, the bundled user agents are used: {error_message=}")
+            return None
+
+    def get(self, browser: browser_type) -> str:
+        if self.online and self._online_user_agent is not None:
+            return self._online_user_agent[browser]
+        return random.choice(self.pool[browser])
+
+    @property
+    def chrome(self) -> str:
+        return self.get('chrome')
+
+    @property
+    def firefox(self) -> str:
+        return self.get('firefox')
@@ -0,0 +1,26 @@
+from typing import Iterator
+
+import pytest
+
+from benchmarks.fixtures import FixturePageData, serve_fixture_site
+from parsing.general_methods import Page, Pagination
+from utils.type_hinting import Link
+
+PAGES_COUNT = 3
+CARDS_COUNT = 5
+
+
+@pytest.fixture(scope='session')
+def fixture_site() -> Iterator[Link]:
+    """Base URL of the local fixture site with PAGES_COUNT listing pages of CARDS_COUNT cards"""
+    with serve_fixture_site(pages_count=PAGES_COUNT, cards_count=CARDS_COUNT) as base_url:
+        yield base_url
+
+
+@pytest.fixture
+def fixture_page() -> Page:
+    return Page(elements=[FixturePageData.title, FixturePageData.url, FixturePageData.address],
+                end_of_page=FixturePageData.end_of_page,
+                pagination=Pagination(pagination_elem=FixturePageData.pagination_block,
+                                      next_page_button=FixturePageData.next_page),
+                authentication=None)
@@ -0,0 +1,40 @@
+import asyncio
+
+from benchmarks.fixtures import get_listing_page_links
+from parsing.async_data_collection import AsyncPageDataCollector
+from tests.conftest import PAGES_COUNT, CARDS_COUNT
+
+
+async def collect(collector: AsyncPageDataCollector, page_links: list[str]) -> list[dict]:
+    return [page_data async for page_data in collector.collect_data_from_links(page_links)]
+
+
+def test_collects_data_from_links_in_order(fixture_site, fixture_page):
+    collector = AsyncPageDataCollector(page=fixture_page, max_connections_per_host=2)
+
+    pages = asyncio.run(collect(collector, get_listing_page_links(fixture_site, PAGES_COUNT)))
+
+    assert [page['title'][1] for page in pages] == [f"Python developer {page_number * CARDS_COUNT + 1}"
+                                                    for page_number in range(PAGES_COUNT)]
+
+
+def test_collector_can_be_reused_in_another_event_loop(fixture_site, fixture_page):
+    # one connection per host, so the requests wait on the host semaphore
+    collector = AsyncPageDataCollector(page=fixture_page, max_connections_per_host=1)
+    page_links = get_listing_page_links(fixture_site, PAGES_COUNT)
+
+    first_pages = asyncio.run(collect(collector, page_links))
+    second_pages = asyncio.run(collect(collector, page_links))
+
+    assert first_pages == second_pages
+
+
+def test_failed_page_is_skipped(fixture_site, fixture_page):
+    collector = AsyncPageDataCollector(page=fixture_page)
+    page_links = get_listing_page_links(fixture_site, PAGES_COUNT)
+
+    pages = asyncio.run(collect(collector, [page_links[0], f"{fixture_site}/missing", *page_links[1:]]))
+
+    assert [page['title'][1] for page in pages] == [f"Python developer {page_number * CARDS_COUNT + 1}"
+                                                    for page_number in range(PAGES_COUNT)]
+
@@ -0,0 +1,86 @@
+from pathlib import Path
+
+import pytest
+
+from benchmarks.fixtures import get_listing_page_links
+from parsing.checkpoint import CheckpointStore
+from parsing.data_collection import PageDataCollector
+from parsing.http_parser import HttpPageParser
+from tests.conftest import PAGES_COUNT, CARDS_COUNT
+
+
+@pytest.fixture
+def checkpoint(tmp_path: Path):
+    with CheckpointStore(tmp_path.joinpath('crawl.sqlite'), job_name='test') as checkpoint:
+        yield checkpoint
+
+
+def get_first_titles(pages: list[dict]) -> list[str]:
+    return [page['title'][1] for page in pages]
+
+
+def test_stores_completed_links_per_job(tmp_path):
+    with CheckpointStore(tmp_path.joinpath('crawl.sqlite'), job_name='first') as first_job:
+        first_job.mark_completed('http://localhost/1')
+        first_job.mark_completed('http://localhost/1')
+
+    with (CheckpointStore(tmp_path.joinpath('crawl.sqlite'), job_name='first') as first_job,
+          CheckpointStore(tmp_path.joinpath('crawl.sqlite'), job_name='second') as second_job):
+        assert first_job.get_completed_links() == {'http://localhost/1'}
+        assert second_job.get_completed_links() == set()
+        first_job.clear_completed_links()
+        assert first_job.get_completed_links() == set()
+
+
+def test_stores_pagination(checkpoint):
+    assert checkpoint.get_pagination('http://localhost/start') is None
+
+    checkpoint.save_pagination('http://localhost/start', 'http://localhost/page-2', 1)
+    checkpoint.save_pagination('http://localhost/start', 'http://localhost/page-3', 2, finished=True)
+
+    assert checkpoint.get_pagination('http://localhost/start') == ('http://localhost/page-3', 2, True)
+
+
+def test_resume_skips_completed_links(fixture_site, fixture_page, checkpoint):
+    page_links = get_listing_page_links(fixture_site, PAGES_COUNT)
+    checkpoint.mark_completed(page_links[0])
+    collector = PageDataCollector(parser=HttpPageParser(), page=fixture_page, checkpoint=checkpoint, resume=True)
+
+    pages = list(collector.collect_data_from_links(page_links))
+
+    assert get_first_titles(pages) == [f"Python developer {page_number * CARDS_COUNT + 1}"
+                                       for page_number in range(1, PAGES_COUNT)]
+    assert checkpoint.get_completed_links() == set(page_links)
+
+
+@pytest.mark.parametrize('prefetch', [False, True])
+def test_resume_continues_pagination_from_saved_page(fixture_site, fixture_page, checkpoint, prefetch):
+    start_page = f"{fixture_site}/search?page=0"
+    collector = PageDataCollector(parser=HttpPageParser(), page=fixture_page,
+                                  checkpoint=checkpoint, prefetch=prefetch)
+    pages = iter(collector.collect_data_by_click_next_page(start_page))
+    next(pages)
+    stopped_page = next(pages)
+    pages.close()
+
+    resumed_collector = PageDataCollector(parser=HttpPageParser(), page=fixture_page,
+                                          checkpoint=checkpoint, resume=True, prefetch=prefetch)
+    resumed_pages = list(resumed_collector.collect_data_by_click_next_page(start_page))
+
+    # the stopped page is saved after it is returned, so it is collected again
+    assert resumed_pages[0] == stopped_page
+    assert get_first_titles(resumed_pages) == [f"Python developer {page_number * CARDS_COUNT + 1}"
+                                               for page_number in range(1, PAGES_COUNT)]
+
+
+@pytest.mark.parametrize('prefetch', [False, True])
+def test_resume_after_pages_count_does_not_repeat_pages(fixture_site, fixture_page, checkpoint, prefetch):
+    start_page = f"{fixture_site}/search?page=0"
+    collector = PageDataCollector(parser=HttpPageParser(), page=fixture_page, pages_count=2,
+                                  checkpoint=checkpoint, prefetch=prefetch)
+    assert len(list(collector.collect_data_by_click_next_page(start_page))) == 2
+
+    resumed_collector = PageDataCollector(parser=HttpPageParser(), page=fixture_page, pages_count=2,
+                                          checkpoint=checkpoint, resume=True, prefetch=prefetch)
+
+    assert list(resumed_collector.collect_data_by_click_next_page(start_page)) == []
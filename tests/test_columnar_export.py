@@ -0,0 +1,89 @@
+import csv
+from pathlib import Path
+
+import pytest
+
+from utils.columnar_export import ColumnarWriter, page_data_to_rows
+
+
+def read_csv(file_path: Path) -> list[dict[str, str]]:
+    with file_path.open(newline='', encoding='utf8') as file:
+        return list(csv.DictReader(file))
+
+
+def test_many_fields_are_lined_up_by_position():
+    page_data = {'city': 'Moscow', 'title': {1: 'first', 2: 'second'}, 'salary': {1: '100'}}
+
+    assert page_data_to_rows(page_data) == [{'city': 'Moscow', 'title': 'first', 'salary': '100'},
+                                            {'city': 'Moscow', 'title': 'second', 'salary': None}]
+
+
+def test_container_records_are_written_as_rows(tmp_path: Path):
+    file_path = tmp_path.joinpath('vacancies.csv')
+    pages_data = [{'city': 'Moscow', 'vacancy_block': []},
+                  {'city': 'Moscow', 'vacancy_block': [{'title': 'first', 'address': 'street 1'},
+                                                       {'title': 'second', 'address': None}]}]
+
+    with ColumnarWriter(file_path, file_format='csv') as writer:
+        assert writer.write_all(pages_data) == 2
+
+    assert read_csv(file_path) == [{'city': 'Moscow', 'title': 'first', 'address': 'street 1'},
+                                   {'city': 'Moscow', 'title': 'second', 'address': ''}]
+
+
+def test_field_of_later_page_is_added_to_written_rows(tmp_path: Path):
+    file_path = tmp_path.joinpath('vacancies.csv')
+    pages_data = [{'title': {1: 'first'}},
+                  {'title': {1: 'second'}, 'salary': {1: '100'}}]
+
+    # every page is written by its own row group, so the first one is written without the salary
+    with ColumnarWriter(file_path, file_format='csv', row_group_size=1) as writer:
+        writer.write_all(pages_data)
+
+    assert read_csv(file_path) == [{'title': 'first', 'salary': ''},
+                                   {'title': 'second', 'salary': '100'}]
+
+
+@pytest.mark.parametrize('file_format', ['parquet', 'arrow'])
+def test_pyarrow_schema_grows_with_new_fields(tmp_path: Path, file_format: str):
+    pa = pytest.importorskip('pyarrow')
+    file_path = tmp_path.joinpath(f'vacancies.{file_format}')
+    pages_data = [{'title': {1: 'first', 2: 'second'}},
+                  {'title': {1: 'third'}, 'salary': {1: '100'}},
+                  {'address': 'street 1'}]
+
+    with ColumnarWriter(file_path, file_format=file_format, row_group_size=1) as writer:
+        assert writer.write_all(pages_data) == 4
+
+    if file_format == 'parquet':
+        import pyarrow.parquet as pq
+        table = pq.read_table(file_path)
+    else:
+        with pa.OSFile(str(file_path), 'rb') as file:
+            table = pa.ipc.open_file(file).read_all()
+    assert table.to_pylist() == [{'title': 'first', 'salary': None, 'address': None},
+                                 {'title': 'second', 'salary': None, 'address': None},
+                                 {'title': 'third', 'salary': '100', 'address': None},
+                                 {'title': None, 'salary': None, 'address': 'street 1'}]
+    assert not list(tmp_path.glob('*.written'))
+
+
+def test_given_columns_are_not_grown(tmp_path: Path):
+    file_path = tmp_path.joinpath('vacancies.csv')
+
+    with ColumnarWriter(file_path, file_format='csv', columns=['title']) as writer:
+        writer.write_all([{'title': {1: 'first'}, 'salary': {1: '100'}}])
+
+    assert read_csv(file_path) == [{'title': 'first'}]
+
+
+def test_list_values_are_written_as_json(tmp_path: Path):
+    file_path = tmp_path.joinpath('vacancies.csv')
+    pages_data = [{'vacancy_block': [{'title': 'first', 'skills': ['Python', 'SQL']},
+                                     {'title': 'второй', 'skills': []}]}]
+
+    with ColumnarWriter(file_path, file_format='csv') as writer:
+        writer.write_all(pages_data)
+
+    assert read_csv(file_path) == [{'title': 'first', 'skills': '["Python", "SQL"]'},
+                                   {'title': 'второй', 'skills': '[]'}]
@@ -0,0 +1,96 @@
+import threading
+
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.locator_converter import LocatorConverter
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+
+from benchmarks.fixtures import FixturePageData
+from parsing.command_tracer import CommandTracer, get_method_names
+from parsing.general_methods import PageParser
+
+
+class StubRemoteDriver(WebDriver):
+    """Remote driver without the browser, it answers the commands by itself"""
+    def __init__(self):
+        self.session_id = 'stub'
+        self.locator_converter = LocatorConverter()
+        self.page_url = 'about:blank'
+        self.current_url_requests_count = 0
+
+    def execute(self, driver_command: str, params: dict = None) -> dict:
+        match driver_command:
+            case Command.GET:
+                self.page_url = params['url']
+            case Command.CLICK_ELEMENT:
+                self.page_url = self.page_url + '?page=2'
+            case Command.GET_CURRENT_URL:
+                self.current_url_requests_count += 1
+                return {'value': self.page_url}
+            case Command.FIND_ELEMENTS:
+                return {'value': [WebElement(self, 'card-1'), WebElement(self, 'card-2')]}
+            case Command.GET_ELEMENT_TEXT:
+                return {'value': 'Title'}
+        return {'value': None}
+
+
+def test_commands_are_linked_to_page_and_parser_method():
+    driver = StubRemoteDriver()
+    parser = PageParser(driver=driver)
+
+    with CommandTracer(parser) as tracer:
+        driver.get('http://localhost/search')
+        titles = [element.text for element in parser.find_elements(FixturePageData.title)]
+        # the found elements are cached by the parser, so they are not found again
+        parser.find_elements(FixturePageData.title)[0].click()
+        driver.find_elements('xpath', '//a')
+
+    assert titles == ['Title', 'Title']
+    report = tracer.get_report()
+    assert [page['url'] for page in report] == ['http://localhost/search', 'http://localhost/search?page=2']
+    assert report[0]['by_command'] == {Command.FIND_ELEMENTS: 1, Command.GET_ELEMENT_TEXT: 2,
+                                       Command.GET: 1, Command.CLICK_ELEMENT: 1}
+    assert report[0]['by_method'] == {'find_elements': 1, None: 4}
+    assert report[1]['by_command'] == {Command.FIND_ELEMENTS: 1}
+    # the URL of the page, that was opened by the click, is got once
+    assert driver.current_url_requests_count == 1
+
+
+def test_driver_execute_is_restored_after_detach():
+    driver = StubRemoteDriver()
+    parser = PageParser(driver=driver)
+
+    with CommandTracer(parser) as tracer:
+        driver.get('http://localhost/search')
+    driver.get('http://localhost/other')
+
+    assert driver.execute.__func__ is StubRemoteDriver.execute
+    assert [page['url'] for page in tracer.get_report()] == ['http://localhost/search']
+
+
+def test_report_is_made_while_commands_are_traced():
+    driver = StubRemoteDriver()
+    parser = PageParser(driver=driver)
+    tracer = CommandTracer(parser).attach()
+    element = WebElement(driver, 'next-page')
+
+    clicking = threading.Thread(target=lambda: [element.click() for _ in range(200)])
+    clicking.start()
+    reports: list[list[dict]] = []
+    while clicking.is_alive():
+        reports.append(tracer.get_report())
+    clicking.join()
+    tracer.detach()
+
+    pages = tracer.get_report()
+    assert len(pages) == 201
+    assert all(page['url'] is not None for report in [*reports, pages] for page in report)
+    # every page is resolved once, by the next click or by the report
+    assert driver.current_url_requests_count == 201
+
+
+def test_decorated_methods_are_found_by_code():
+    method_names = get_method_names(PageParser)
+
+    assert {'find_elements', 'open_page', 'get_data_from_page_elements'} <= set(method_names.values())
+    assert not any(name.startswith('_') for name in method_names.values())
@@ -0,0 +1,77 @@
+import stat
+from pathlib import Path
+
+import pytest
+from selenium.common.exceptions import SessionNotCreatedException
+
+from selenium_drivers import driver_binaries
+
+
+def make_driver_binary(path: Path, version: str) -> str:
+    path.write_text(f"#!/bin/sh\necho 'ChromeDriver {version} (build)'\n")
+    path.chmod(path.stat().st_mode | stat.S_IEXEC)
+    return str(path)
+
+
+@pytest.fixture
+def driver_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(driver_binaries, 'cache_file', tmp_path / 'driver_binaries.json')
+    monkeypatch.setattr(driver_binaries, '_checked_paths', {})
+    monkeypatch.delenv('CHROMEDRIVER_PATH', raising=False)
+    installed: list[bool] = []
+
+    def install_driver(browser, use_bundled=True):
+        installed.append(use_bundled)
+        return make_driver_binary(tmp_path / 'installed_chromedriver', '120.0.1')
+
+    monkeypatch.setattr(driver_binaries, 'install_driver', install_driver)
+    return installed
+
+
+def test_driver_version_is_read_from_binary(tmp_path):
+    driver_path = make_driver_binary(tmp_path / 'chromedriver', '119.0.6045.105')
+
+    assert driver_binaries.get_driver_version(driver_path) == '119.0.6045.105'
+    assert driver_binaries.get_driver_version(str(tmp_path / 'missing')) is None
+
+
+def test_cached_driver_is_used_if_it_reports_cached_version(tmp_path, driver_cache):
+    driver_path = make_driver_binary(tmp_path / 'chromedriver', '119.0.1')
+    driver_binaries.write_cached_paths({'chrome': {'path': driver_path, 'version': '119.0.1'}})
+
+    assert driver_binaries.get_driver_path('chrome') == driver_path
+    assert driver_cache == []
+
+
+def test_replaced_driver_is_installed_again(tmp_path, driver_cache):
+    driver_path = make_driver_binary(tmp_path / 'chromedriver', '118.0.1')
+    driver_binaries.write_cached_paths({'chrome': {'path': driver_path, 'version': '119.0.1'}})
+
+    installed_path = driver_binaries.get_driver_path('chrome')
+
+    assert installed_path.endswith('installed_chromedriver')
+    assert driver_binaries.read_cached_paths()['chrome'] == {'path': installed_path, 'version': '120.0.1'}
+
+
+def test_cached_path_of_old_format_is_installed_again(tmp_path, driver_cache):
+    driver_path = make_driver_binary(tmp_path / 'chromedriver', '119.0.1')
+    driver_binaries.write_cached_paths({'chrome': driver_path})
+
+    assert driver_binaries.get_driver_path('chrome').endswith('installed_chromedriver')
+
+
+def test_driver_is_installed_again_if_browser_does_not_accept_it(tmp_path, driver_cache):
+    driver_path = make_driver_binary(tmp_path / 'chromedriver', '119.0.1')
+    driver_binaries.write_cached_paths({'chrome': {'path': driver_path, 'version': '119.0.1'}})
+    started_paths: list[str] = []
+
+    def start(path: str):
+        started_paths.append(path)
+        if path == driver_path:
+            raise SessionNotCreatedException("This version of ChromeDriver only supports Chrome version 119")
+        return path
+
+    assert driver_binaries.start_driver('chrome', start).endswith('installed_chromedriver')
+    assert started_paths[0] == driver_path
+    # webdriver_manager is used, the bundled driver may be the one, that does not match
+    assert driver_cache == [False]
@@ -0,0 +1,111 @@
+from parsing.general_methods import PageParser
+from parsing.parser_pool import ParserPool
+from selenium_drivers.driver_factory import DriverFactory
+
+
+class StubWindowSwitcher:
+    def window(self, window_handle: str):
+        pass
+
+
+class StubDriver:
+    """Browser stub, that counts resets and quits"""
+    def __init__(self):
+        self.window_handles = ['main']
+        self.switch_to = StubWindowSwitcher()
+        self.resets_count = 0
+        self.is_quit = False
+
+    def set_script_timeout(self, timeout: float):
+        pass
+
+    def execute_script(self, script: str, *args):
+        pass
+
+    def delete_all_cookies(self):
+        pass
+
+    def get(self, url: str):
+        self.resets_count += 1
+
+    def close(self):
+        pass
+
+    def quit(self):
+        self.is_quit = True
+
+
+class RecordingDriverFactory(DriverFactory):
+    def __post_init__(self):
+        super().__post_init__()
+        self.released_drivers: list[StubDriver] = []
+
+    def release(self, driver):
+        self.released_drivers.append(driver)
+        super().release(driver)
+
+
+def wait_for_launches(factory: DriverFactory):
+    for launch in factory._launches:
+        launch.result()
+
+
+def test_released_driver_is_reset_and_acquired_again():
+    with DriverFactory(create_driver=StubDriver, idle_count=1) as factory:
+        driver = factory.acquire()
+        wait_for_launches(factory)
+        launched_driver = factory._idle_drivers.get_nowait()
+
+        factory.release(driver)
+
+        assert factory._idle_drivers.get_nowait() is driver
+        launched_driver.quit()
+    assert driver.resets_count == 1
+    assert not driver.is_quit
+
+
+def test_released_driver_is_quit_if_there_are_enough_idle_drivers():
+    with DriverFactory(create_driver=StubDriver, idle_count=1) as factory:
+        driver = factory.acquire()
+        wait_for_launches(factory)
+
+        factory.release(driver)
+
+        assert driver.is_quit
+        assert factory._idle_drivers.qsize() == 1
+
+
+def test_close_quits_idle_drivers():
+    factory = DriverFactory(create_driver=StubDriver, idle_count=2)
+    wait_for_launches(factory)
+    idle_drivers = list(factory._idle_drivers.queue)
+
+    factory.close()
+
+    assert len(idle_drivers) == 2
+    assert all(driver.is_quit for driver in idle_drivers)
+
+
+def test_driver_released_after_close_is_quit():
+    factory = DriverFactory(create_driver=StubDriver, idle_count=1)
+    driver = factory.acquire()
+    factory.close()
+
+    factory.release(driver)
+
+    assert driver.is_quit
+    assert factory._idle_drivers.empty()
+
+
+def test_pool_takes_drivers_from_factory_and_gives_them_back():
+    with RecordingDriverFactory(create_driver=StubDriver, idle_count=2) as factory:
+        wait_for_launches(factory)
+        prelaunched_drivers = list(factory._idle_drivers.queue)
+
+        with ParserPool(driver_factory=factory, size=2) as pool:
+            parsers = list(pool.parsers)
+
+        assert all(isinstance(parser, PageParser) for parser in parsers)
+        assert {id(parser.driver) for parser in parsers} == {id(driver) for driver in prelaunched_drivers}
+        assert {id(driver) for driver in factory.released_drivers} == {id(driver) for driver in prelaunched_drivers}
+    assert all(driver.is_quit for driver in prelaunched_drivers)
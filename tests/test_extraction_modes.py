@@ -0,0 +1,58 @@
+import pytest
+
+from benchmarks.fake_webdriver import FakeWebDriver
+from benchmarks.fixtures import FixturePageData, build_listing_page
+from parsing.general_methods import PageParser
+
+page_elements = [FixturePageData.vacancy_block, FixturePageData.title, FixturePageData.pagination_block]
+
+
+def collect_page_data(extraction_mode: str) -> dict:
+    parser = PageParser(driver=FakeWebDriver(build_listing_page(cards_count=3)), extraction_mode=extraction_mode)
+    return parser.get_data_from_page_elements(page_elements)
+
+
+@pytest.mark.parametrize('extraction_mode', ['batch', 'snapshot'])
+def test_extraction_modes_return_same_data(extraction_mode):
+    assert collect_page_data(extraction_mode) == collect_page_data('element')
+
+
+@pytest.mark.parametrize('extraction_mode', ['element', 'batch', 'snapshot'])
+def test_text_keeps_line_breaks_in_all_modes(extraction_mode):
+    page_source = build_listing_page(cards_count=1).replace(
+        "Moscow, street 1", "<p>Moscow,<br>street 1</p><div>Metro station</div>"
+    )
+    parser = PageParser(driver=FakeWebDriver(page_source), extraction_mode=extraction_mode)
+
+    assert parser.get_data_from_identical_elements(FixturePageData.address) == {
+        1: "Moscow,\nstreet 1\n\nMetro station"
+    }
+
+
+def test_container_fields_are_read_relative_to_container():
+    page_source = build_listing_page(cards_count=2).replace(
+        "<div data-qa='vacancy-serp__vacancy-address'>Moscow, street 1</div>", ""
+    )
+    parser = PageParser(driver=FakeWebDriver(page_source))
+
+    records = parser.get_data_from_identical_elements(FixturePageData.vacancy_block)
+
+    assert [record['address'] for record in records] == [None, 'Moscow, street 2']
+
+
+def test_containers_are_extracted_in_one_round_trip():
+    driver = FakeWebDriver(build_listing_page(cards_count=50))
+    parser = PageParser(driver=driver)
+    commands_count = driver.commands_count
+
+    parser.get_data_from_identical_elements(FixturePageData.vacancy_block)
+
+    assert driver.commands_count - commands_count == 1
+
+
+@pytest.mark.parametrize('extraction_mode', ['element', 'batch', 'snapshot'])
+def test_missing_single_element_is_none_if_errors_are_raised(extraction_mode):
+    parser = PageParser(driver=FakeWebDriver(build_listing_page(cards_count=3)),
+                        extraction_mode=extraction_mode, raise_errors=True)
+
+    assert parser.get_data_from_page_elements([FixturePageData.next_page]) == {'next_page': None}
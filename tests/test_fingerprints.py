@@ -0,0 +1,62 @@
+from pathlib import Path
+
+import pytest
+
+from benchmarks.fixtures import get_listing_page_links
+from parsing.checkpoint import CheckpointStore
+from parsing.data_collection import PageDataCollector
+from parsing.fingerprints import FingerprintStore
+from parsing.http_parser import HttpPageParser
+from tests.conftest import PAGES_COUNT
+
+
+@pytest.fixture
+def fingerprints(tmp_path: Path):
+    with FingerprintStore(tmp_path.joinpath('fingerprints.sqlite')) as fingerprints:
+        yield fingerprints
+
+
+@pytest.fixture
+def checkpoint(tmp_path: Path):
+    with CheckpointStore(tmp_path.joinpath('crawl.sqlite')) as checkpoint:
+        yield checkpoint
+
+
+def test_page_without_fingerprint_is_changed(fingerprints):
+    assert not fingerprints.is_unchanged('http://localhost/new', 'fingerprint')
+    assert not fingerprints.is_unchanged('http://localhost/new', None)
+
+    fingerprints.save_fingerprint('http://localhost/new', 'fingerprint')
+
+    assert fingerprints.is_unchanged('http://localhost/new', 'fingerprint')
+    assert not fingerprints.is_unchanged('http://localhost/new', 'another fingerprint')
+
+
+def test_unchanged_pages_are_skipped(fixture_site, fixture_page, fingerprints):
+    page_links = get_listing_page_links(fixture_site, PAGES_COUNT)
+    collector = PageDataCollector(parser=HttpPageParser(), page=fixture_page, fingerprints=fingerprints)
+
+    assert len(list(collector.collect_data_from_links(page_links))) == PAGES_COUNT
+    assert list(collector.collect_data_from_links(page_links)) == []
+    assert collector.skipped_pages_count == PAGES_COUNT
+
+
+def test_page_is_collected_if_fingerprint_fails(fixture_site, fixture_page, fingerprints, checkpoint, monkeypatch):
+    parser = HttpPageParser()
+    monkeypatch.setattr(parser, 'get_page_fingerprint', lambda elements: None)
+    collector = PageDataCollector(parser=parser, page=fixture_page, fingerprints=fingerprints,
+                                  checkpoint=checkpoint)
+    page_links = get_listing_page_links(fixture_site, PAGES_COUNT)
+
+    assert len(list(collector.collect_data_from_links(page_links))) == PAGES_COUNT
+    assert collector.skipped_pages_count == 0
+    assert checkpoint.get_completed_links() == set(page_links)
+
+
+def test_failed_page_is_not_completed(fixture_site, fixture_page, checkpoint, monkeypatch):
+    parser = HttpPageParser()
+    monkeypatch.setattr(parser, 'get_data_from_page_elements', lambda elements: None)
+    collector = PageDataCollector(parser=parser, page=fixture_page, checkpoint=checkpoint)
+
+    assert list(collector.collect_data_from_links(get_listing_page_links(fixture_site, PAGES_COUNT))) == []
+    assert checkpoint.get_completed_links() == set()
@@ -0,0 +1,128 @@
+from itertools import islice
+
+import httpx
+import pytest
+
+from benchmarks.fixtures import FixturePageData, build_listing_page, get_listing_page_links
+from parsing.checkpoint import CheckpointStore
+from parsing.data_collection import PageDataCollector
+from parsing.exceptions import ElementNotFound
+from parsing.http_parser import HttpPageParser
+from tests.conftest import PAGES_COUNT, CARDS_COUNT
+
+
+@pytest.fixture
+def parser():
+    parser = HttpPageParser()
+    yield parser
+    parser.close_browser_window()
+
+
+@pytest.fixture
+def raising_parser():
+    parser = HttpPageParser(raise_errors=True)
+    yield parser
+    parser.close_browser_window()
+
+
+def test_extracts_identical_elements(fixture_site, parser):
+    parser.open_page(page_url=f"{fixture_site}/search?page=1")
+
+    titles = parser.get_data_from_identical_elements(FixturePageData.title)
+
+    assert titles == {position: f"Python developer {CARDS_COUNT + position}"
+                      for position in range(1, CARDS_COUNT + 1)}
+
+
+def test_resolves_links_against_page_url(fixture_site, parser):
+    parser.open_page(page_url=f"{fixture_site}/search?page=0")
+
+    urls = parser.get_data_from_identical_elements(FixturePageData.url)
+
+    assert urls[1] == f"{fixture_site}/vacancy/1"
+
+
+def test_extracts_container_records(fixture_site, parser):
+    parser.open_page(page_url=f"{fixture_site}/search?page=0")
+
+    records = parser.get_data_from_identical_elements(FixturePageData.vacancy_block)
+
+    assert len(records) == CARDS_COUNT
+    assert records[0] == {'title': 'Python developer 1',
+                          'url': f"{fixture_site}/vacancy/1",
+                          'address': 'Moscow, street 1'}
+
+
+def test_click_follows_next_page_link(fixture_site, parser):
+    parser.open_page(page_url=f"{fixture_site}/search?page=0")
+
+    parser.click_element(elem=FixturePageData.next_page)
+
+    assert parser.get_current_url() == f"{fixture_site}/search?page=1"
+
+
+def test_click_without_link_raises(fixture_site, raising_parser):
+    raising_parser.open_page(page_url=f"{fixture_site}/search?page={PAGES_COUNT - 1}")
+
+    with pytest.raises(ElementNotFound):
+        raising_parser.click_element(elem=FixturePageData.next_page)
+
+
+def test_http_error_raises_if_errors_are_raised(fixture_site, raising_parser):
+    with pytest.raises(httpx.HTTPStatusError):
+        raising_parser.open_page(page_url=f"{fixture_site}/missing")
+
+
+def test_http_error_is_swallowed_by_default(fixture_site, parser):
+    assert parser.open_page(page_url=f"{fixture_site}/missing") is None
+    assert parser.snapshot is None
+
+
+def test_failed_open_does_not_keep_previous_page(fixture_site, parser):
+    assert parser.open_page(page_url=f"{fixture_site}/search?page=0")
+
+    assert parser.open_page(page_url=f"{fixture_site}/missing") is None
+    assert parser.snapshot is None
+
+
+def test_page_that_is_not_opened_is_skipped(fixture_site, fixture_page, parser, tmp_path):
+    page_links = [f"{fixture_site}/search?page=0", f"{fixture_site}/missing", f"{fixture_site}/search?page=1"]
+    with CheckpointStore(tmp_path.joinpath('crawl.sqlite'), job_name='test') as checkpoint:
+        collector = PageDataCollector(parser=parser, page=fixture_page, checkpoint=checkpoint)
+
+        pages = list(collector.collect_data_from_links(page_links))
+
+        assert [page['title'][1] for page in pages] == ["Python developer 1", f"Python developer {CARDS_COUNT + 1}"]
+        assert checkpoint.get_completed_links() == {page_links[0], page_links[2]}
+
+
+def test_collects_data_from_links(fixture_site, fixture_page, parser):
+    collector = PageDataCollector(parser=parser, page=fixture_page)
+
+    pages = list(collector.collect_data_from_links(get_listing_page_links(fixture_site, PAGES_COUNT)))
+
+    assert [page['title'][1] for page in pages] == [f"Python developer {page_number * CARDS_COUNT + 1}"
+                                                    for page_number in range(PAGES_COUNT)]
+
+
+def test_collects_data_by_click_next_page(fixture_site, fixture_page, parser):
+    collector = PageDataCollector(parser=parser, page=fixture_page)
+
+    pages = list(collector.collect_data_by_click_next_page(f"{fixture_site}/search?page=0"))
+
+    assert len(pages) == PAGES_COUNT
+    assert pages[-1]['title'][CARDS_COUNT] == f"Python developer {PAGES_COUNT * CARDS_COUNT}"
+
+
+def test_pagination_stops_if_next_page_is_not_opened(fixture_page, parser):
+    def handle_request(request: httpx.Request) -> httpx.Response:
+        if request.url.path != '/search':
+            return httpx.Response(404)
+        return httpx.Response(200, html=build_listing_page(cards_count=CARDS_COUNT, next_page_url='/missing'))
+
+    parser.client = httpx.Client(transport=httpx.MockTransport(handle_request))
+    collector = PageDataCollector(parser=parser, page=fixture_page)
+
+    pages = list(islice(collector.collect_data_by_click_next_page('http://localhost/search?page=0'), 5))
+
+    assert len(pages) == 1
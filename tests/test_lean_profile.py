@@ -0,0 +1,43 @@
+from urllib.parse import unquote
+
+from selenium import webdriver
+
+from selenium_drivers import firefox, google_chrome
+from selenium_drivers.tools import LEAN_BLOCKED_URL_PATTERNS
+
+
+def test_chrome_lean_profile_sets_only_existing_preferences():
+    options = google_chrome.set_lean_profile(webdriver.ChromeOptions())
+
+    assert set(options.experimental_options['prefs']) == {
+        'profile.managed_default_content_settings.images',
+        'profile.managed_default_content_settings.media_stream',
+    }
+
+
+def test_firefox_lean_profile_blocks_stylesheets():
+    options = firefox.set_lean_profile(webdriver.FirefoxOptions())
+
+    assert options.preferences['permissions.default.stylesheet'] == 2
+    assert options.preferences['permissions.default.image'] == 2
+
+
+def test_firefox_blocks_url_patterns_by_proxy_script():
+    options = firefox.block_urls(webdriver.FirefoxOptions(), ('*.css', '*doubleclick.net*'))
+
+    pac_script = unquote(options.preferences['network.proxy.autoconfig_url'].split(',', 1)[1])
+    assert options.preferences['network.proxy.type'] == 2
+    assert options.preferences['network.proxy.autoconfig_url.include_path'] is True
+    assert 'shExpMatch(url, "*.css") || shExpMatch(url, "*doubleclick.net*")' in pac_script
+    assert '"DIRECT"' in pac_script
+
+
+def test_firefox_without_blocked_urls_keeps_proxy_settings():
+    options = firefox.block_urls(webdriver.FirefoxOptions(), ())
+
+    assert 'network.proxy.type' not in options.preferences
+
+
+def test_default_patterns_block_stylesheets_and_fonts():
+    assert '*.css' in LEAN_BLOCKED_URL_PATTERNS
+    assert '*.woff2' in LEAN_BLOCKED_URL_PATTERNS
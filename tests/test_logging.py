@@ -0,0 +1,102 @@
+import logging
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+from web_parser_logger.main import enable_queue_logging, disable_queue_logging
+from web_parser_logger.settings import SamplingFilter
+
+
+def make_record(message: str, level: int = logging.DEBUG, operation: str = 'scroll_to_element') -> logging.LogRecord:
+    record = logging.LogRecord('pages_parser', level, __file__, 1, message, None, None, func='scroll_to_element')
+    record.operation = operation
+    return record
+
+
+def test_unique_messages_are_sampled_per_operation():
+    sampling_filter = SamplingFilter({'scroll_to_element': 0.1})
+
+    passed = [sampling_filter.filter(make_record(f"Scrolling: {step} steps")) for step in range(1000)]
+
+    assert sum(passed) == 100
+    assert len(sampling_filter._counters) == 1
+
+
+def test_before_and_after_messages_of_call_are_passed_together():
+    sampling_filter = SamplingFilter(default_rate=0.5)
+
+    passed = [(sampling_filter.filter(make_record("Scrolling...", logging.DEBUG)),
+               sampling_filter.filter(make_record("Scrolling completed.", logging.DEBUG + 5)))
+              for _ in range(4)]
+
+    assert passed == [(True, True), (False, False), (True, True), (False, False)]
+
+
+def test_records_above_max_level_are_not_sampled():
+    sampling_filter = SamplingFilter(default_rate=0)
+
+    assert sampling_filter.filter(make_record("Page is not ready", logging.WARNING))
+    assert not sampling_filter.filter(make_record("Scrolling..."))
+
+
+def test_first_record_does_not_change_application_loggers():
+    # logging is configured once per process, so the first record is made in a new one
+    script = (
+        "import logging\n"
+        "app_logger = logging.getLogger('app')\n"
+        "app_logger.setLevel('DEBUG')\n"
+        "selenium_logger = logging.getLogger('selenium.webdriver.remote')\n"
+        "from web_parser_logger.main import logger\n"
+        "logger.critical('First record')\n"
+        "print(app_logger.level, app_logger.disabled, selenium_logger.getEffectiveLevel())\n"
+    )
+    result = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True,
+                            cwd=Path(__file__).parent.parent, check=True)
+
+    assert result.stdout.split()[-3:] == [str(logging.DEBUG), 'False', str(logging.CRITICAL)]
+
+
+def test_records_are_sampled_per_operation_and_level():
+    sampling_filter = SamplingFilter({'find_elements': 0.25, 'open_page': 0.5}, default_rate=1)
+
+    passed = {(operation, level): sum(sampling_filter.filter(make_record("Message", level, operation))
+                                      for _ in range(8))
+              for operation in ('find_elements', 'open_page', 'click_element')
+              for level in (logging.DEBUG, logging.DEBUG + 5)}
+
+    assert passed == {('find_elements', logging.DEBUG): 2, ('find_elements', logging.DEBUG + 5): 2,
+                      ('open_page', logging.DEBUG): 4, ('open_page', logging.DEBUG + 5): 4,
+                      ('click_element', logging.DEBUG): 8, ('click_element', logging.DEBUG + 5): 8}
+
+
+class RecordingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records: list[logging.LogRecord] = []
+        self.format_threads: list[str] = []
+
+    def emit(self, record):
+        self.format_threads.append(threading.current_thread().name)
+        self.format(record)
+        self.records.append(record)
+
+
+def test_queued_records_are_formatted_in_listener_thread():
+    handler = RecordingHandler()
+    queued_logger = logging.getLogger('pages_parser_queue_test')
+    queued_logger.propagate = False
+    queued_logger.addHandler(handler)
+
+    enable_queue_logging(queued_logger.name)
+    try:
+        queued_logger.warning("Page %s is not ready", 1)
+    finally:
+        disable_queue_logging(queued_logger.name)
+        queued_logger.removeHandler(handler)
+
+    [record] = handler.records
+    # the message is not built in the calling thread
+    assert (record.msg, record.args) == ("Page %s is not ready", (1,))
+    assert record.getMessage() == "Page 1 is not ready"
+    assert threading.current_thread().name not in handler.format_threads
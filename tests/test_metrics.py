@@ -0,0 +1,132 @@
+import threading
+
+import pytest
+
+from utils.decorators import write_log
+from utils.metrics import Histogram, MetricsRegistry, metrics
+
+
+@pytest.fixture
+def registry() -> MetricsRegistry:
+    return MetricsRegistry(buckets=(0.1, 1))
+
+
+def test_counters_are_summed_per_operation(registry):
+    registry.increment('pages')
+    registry.increment('pages', 2)
+    registry.increment('errors', operation='open_page')
+    registry.increment('errors', operation='open_page')
+    registry.increment('errors', operation='scroll_to_element')
+
+    assert registry.to_dict()['counters'] == {'pages': 3,
+                                              'errors': {'open_page': 2, 'scroll_to_element': 1}}
+
+
+def test_value_on_bucket_bound_is_counted_in_bucket():
+    histogram = Histogram(buckets=(0.1, 1))
+
+    for value in (0.05, 0.1, 0.5, 1, 2):
+        histogram.observe(value)
+
+    assert histogram.to_dict() == {'count': 5,
+                                   'sum': pytest.approx(3.65),
+                                   'buckets': {'0.1': 2, '1': 2, '+Inf': 1}}
+
+
+def test_histograms_of_threads_are_merged(registry):
+    def observe():
+        for _ in range(100):
+            registry.observe('open_page', 0.5)
+            registry.increment('pages')
+
+    threads = [threading.Thread(target=observe) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    observe()
+
+    snapshot = registry.to_dict()
+    assert snapshot['operations']['open_page']['count'] == 500
+    assert snapshot['operations']['open_page']['buckets'] == {'0.1': 0, '1': 500, '+Inf': 0}
+    assert snapshot['counters'] == {'pages': 500}
+
+
+def test_reset_clears_metrics_of_all_threads(registry):
+    thread = threading.Thread(target=registry.observe, args=('open_page', 0.5))
+    thread.start()
+    thread.join()
+    registry.observe('scroll_to_element', 0.5)
+
+    registry.reset()
+
+    assert registry.to_dict()['operations'] == {}
+
+
+def test_disabled_registry_records_nothing(registry):
+    registry.enabled = False
+
+    registry.observe('open_page', 0.5)
+    registry.increment('pages')
+
+    assert registry.to_dict()['operations'] == {}
+    assert registry.to_dict()['counters'] == {}
+
+
+def test_prometheus_format(registry):
+    registry.observe('open_page', 0.05)
+    registry.observe('open_page', 2)
+    registry.increment('pages')
+    registry.increment('errors', operation='open_page')
+
+    assert registry.to_prometheus() == (
+        '# TYPE pages_parser_operation_duration_seconds histogram\n'
+        'pages_parser_operation_duration_seconds_bucket{operation="open_page",le="0.1"} 1\n'
+        'pages_parser_operation_duration_seconds_bucket{operation="open_page",le="1"} 1\n'
+        'pages_parser_operation_duration_seconds_bucket{operation="open_page",le="+Inf"} 2\n'
+        'pages_parser_operation_duration_seconds_sum{operation="open_page"} 2.05\n'
+        'pages_parser_operation_duration_seconds_count{operation="open_page"} 2\n'
+        '# TYPE pages_parser_errors_total counter\n'
+        'pages_parser_errors_total{operation="open_page"} 1\n'
+        '# TYPE pages_parser_pages_total counter\n'
+        'pages_parser_pages_total 1\n'
+    )
+
+
+class Decorated:
+    @write_log(before_msg="Before", after_msg="After", operation='logged_call')
+    def logged(self, fail: bool = False):
+        if fail:
+            raise ValueError(fail)
+        return 1
+
+    @write_log(before_msg="Before", after_msg="After", operation='logged_items')
+    def logged_items(self):
+        yield from range(3)
+
+
+def test_write_log_records_durations_and_errors():
+    metrics.reset()
+    decorated = Decorated()
+
+    decorated.logged()
+    with pytest.raises(ValueError):
+        decorated.logged(fail=True)
+    assert list(decorated.logged_items()) == [0, 1, 2]
+
+    snapshot = metrics.to_dict()
+    assert snapshot['operations']['logged_call']['count'] == 2
+    assert snapshot['operations']['logged_items']['count'] == 3
+    assert snapshot['counters'] == {'errors': {'logged_call': 1}}
+
+
+def test_write_log_does_not_time_calls_when_metrics_are_disabled():
+    metrics.reset()
+    metrics.enabled = False
+    try:
+        assert Decorated().logged() == 1
+        assert list(Decorated().logged_items()) == [0, 1, 2]
+    finally:
+        metrics.enabled = True
+
+    assert metrics.to_dict()['operations'] == {}
@@ -0,0 +1,45 @@
+import time
+
+import pytest
+from lxml import html
+
+from benchmarks.fake_webdriver import FakeWebDriver
+from benchmarks.fixtures import FixturePageData, build_listing_page
+from parsing.general_methods import PageParser, PageReadiness
+from parsing.scripts import WRITE_PAGE_SOURCE
+
+
+class ClickingWebDriver(FakeWebDriver):
+    """Changes the page, when the 'next page' button is clicked"""
+
+    def __init__(self, page_source: str, change: str):
+        super().__init__(page_source, current_url='http://localhost/search?page=0')
+        self.change = change
+
+    def on_click(self, node: html.HtmlElement):
+        match self.change:
+            case 'document':
+                self.current_url = 'http://localhost/search?page=1'
+                self.execute_script(WRITE_PAGE_SOURCE, build_listing_page(page_number=1, cards_count=2))
+            case 'url':
+                self.current_url = 'http://localhost/search?page=1'
+            case 'content':
+                # AJAX pagination replaces the cards in the same document
+                node.getroottree().getroot().body.insert(0, html.fragment_fromstring("<div>Loaded card</div>"))
+
+
+@pytest.mark.parametrize('change', ['document', 'url', 'content'])
+def test_click_opens_page(change):
+    parser = PageParser(driver=ClickingWebDriver(build_listing_page(cards_count=2, next_page_url='/next'), change),
+                        readiness=PageReadiness(timeout=5))
+    start = time.perf_counter()
+
+    assert parser.open_page_by_click(FixturePageData.next_page)
+    assert time.perf_counter() - start < 1
+
+
+def test_click_that_does_not_change_page_returns_false():
+    parser = PageParser(driver=FakeWebDriver(build_listing_page(cards_count=2, next_page_url='/next')),
+                        readiness=PageReadiness(timeout=0.2))
+
+    assert not parser.open_page_by_click(FixturePageData.next_page)
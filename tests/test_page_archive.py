@@ -0,0 +1,75 @@
+from pathlib import Path
+
+import pytest
+
+from benchmarks.fixtures import FixturePageData, build_listing_page
+from parsing.exceptions import PageNotFound
+from parsing.page_archive import PageArchive, ReplayPageParser
+from parsing.snapshot import PageSnapshot
+
+
+def record_pages(archive: PageArchive, pages_count: int) -> list[str]:
+    """Records the listing pages, the pages are redirected to '/page-N'"""
+    page_links = [f"http://localhost/search?page={page_number}" for page_number in range(pages_count)]
+    for page_number, url in enumerate(page_links):
+        archive.record(url, PageSnapshot(page_source=build_listing_page(page_number, cards_count=2),
+                                         page_url=f"http://localhost/page-{page_number}"))
+    return page_links
+
+
+@pytest.mark.parametrize('rotate_size', [None, 1024])
+def test_records_are_read_while_recording(tmp_path: Path, rotate_size):
+    with PageArchive(tmp_path.joinpath('pages.ndjson'), rotate_size=rotate_size) as archive:
+        page_links = record_pages(archive, 3)
+        assert [record['url'] for record in archive.iter_records()] == page_links
+
+        more_page_links = record_pages(archive, 2)
+        assert [record['url'] for record in archive.iter_records()] == page_links + more_page_links
+
+    archive = PageArchive(tmp_path.joinpath('pages.ndjson'), rotate_size=rotate_size)
+    assert len(list(archive.iter_records())) == 5
+    if rotate_size:
+        assert len(archive.get_archive_files()) > 1
+
+
+def test_replays_archived_pages(tmp_path: Path):
+    with PageArchive(tmp_path.joinpath('pages.ndjson')) as archive:
+        record_pages(archive, 2)
+
+        pages = list(archive.replay(elements=[FixturePageData.url]))
+
+    assert pages == [{'url': {1: 'http://localhost/vacancy/1', 2: 'http://localhost/vacancy/2'}},
+                     {'url': {1: 'http://localhost/vacancy/3', 2: 'http://localhost/vacancy/4'}}]
+
+
+def test_replay_parser_opens_page_by_url_and_page_url(tmp_path: Path):
+    with PageArchive(tmp_path.joinpath('pages.ndjson')) as archive:
+        page_links = record_pages(archive, 3)
+        parser = ReplayPageParser(archive=archive)
+
+        parser.open_page(page_links[2])
+        assert parser.get_current_url() == 'http://localhost/page-2'
+        assert parser.get_data_from_identical_elements(FixturePageData.title) == {1: 'Python developer 5',
+                                                                                   2: 'Python developer 6'}
+
+        parser.open_page('http://localhost/page-0')
+        assert parser.get_data_from_identical_elements(FixturePageData.title)[1] == 'Python developer 1'
+
+
+def test_replay_parser_raises_if_page_is_not_archived(tmp_path: Path):
+    with PageArchive(tmp_path.joinpath('pages.ndjson')) as archive:
+        record_pages(archive, 1)
+        parser = ReplayPageParser(archive=archive, raise_errors=True)
+
+        with pytest.raises(PageNotFound):
+            parser.open_page('http://localhost/missing')
+
+
+def test_replay_parser_does_not_keep_previous_page_if_page_is_not_archived(tmp_path: Path):
+    with PageArchive(tmp_path.joinpath('pages.ndjson')) as archive:
+        page_links = record_pages(archive, 1)
+        parser = ReplayPageParser(archive=archive)
+
+        assert parser.open_page(page_links[0])
+        assert parser.open_page('http://localhost/missing') is None
+        assert parser.snapshot is None
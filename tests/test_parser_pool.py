@@ -0,0 +1,122 @@
+import threading
+from collections import Counter
+
+import pytest
+
+from benchmarks.fixtures import get_listing_page_links
+from parsing.data_collection import PageDataCollector
+from parsing.exceptions import ValueIsEmpty, ValueIsWrong
+from parsing.fingerprints import FingerprintStore
+from parsing.http_parser import HttpPageParser
+from parsing.parser_pool import ParserPool
+from tests.conftest import PAGES_COUNT, CARDS_COUNT
+
+
+@pytest.fixture
+def pool():
+    pool = ParserPool(create_parser=HttpPageParser, size=2)
+    yield pool
+    pool.close()
+
+
+def get_first_titles(pages_data: list[dict]) -> list[str]:
+    return [page_data['title'][1] for page_data in pages_data]
+
+
+def test_pool_returns_pages_in_order_of_links(fixture_site, fixture_page, pool):
+    links = get_listing_page_links(fixture_site, PAGES_COUNT)
+    collector = PageDataCollector(parser=None, page=fixture_page, pool=pool)
+
+    pages_data = list(collector.collect_data_from_links(page_links=links))
+
+    assert get_first_titles(pages_data) == [f"Python developer {page_number * CARDS_COUNT + 1}"
+                                            for page_number in range(PAGES_COUNT)]
+
+
+def test_unordered_pool_returns_all_pages(fixture_site, fixture_page, pool):
+    links = get_listing_page_links(fixture_site, PAGES_COUNT)
+    collector = PageDataCollector(parser=None, page=fixture_page, pool=pool, ordered=False)
+
+    pages_data = list(collector.collect_data_from_links(page_links=links))
+
+    assert sorted(get_first_titles(pages_data)) == sorted(f"Python developer {page_number * CARDS_COUNT + 1}"
+                                                          for page_number in range(PAGES_COUNT))
+
+
+def test_pool_skips_failed_pages(fixture_site, fixture_page, pool):
+    links = [f"{fixture_site}/missing", *get_listing_page_links(fixture_site, PAGES_COUNT)]
+    collector = PageDataCollector(parser=None, page=fixture_page, pool=pool)
+
+    pages_data = list(collector.collect_data_from_links(page_links=links))
+
+    assert len(pages_data) == PAGES_COUNT
+
+
+def test_pool_counts_every_unchanged_page(fixture_site, fixture_page, pool, tmp_path):
+    # the same pages are collected many times, so the pool threads count them at the same time
+    links = get_listing_page_links(fixture_site, PAGES_COUNT) * 20
+    with FingerprintStore(tmp_path / 'fingerprints.sqlite') as fingerprints:
+        collector = PageDataCollector(parser=None, page=fixture_page, pool=pool, fingerprints=fingerprints)
+        list(collector.collect_data_from_links(page_links=links[:PAGES_COUNT]))
+
+        pages_data = list(collector.collect_data_from_links(page_links=links))
+
+    assert pages_data == []
+    assert collector.skipped_pages_count == len(links)
+
+
+def test_parser_is_used_by_one_thread_at_a_time(pool):
+    users_count: Counter = Counter()
+    overlaps: list[int] = []
+    lock = threading.Lock()
+
+    def use_parser():
+        for _ in range(50):
+            with pool.get_parser() as parser:
+                with lock:
+                    users_count[id(parser)] += 1
+                    overlaps.append(users_count[id(parser)])
+                with lock:
+                    users_count[id(parser)] -= 1
+
+    threads = [threading.Thread(target=use_parser) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert max(overlaps) == 1
+    assert pool._idle_parsers.qsize() == pool.size
+
+
+def test_pagination_without_parser_is_rejected(fixture_site, fixture_page, pool):
+    collector = PageDataCollector(parser=None, page=fixture_page, pool=pool)
+
+    with pytest.raises(ValueIsEmpty):
+        list(collector.collect_data_by_click_next_page(start_page=f"{fixture_site}/search?page=0"))
+
+
+def test_collector_needs_parser_or_pool(fixture_page):
+    with pytest.raises(ValueIsEmpty):
+        PageDataCollector(parser=None, page=fixture_page)
+
+
+@pytest.mark.parametrize('pool_settings', [{'create_parser': HttpPageParser, 'size': 0}, {'size': 2}])
+def test_wrong_pool_settings_are_rejected(pool_settings):
+    with pytest.raises(ValueIsWrong):
+        ParserPool(**pool_settings)
+
+
+def test_created_parsers_are_closed_if_pool_cannot_be_started():
+    created_parsers: list[HttpPageParser] = []
+
+    def create_parser() -> HttpPageParser:
+        if len(created_parsers) == 2:
+            raise ConnectionError("Browser cannot be launched")
+        created_parsers.append(HttpPageParser())
+        return created_parsers[-1]
+
+    with pytest.raises(ConnectionError):
+        ParserPool(create_parser=create_parser, size=3)
+
+    assert all(parser.client.is_closed for parser in created_parsers)
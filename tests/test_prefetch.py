@@ -0,0 +1,72 @@
+import threading
+from collections import defaultdict
+from itertools import islice
+from pathlib import Path
+
+import httpx
+
+from benchmarks.fake_webdriver import FakeWebDriver
+from benchmarks.fixtures import build_listing_page
+from parsing.checkpoint import CheckpointStore
+from parsing.data_collection import PageDataCollector
+from parsing.general_methods import PageParser
+from parsing.http_parser import HttpPageParser
+from tests.conftest import PAGES_COUNT, CARDS_COUNT
+
+
+class OpeningEventsParser(HttpPageParser):
+    """Sets the event of the page, when its opening starts"""
+
+    def __post_init__(self):
+        super().__post_init__()
+        self.opening_started: defaultdict[str, threading.Event] = defaultdict(threading.Event)
+
+    def open_page(self, page_url: str, delay_after: float = 0) -> bool:
+        self.opening_started[page_url].set()
+        return super().open_page(page_url=page_url, delay_after=delay_after)
+
+
+def test_next_page_is_opened_while_page_is_returned(fixture_site, fixture_page):
+    parser = OpeningEventsParser()
+    collector = PageDataCollector(parser=parser, page=fixture_page, prefetch=True)
+
+    first_titles: list[str] = []
+    for page_number, page_data in enumerate(collector.collect_data_by_click_next_page(f"{fixture_site}/search?page=0")):
+        first_titles.append(page_data['title'][1])
+        if page_number + 1 < PAGES_COUNT:
+            # without the prefetch the next page is opened only after the returned page is processed
+            assert parser.opening_started[f"{fixture_site}/search?page={page_number + 1}"].wait(timeout=5)
+
+    assert first_titles == [f"Python developer {page_number * CARDS_COUNT + 1}" for page_number in range(PAGES_COUNT)]
+
+
+def test_pagination_stops_if_next_page_is_not_fetched(fixture_page, tmp_path: Path):
+    def handle_request(request: httpx.Request) -> httpx.Response:
+        if request.url.path != '/search':
+            return httpx.Response(404)
+        return httpx.Response(200, html=build_listing_page(cards_count=CARDS_COUNT, next_page_url='/missing'))
+
+    start_page = 'http://localhost/search?page=0'
+    parser = HttpPageParser()
+    parser.client = httpx.Client(transport=httpx.MockTransport(handle_request))
+    with CheckpointStore(tmp_path.joinpath('crawl.sqlite'), job_name='test') as checkpoint:
+        collector = PageDataCollector(parser=parser, page=fixture_page, checkpoint=checkpoint, prefetch=True)
+
+        pages = list(islice(collector.collect_data_by_click_next_page(start_page), 5))
+
+        assert len(pages) == 1
+        assert checkpoint.get_pagination(start_page) is None
+
+
+def test_next_page_link_is_read_without_parsing_snapshot(fixture_page):
+    page_source = build_listing_page(cards_count=CARDS_COUNT, next_page_url='/search?page=1')
+    driver = FakeWebDriver(page_source, current_url='http://localhost/search?page=0')
+    collector = PageDataCollector(parser=PageParser(driver=driver), page=fixture_page, pages_count=2, prefetch=True)
+
+    pages = collector._paginate_with_prefetch('http://localhost/search?page=0', fixture_page.pagination)
+    _, snapshot, _ = next(pages)
+
+    # the snapshot is parsed by the extraction, while the next page is being opened
+    assert 'document' not in vars(snapshot)
+    pages.close()
+    assert driver.current_url == 'http://localhost/search?page=1'
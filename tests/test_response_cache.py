@@ -0,0 +1,82 @@
+import zlib
+from pathlib import Path
+
+import pytest
+
+from benchmarks.fake_webdriver import FakeWebDriver
+from benchmarks.fixtures import FixturePageData, build_listing_page
+from parsing.general_methods import PageParser
+from parsing.response_cache import ResponseCache
+from parsing.scripts import WRITE_PAGE_SOURCE
+
+
+@pytest.fixture
+def cache(tmp_path: Path):
+    return ResponseCache(tmp_path.joinpath('responses.sqlite'))
+
+
+def test_returns_cached_response_by_url_and_headers(cache):
+    cache.put('http://localhost/page', '<html></html>', final_url='http://localhost/final',
+              headers={'User-Agent': 'first'})
+
+    cached_response = cache.get('http://localhost/page', {'User-Agent': 'first'})
+
+    assert (cached_response.url, cached_response.page_source) == ('http://localhost/final', '<html></html>')
+    assert cache.get('http://localhost/page', {'User-Agent': 'second'}) is None
+
+
+def test_expired_response_is_not_returned(tmp_path):
+    cache = ResponseCache(tmp_path.joinpath('responses.sqlite'), ttl=-1)
+    cache.put('http://localhost/page', '<html></html>')
+
+    assert cache.get('http://localhost/page') is None
+
+
+@pytest.mark.parametrize('extraction_mode', ['element', 'snapshot'])
+def test_links_of_cached_page_are_resolved_by_page_url(cache, extraction_mode):
+    page_url = 'http://localhost/search?page=0'
+    parser = PageParser(driver=FakeWebDriver(build_listing_page(cards_count=1)),
+                        extraction_mode=extraction_mode,
+                        cache=cache)
+    cache.put(page_url, build_listing_page(cards_count=1), headers=parser._get_request_headers())
+
+    parser.open_page(page_url=page_url)
+
+    assert parser.driver.current_url == 'about:blank'
+
+    assert parser.take_page_snapshot().page_url == page_url
+    assert parser.get_data_from_page_elements([FixturePageData.url]) == {
+        'url': {1: 'http://localhost/vacancy/1'}
+    }
+
+
+def test_least_recently_used_responses_are_evicted(tmp_path):
+    response_size = len(zlib.compress(b'<html></html>'))
+    cache = ResponseCache(tmp_path.joinpath('responses.sqlite'), max_size=response_size * 2)
+    cache.put('http://localhost/first', '<html></html>')
+    cache.put('http://localhost/second', '<html></html>')
+    cache.get('http://localhost/first')
+
+    cache.put('http://localhost/third', '<html></html>')
+
+    assert cache.get('http://localhost/second') is None
+    assert cache.get('http://localhost/first') is not None
+    assert cache.get('http://localhost/third') is not None
+    # the replaced response is not counted twice
+    cache.put('http://localhost/third', '<html></html>')
+    assert cache.get('http://localhost/first') is not None
+
+
+@pytest.mark.parametrize('extraction_mode', ['element', 'batch', 'snapshot'])
+def test_page_is_cached_with_content_loaded_by_scrolling(cache, extraction_mode):
+    page_url = 'http://localhost/search?page=0'
+    driver = FakeWebDriver(build_listing_page(cards_count=1))
+    parser = PageParser(driver=driver, extraction_mode=extraction_mode, cache=cache)
+
+    parser.open_page(page_url=page_url)
+    parser.wait_until_page_ready()
+    # the lazy cards are loaded by scrolling
+    driver.execute_script(WRITE_PAGE_SOURCE, build_listing_page(cards_count=3))
+    parser.get_data_from_page_elements([FixturePageData.title])
+
+    assert 'Python developer 3' in cache.get(page_url, parser._get_request_headers()).page_source
@@ -0,0 +1,109 @@
+from pathlib import Path
+
+import httpx
+import pytest
+
+from benchmarks.fixtures import build_listing_page, get_listing_page_links
+from parsing.data_collection import PageDataCollector
+from parsing.dead_letters import DeadLetterQueue
+from parsing.exceptions import ElementNotFound, RetriesExhausted
+from parsing.http_parser import HttpPageParser
+from parsing.parser_pool import ParserPool
+from parsing.retry import RetryEngine, RetryPolicy
+from tests.conftest import PAGES_COUNT
+
+
+@pytest.fixture
+def dead_letters(tmp_path: Path):
+    with DeadLetterQueue(tmp_path.joinpath('dead_letters.sqlite'), job_name='test') as dead_letters:
+        yield dead_letters
+
+
+def test_dead_letter_queue_keeps_last_failure_per_link(dead_letters):
+    dead_letters.add('http://localhost/1', 'timeout', 'TimeoutException: first', 3)
+    dead_letters.add('http://localhost/2', 'other', 'ValueError: second', 1)
+    dead_letters.add('http://localhost/1', 'navigation', 'ConnectionError: third', 4)
+
+    assert dead_letters.count() == 2
+    assert dead_letters.get_links() == ['http://localhost/2', 'http://localhost/1']
+    assert dead_letters.get_dead_letters()[-1].error_class == 'navigation'
+
+    dead_letters.remove('http://localhost/2')
+    assert dead_letters.get_links() == ['http://localhost/1']
+    dead_letters.clear()
+    assert dead_letters.count() == 0
+
+
+def test_engine_retries_by_error_class(dead_letters):
+    engine = RetryEngine(policies={'missing_element': RetryPolicy(max_attempts=3, base_delay=0)},
+                         dead_letters=dead_letters)
+    attempts: list[int] = []
+
+    def collect_page():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ElementNotFound("not rendered yet")
+        return 'page data'
+
+    assert engine.call('http://localhost/1', collect_page) == 'page data'
+    assert len(attempts) == 3
+    assert dead_letters.count() == 0
+
+
+def test_exhausted_page_goes_to_dead_letters(dead_letters):
+    engine = RetryEngine(dead_letters=dead_letters)
+
+    with pytest.raises(RetriesExhausted):
+        engine.call('http://localhost/1', lambda: 1 / 0)
+
+    assert [(dead_letter.url, dead_letter.error_class, dead_letter.attempts)
+            for dead_letter in dead_letters.get_dead_letters()] == [('http://localhost/1', 'other', 1)]
+
+
+def test_collector_skips_failed_page_and_removes_collected_one(fixture_site, fixture_page, dead_letters):
+    page_links = get_listing_page_links(fixture_site, PAGES_COUNT)
+    dead_letters.add(page_links[0], 'timeout', 'TimeoutException', 3)
+    parser = HttpPageParser()
+    collector = PageDataCollector(parser=parser, page=fixture_page,
+                                  retry=RetryEngine(dead_letters=dead_letters))
+
+    pages = list(collector.collect_data_from_links([*page_links, f"{fixture_site}/missing"]))
+
+    assert len(pages) == PAGES_COUNT
+    assert dead_letters.get_links() == [f"{fixture_site}/missing"]
+    # the errors are raised only inside the retried collection
+    assert not parser.raise_errors
+
+
+def test_pool_collector_without_parser_uses_retry(fixture_site, fixture_page, dead_letters):
+    pool = ParserPool(create_parser=HttpPageParser, size=2)
+    collector = PageDataCollector(parser=None, page=fixture_page, pool=pool,
+                                  retry=RetryEngine(dead_letters=dead_letters))
+
+    parsers = list(pool.parsers)
+    try:
+        pages = list(collector.collect_data_from_links([*get_listing_page_links(fixture_site, PAGES_COUNT),
+                                                        f"{fixture_site}/missing"]))
+    finally:
+        pool.close()
+
+    assert len(pages) == PAGES_COUNT
+    assert dead_letters.get_links() == [f"{fixture_site}/missing"]
+    assert not any(parser.raise_errors for parser in parsers)
+
+
+def test_navigation_error_does_not_stop_pagination_with_retry(fixture_page, dead_letters):
+    def handle_request(request: httpx.Request) -> httpx.Response:
+        if request.url.path != '/search':
+            return httpx.Response(404)
+        return httpx.Response(200, html=build_listing_page(cards_count=2, next_page_url='/missing'))
+
+    parser = HttpPageParser()
+    parser.client = httpx.Client(transport=httpx.MockTransport(handle_request))
+    collector = PageDataCollector(parser=parser, page=fixture_page, retry=RetryEngine(dead_letters=dead_letters))
+
+    # the failed next page is handled as without the retry engine: the pagination is stopped
+    pages = list(collector.collect_data_by_click_next_page('http://localhost/search?page=0'))
+
+    assert len(pages) == 1
+    assert dead_letters.count() == 0
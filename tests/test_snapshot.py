@@ -0,0 +1,18 @@
+import pytest
+from lxml import html
+
+from parsing.snapshot import get_inner_text
+
+
+@pytest.mark.parametrize('element_html, text', [
+    ("<div>Line1<br>Line2</div>", "Line1\nLine2"),
+    ("<div><div>Block 1</div><div>Block 2</div></div>", "Block 1\nBlock 2"),
+    ("<div><p>Paragraph 1</p><p>Paragraph 2</p></div>", "Paragraph 1\n\nParagraph 2"),
+    ("<div>  many \n  spaces <b> inline </b> text </div>", "many spaces inline text"),
+    ("<div>Text<script>var x;</script><style>p {}</style><!-- comment --> tail</div>", "Text tail"),
+    ("<table><tr><td>a</td><td>b</td></tr><tr><td>c</td></tr></table>", "a\tb\nc"),
+    ("<div><pre>keep\n  spaces</pre>after</div>", "keep\n  spaces\nafter"),
+    ("<div>non&nbsp;breaking</div>", "non\xa0breaking"),
+])
+def test_text_is_extracted_like_inner_text(element_html, text):
+    assert get_inner_text(html.fragment_fromstring(element_html)) == text
@@ -0,0 +1,212 @@
+import csv
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Literal, NoReturn
+
+from parsing.exceptions import ValueIsWrong
+from utils.decorators import write_log
+
+alignment_type = Literal['pad'] | Literal['truncate'] | Literal['strict']
+file_format_type = Literal['csv'] | Literal['parquet'] | Literal['arrow']
+
+
+def page_data_to_rows(page_data: dict[str, dict | list | str],
+                      alignment: alignment_type = 'pad') -> list[dict[str, str | None]]:
+    """
+    Lines up the data of one page into rows.
+    Records of a container (list[dict]) are rows as they are, values of single elements are added to them.
+    Otherwise fields of many=True elements (dict[int, str]) are columns, row number is the element position,
+    values of single elements (str) are repeated in every row.
+    Fields of different lengths are handled by alignment:
+    - pad - missing values are None;
+    - truncate - rows are cut to the shortest field;
+    - strict - ValueIsWrong is raised.
+    :return: list of rows.
+    """
+    many_fields = {name: value for name, value in page_data.items() if isinstance(value, dict)}
+    containers = {name: value for name, value in page_data.items() if isinstance(value, list)}
+
+    if containers:
+        if len(containers) > 1 or many_fields:
+            raise ValueIsWrong(f"Rows are made from one container and single elements, "
+                               f"but there are containers {list(containers)} and many fields {list(many_fields)}")
+        (container_name, records), = containers.items()
+        single_fields = {name: value for name, value in page_data.items() if name != container_name}
+        return [{**single_fields, **record} for record in records]
+    lengths = {name: len(value) for name, value in many_fields.items()}
+
+    if not many_fields:
+        return [dict(page_data)]
+
+    if len(set(lengths.values())) > 1:
+        match alignment:
+            case 'strict':
+                raise ValueIsWrong(f"Fields have different lengths: {lengths}")
+            case 'truncate':
+                rows_count = min(lengths.values())
+            case _:
+                rows_count = max(lengths.values())
+    else:
+        rows_count = max(lengths.values())
+
+    rows: list[dict[str, str | None]] = []
+    for position in range(1, rows_count + 1):
+        rows.append({name: (value.get(position) if name in many_fields else value)
+                     for name, value in page_data.items()})
+    return rows
+
+
+@dataclass
+class ColumnarWriter:
+    """
+    Writes pages data as rows to CSV, Parquet or Arrow IPC file.
+    Rows are collected into groups of row_group_size and written by one batch,
+    Parquet and Arrow formats need 'pyarrow' package.
+    If the columns are not given, they are the fields of all rows: a field, that first appears
+    after rows have been written, is added to the file, the written rows are rewritten with it empty.
+    All values are strings, lists and dicts are written as JSON.
+    Example:
+    with ColumnarWriter(Path('vacancies.parquet'), file_format='parquet') as writer:
+        writer.write_all(collector.collect_data_from_links(page_links=links))
+    """
+    file_path: Path
+    file_format: file_format_type = 'parquet'
+    alignment: alignment_type = 'pad'
+    row_group_size: int = 100_000
+    columns: list[str] = None
+
+    def __post_init__(self):
+        self.rows_count = 0
+        self._rows: list[dict[str, str | None]] = []
+        # the given columns are fixed, otherwise they grow with the fields of the rows
+        self._is_schema_fixed = self.columns is not None
+        self.columns = list(self.columns or [])
+        self._written_columns: list[str] = []
+        self._schema = None
+        self._writer = None
+        self._file = None
+
+    def write_page(self, page_data: dict[str, dict | str]) -> NoReturn:
+        """Lines up the page data into rows and writes them by row groups"""
+        rows = page_data_to_rows(page_data, self.alignment)
+        if not self._is_schema_fixed:
+            # records of a container are flattened, so the columns are their fields, not the page keys
+            known_columns = set(self.columns)
+            self.columns.extend(column for column in dict.fromkeys(column for row in rows for column in row)
+                                if column not in known_columns)
+        self._rows.extend(rows)
+        if len(self._rows) >= self.row_group_size:
+            self.flush()
+
+    @write_log(before_msg="Writing pages data to columnar file...",
+               after_msg="Pages data successfully written.")
+    def write_all(self, pages_data: Iterable[dict[str, dict | str]]) -> int:
+        """Writes data of all pages from the iterable (for example, collector generator), returns rows number"""
+        rows_count = self.rows_count
+        for page_data in pages_data:
+            self.write_page(page_data)
+        self.flush()
+        return self.rows_count - rows_count
+
+    def flush(self) -> NoReturn:
+        """Writes collected rows as one row group"""
+        if not self._rows:
+            return
+
+        if self._writer is None:
+            self._open_writer()
+        elif self.columns != self._written_columns:
+            self._add_new_columns()
+
+        match self.file_format:
+            case 'csv':
+                self._writer.writerows({column: self._to_str(row.get(column)) for column in self.columns}
+                                       for row in self._rows)
+            case _:
+                import pyarrow as pa
+                batch = pa.RecordBatch.from_pydict(
+                    {column: [self._to_str(row.get(column)) for row in self._rows] for column in self.columns},
+                    schema=self._schema
+                )
+                self._writer.write_batch(batch)
+        self.rows_count += len(self._rows)
+        self._rows.clear()
+
+    def close(self) -> NoReturn:
+        """Writes collected rows and closes the file"""
+        self.flush()
+        self._close_writer()
+
+    def _close_writer(self) -> NoReturn:
+        if self._writer is not None and self.file_format != 'csv':
+            self._writer.close()
+        if self._file is not None:
+            self._file.close()
+        self._writer = self._file = None
+
+    def _add_new_columns(self) -> NoReturn:
+        """Rewrites the written rows to the file with the new columns, their values are empty"""
+        self._close_writer()
+        written_file = self.file_path.with_name(f'{self.file_path.name}.written')
+        self.file_path.replace(written_file)
+        self._open_writer()
+        match self.file_format:
+            case 'csv':
+                with written_file.open(newline='', encoding='utf8') as file:
+                    self._writer.writerows(csv.DictReader(file))
+            case 'parquet':
+                import pyarrow.parquet as pq
+                with written_file.open(mode='rb') as file:
+                    for batch in pq.ParquetFile(file).iter_batches():
+                        self._writer.write_batch(self._add_empty_columns(batch))
+            case 'arrow':
+                import pyarrow as pa
+                with pa.OSFile(str(written_file), 'rb') as file:
+                    reader = pa.ipc.open_file(file)
+                    for batch_number in range(reader.num_record_batches):
+                        self._writer.write_batch(self._add_empty_columns(reader.get_batch(batch_number)))
+        written_file.unlink()
+
+    def _add_empty_columns(self, batch):
+        import pyarrow as pa
+        return pa.RecordBatch.from_arrays(
+            [batch.column(column) if column in batch.schema.names else pa.nulls(batch.num_rows, pa.string())
+             for column in self.columns],
+            schema=self._schema
+        )
+
+    def _open_writer(self) -> NoReturn:
+        self._written_columns = list(self.columns)
+        self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        match self.file_format:
+            case 'csv':
+                self._file = self.file_path.open(mode='w', newline='', encoding='utf8')
+                self._writer = csv.DictWriter(self._file, fieldnames=self.columns, extrasaction='ignore')
+                self._writer.writeheader()
+            case 'parquet':
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+                self._schema = pa.schema([(column, pa.string()) for column in self.columns])
+                self._writer = pq.ParquetWriter(self.file_path, self._schema)
+            case 'arrow':
+                import pyarrow as pa
+                self._schema = pa.schema([(column, pa.string()) for column in self.columns])
+                self._file = pa.OSFile(str(self.file_path), 'wb')
+                self._writer = pa.ipc.new_file(self._file, self._schema)
+            case _:
+                raise ValueIsWrong(f"Unsupported file format '{self.file_format}'")
+
+    @staticmethod
+    def _to_str(value) -> str | None:
+        if value is None or isinstance(value, str):
+            return value
+        if isinstance(value, list | dict):
+            return json.dumps(value, ensure_ascii=False)
+        return str(value)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -1,30 +1,38 @@
 import inspect
+import time
+from functools import lru_cache
 from typing import Any, NoReturn
 
 from selenium.common.exceptions import NoSuchElementException
 
-from rich.console import Console
-
 from web_parser_logger.main import logger
+from utils.metrics import metrics
+
 
-console = Console()
+@lru_cache(maxsize=None)
+def get_console():
+    """Creates the rich console on the first error, so rich is not imported on startup"""
+    from rich.console import Console
+    return Console()
 
 
 def handle_func_errors(func):
     def inner_wrapper(self, *args, **kwargs):
         try:
             return func(self, *args, **kwargs)
-        except NoSuchElementException:
-            message = (
-                f"NoSuchElementException from function '{func.__name__}': "
-                f"Element '{args[0].name}' does not exists.\n"
-            )
-            logger.exception(message)
-            console.print_exception()
         except Exception as ex:
-            message = f"{ex.__class__.__name__} from '{func.__name__}': {ex}"
+            if getattr(self, 'raise_errors', False):
+                # the errors are classified, logged and retried by the caller (see parsing.retry)
+                raise
+            if isinstance(ex, NoSuchElementException):
+                message = (
+                    f"NoSuchElementException from function '{func.__name__}': "
+                    f"Element '{args[0].name}' does not exists.\n"
+                )
+            else:
+                message = f"{ex.__class__.__name__} from '{func.__name__}': {ex}"
             logger.exception(message)
-            console.print_exception()
+            get_console().print_exception()
 
     return inner_wrapper
 
@@ -61,24 +69,78 @@ def get_logger(level: str):
 
 def write_log(before_msg: str, after_msg: str,
               before_level: str = 'DEBUG',
-              after_level: str = 'SUCCESS') -> Any | NoReturn:
+              after_level: str = 'SUCCESS',
+              operation: str = None) -> Any | NoReturn:
+    """
+    Logs the messages before and after the function call
+    and records its duration and errors to the metrics under the operation name
+    (the function name by default). Generators are timed per returned item.
+    """
     def decorator(func):
         logger_before = get_logger(before_level)
         logger_after = get_logger(after_level)
+        operation_name = operation or func.__name__
+        log_extra = {'operation': operation_name}
 
         def gen_wrapper(*args, **kwargs):
-            logger_before(before_msg)
-            for output in func(*args, **kwargs):
+            logger_before(before_msg, extra=log_extra)
+            outputs = func(*args, **kwargs)
+            while True:
+                # the item is not timed, when the metrics are disabled
+                start = time.perf_counter() if metrics.enabled else None
+                try:
+                    output = next(outputs)
+                except StopIteration:
+                    break
+                except Exception:
+                    metrics.increment('errors', operation=operation_name)
+                    raise
+                if start is not None:
+                    metrics.observe(operation_name, time.perf_counter() - start)
+                yield output
+            logger_after(after_msg, extra=log_extra)
+
+        async def async_gen_wrapper(*args, **kwargs):
+            logger_before(before_msg, extra=log_extra)
+            outputs = func(*args, **kwargs)
+            while True:
+                # the item is not timed, when the metrics are disabled
+                start = time.perf_counter() if metrics.enabled else None
+                try:
+                    output = await outputs.__anext__()
+                except StopAsyncIteration:
+                    break
+                except Exception:
+                    metrics.increment('errors', operation=operation_name)
+                    raise
+                if start is not None:
+                    metrics.observe(operation_name, time.perf_counter() - start)
                 yield output
-            logger_after(after_msg)
+            logger_after(after_msg, extra=log_extra)
 
         def func_wrapper(self, *args, **kwargs):
-            logger_before(before_msg)
-            result = func(self, *args, **kwargs)
-            logger_after(after_msg)
+            logger_before(before_msg, extra=log_extra)
+            if not metrics.enabled:
+                # the call is neither timed nor counted
+                result = func(self, *args, **kwargs)
+                logger_after(after_msg, extra=log_extra)
+                return result
+            start = time.perf_counter()
+            try:
+                result = func(self, *args, **kwargs)
+            except Exception:
+                metrics.increment('errors', operation=operation_name)
+                raise
+            finally:
+                metrics.observe(operation_name, time.perf_counter() - start)
+            logger_after(after_msg, extra=log_extra)
             return result
 
-        return gen_wrapper if inspect.isgeneratorfunction(func) else func_wrapper
+        if inspect.isgeneratorfunction(func):
+            return gen_wrapper
+        elif inspect.isasyncgenfunction(func):
+            return async_gen_wrapper
+        return func_wrapper
 
     return decorator
 
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 
 @dataclass
@@ -23,3 +23,17 @@ class LinkElem(HtmlElem):
 @dataclass
 class ButtonElem(HtmlElem):
     extracted_data_type: str = 'html'
+
+
+@dataclass
+class ContainerElem(HtmlElem):
+    """
+    Repeated block of the page (e.g. a listing card).
+    The fields are found inside every block, so their xpaths are relative to it ('.//a[...]'),
+    a card without a field gets None instead of shifting the other cards.
+    The data of the container is a list of records {field name: value},
+    values of many=True fields are lists.
+    """
+    fields: dict[str, HtmlElem] = field(default_factory=dict)
+    extracted_data_type: str = 'record'
+    many: bool = True
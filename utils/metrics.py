@@ -0,0 +1,178 @@
+import bisect
+import json
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import NoReturn
+
+from utils.type_hinting import Second
+
+# upper bounds of the histogram buckets in seconds
+DEFAULT_BUCKETS: tuple[Second, ...] = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                                       1, 2.5, 5, 10, 30, 60)
+
+
+@dataclass
+class Histogram:
+    """Timing histogram with fixed buckets, the last count is for values above all buckets."""
+    buckets: tuple[Second, ...] = DEFAULT_BUCKETS
+
+    def __post_init__(self):
+        self.bucket_counts: list[int] = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: Second) -> NoReturn:
+        self.bucket_counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def merge(self, other: 'Histogram') -> NoReturn:
+        """Adds the counts of the histogram with the same buckets."""
+        for index, bucket_count in enumerate(other.bucket_counts):
+            self.bucket_counts[index] += bucket_count
+        self.count += other.count
+        self.sum += other.sum
+
+    def to_dict(self) -> dict:
+        return {'count': self.count,
+                'sum': self.sum,
+                'buckets': dict(zip([*map(str, self.buckets), '+Inf'], self.bucket_counts))}
+
+
+@dataclass
+class _ThreadMetrics:
+    """Histograms and counters recorded by one thread"""
+    histograms: dict[str, Histogram] = field(default_factory=dict)
+    counters: defaultdict[tuple[str, str | None], int] = field(default_factory=lambda: defaultdict(int))
+
+    def merge(self, other: '_ThreadMetrics', buckets: tuple[Second, ...]) -> NoReturn:
+        # the other thread may add items while they are copied, list() of dict items is atomic
+        for operation, histogram in list(other.histograms.items()):
+            merged_histogram = self.histograms.get(operation)
+            if merged_histogram is None:
+                merged_histogram = self.histograms[operation] = Histogram(buckets=buckets)
+            merged_histogram.merge(histogram)
+        for key, value in list(other.counters.items()):
+            self.counters[key] += value
+
+
+@dataclass
+class MetricsRegistry:
+    """
+    Collects timing histograms per operation and counters.
+    write_log records the duration of every decorated method under its name,
+    errors are counted per operation, pages and elements are counted by the data collectors.
+    Every thread records to its own histograms and counters, so recording takes no lock,
+    they are merged when the metrics are read.
+    The metrics of the finished threads are merged once, when a new thread starts recording.
+    """
+    enabled: bool = True
+    buckets: tuple[Second, ...] = DEFAULT_BUCKETS
+    prefix: str = 'pages_parser'
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._threads_metrics: dict[threading.Thread, _ThreadMetrics] = {}
+        self._finished_threads_metrics = _ThreadMetrics()
+
+    def _get_thread_metrics(self) -> _ThreadMetrics:
+        thread_metrics: _ThreadMetrics | None = getattr(self._local, 'metrics', None)
+        if thread_metrics is None:
+            thread_metrics = self._local.metrics = _ThreadMetrics()
+            with self._lock:
+                self._merge_finished_threads()
+                self._threads_metrics[threading.current_thread()] = thread_metrics
+        return thread_metrics
+
+    def _merge_finished_threads(self) -> NoReturn:
+        for thread in [thread for thread in self._threads_metrics if not thread.is_alive()]:
+            self._finished_threads_metrics.merge(self._threads_metrics.pop(thread), self.buckets)
+
+    def _collect(self) -> _ThreadMetrics:
+        """Returns the metrics of all threads merged together."""
+        collected_metrics = _ThreadMetrics()
+        with self._lock:
+            self._merge_finished_threads()
+            collected_metrics.merge(self._finished_threads_metrics, self.buckets)
+            for thread_metrics in self._threads_metrics.values():
+                collected_metrics.merge(thread_metrics, self.buckets)
+        return collected_metrics
+
+    def observe(self, operation: str, duration: Second) -> NoReturn:
+        """Records the duration of one operation call."""
+        if not self.enabled:
+            return
+        histograms: dict[str, Histogram] = self._get_thread_metrics().histograms
+        histogram = histograms.get(operation)
+        if histogram is None:
+            histogram = histograms[operation] = Histogram(buckets=self.buckets)
+        histogram.observe(duration)
+
+    def increment(self, counter: str, amount: int = 1, operation: str = None) -> NoReturn:
+        if not self.enabled:
+            return
+        self._get_thread_metrics().counters[counter, operation] += amount
+
+    def count_page(self, page_data: dict[str, dict | list | str] | None) -> NoReturn:
+        """Counts the collected page and the number of its extracted values."""
+        if not self.enabled or page_data is None:
+            return
+        elements_count = sum(len(value) if isinstance(value, dict | list) else 1
+                             for value in page_data.values() if value is not None)
+        self.increment('pages')
+        self.increment('elements', elements_count)
+
+    def reset(self) -> NoReturn:
+        with self._lock:
+            for thread_metrics in self._threads_metrics.values():
+                thread_metrics.histograms.clear()
+                thread_metrics.counters.clear()
+            self._finished_threads_metrics = _ThreadMetrics()
+
+    def to_dict(self) -> dict:
+        """Returns the snapshot of all metrics."""
+        collected_metrics = self._collect()
+        counters: dict[str, dict[str, int] | int] = {}
+        for (counter, operation), value in collected_metrics.counters.items():
+            if operation is None:
+                counters[counter] = value
+            else:
+                counters.setdefault(counter, {})[operation] = value
+        return {'timestamp': time.time(),
+                'operations': {operation: histogram.to_dict()
+                               for operation, histogram in collected_metrics.histograms.items()},
+                'counters': counters}
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self) -> str:
+        """Returns the snapshot of all metrics in the Prometheus text format."""
+        duration_name = f'{self.prefix}_operation_duration_seconds'
+        lines: list[str] = [f'# TYPE {duration_name} histogram']
+        collected_metrics = self._collect()
+        for operation, histogram in sorted(collected_metrics.histograms.items()):
+            cumulative_count = 0
+            for bucket, bucket_count in zip([*map(str, histogram.buckets), '+Inf'], histogram.bucket_counts):
+                cumulative_count += bucket_count
+                lines.append(f'{duration_name}_bucket{{operation="{operation}",le="{bucket}"}} '
+                             f'{cumulative_count}')
+            lines.append(f'{duration_name}_sum{{operation="{operation}"}} {histogram.sum}')
+            lines.append(f'{duration_name}_count{{operation="{operation}"}} {histogram.count}')
+
+        declared_counters: set[str] = set()
+        for (counter, operation), value in sorted(collected_metrics.counters.items(),
+                                                  key=lambda item: (item[0][0], item[0][1] or '')):
+            counter_name = f'{self.prefix}_{counter}_total'
+            if counter_name not in declared_counters:
+                lines.append(f'# TYPE {counter_name} counter')
+                declared_counters.add(counter_name)
+            labels = f'{{operation="{operation}"}}' if operation else ''
+            lines.append(f'{counter_name}{labels} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+metrics = MetricsRegistry()
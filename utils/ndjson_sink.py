@@ -0,0 +1,153 @@
+import gzip
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Iterable, Literal, NoReturn
+
+from utils.decorators import write_log
+
+compression_type = Literal['gzip'] | Literal['zstd'] | None
+fsync_policy_type = Literal['never'] | Literal['rotate'] | Literal['always']
+
+file_suffixes: dict[compression_type, str] = {
+    None: '',
+    'gzip': '.gz',
+    'zstd': '.zst'
+}
+
+
+@dataclass
+class NdjsonSink:
+    """
+    Streaming sink, that appends records to one NDJSON file (one JSON record per line).
+    - compression - None, gzip or zstd (needs 'zstandard' package);
+    - buffer_size - records are written to the file by chunks of this size in bytes;
+    - rotate_size - a new file is started when the current one gets this many uncompressed bytes,
+      the files are numbered: 'data.00001.ndjson.gz', 'data.00002.ndjson.gz', ...;
+    - fsync - never, on file rotation/closing or after every written chunk.
+    Example:
+    with NdjsonSink(Path('data.ndjson'), compression='gzip') as sink:
+        sink.write_all(collector.collect_data_from_links(page_links=links))
+    """
+    file_path: Path
+    compression: compression_type = None
+    buffer_size: int = 1024 * 1024
+    rotate_size: int = None
+    fsync: fsync_policy_type = 'rotate'
+
+    def __post_init__(self):
+        self.records_count = 0
+        self._buffer: list[bytes] = []
+        self._buffered_size = 0
+        self._file_size = 0
+        self._file_number = 0
+        self._continue_file = False
+        self._raw_file: BinaryIO | None = None
+        self._file: BinaryIO | None = None
+
+    @property
+    def current_file(self) -> Path:
+        """Path of the file, that the records are written to"""
+        file_name = self.file_path.name + file_suffixes[self.compression]
+        if self.rotate_size:
+            file_name = f"{self.file_path.stem}.{self._file_number:05}{self.file_path.suffix}" \
+                        f"{file_suffixes[self.compression]}"
+        return self.file_path.with_name(file_name)
+
+    def write(self, record: dict) -> NoReturn:
+        """Adds the record to the buffer, writes the buffer to the file if it is full"""
+        line = json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf8') + b'\n'
+        self._buffer.append(line)
+        self._buffered_size += len(line)
+        self.records_count += 1
+        if self._buffered_size >= self.buffer_size:
+            self.flush()
+
+    @write_log(before_msg="Writing records to NDJSON file...",
+               after_msg="Records successfully written.")
+    def write_all(self, records: Iterable[dict]) -> int:
+        """Writes all records from the iterable (for example, collector generator), returns their number"""
+        records_count = self.records_count
+        for record in records:
+            self.write(record)
+        self.flush()
+        return self.records_count - records_count
+
+    def flush(self) -> NoReturn:
+        """Writes the buffer to the file"""
+        if not self._buffer:
+            return
+
+        if self._file is None or (self.rotate_size and self._file_size >= self.rotate_size):
+            self._open_next_file()
+
+        chunk = b''.join(self._buffer)
+        self._buffer.clear()
+        self._buffered_size = 0
+        self._file.write(chunk)
+        self._file_size += len(chunk)
+        if self.fsync == 'always':
+            self._sync()
+
+    def end_stream(self) -> NoReturn:
+        """
+        Writes the buffer and ends the compressed stream, so the written records can be read
+        before the sink is closed. The next records are appended to the same file as a new stream.
+        """
+        self.flush()
+        if self._file is not None:
+            self._close_file()
+            self._continue_file = True
+
+    def close(self) -> NoReturn:
+        """Writes the buffer and closes the file"""
+        self.flush()
+        self._close_file()
+
+    def _open_next_file(self) -> NoReturn:
+        self._close_file()
+        # the file, whose stream has been ended by end_stream, is continued until it is full
+        continue_file = self._continue_file and not (self.rotate_size and self._file_size >= self.rotate_size)
+        self._continue_file = False
+        if not continue_file:
+            self._file_size = 0
+            if self.rotate_size:
+                self._file_number += 1
+                # the previous runs files are not overwritten
+                while self.current_file.exists():
+                    self._file_number += 1
+
+        self.current_file.parent.mkdir(parents=True, exist_ok=True)
+        self._raw_file = self.current_file.open(mode='ab')
+        match self.compression:
+            case 'gzip':
+                self._file = gzip.GzipFile(fileobj=self._raw_file, mode='ab')
+            case 'zstd':
+                import zstandard
+                self._file = zstandard.ZstdCompressor().stream_writer(self._raw_file, closefd=False)
+            case _:
+                self._file = self._raw_file
+
+    def _close_file(self) -> NoReturn:
+        if self._file is None:
+            return
+
+        if self._file is not self._raw_file:
+            self._file.close()  # writes the end of the compressed stream
+        if self.fsync in ('rotate', 'always'):
+            self._sync()
+        self._raw_file.close()
+        self._file = self._raw_file = None
+
+    def _sync(self) -> NoReturn:
+        if self._file is not self._raw_file and not self._file.closed:
+            self._file.flush()
+        self._raw_file.flush()
+        os.fsync(self._raw_file.fileno())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -1,50 +1,52 @@
-from rich.console import Group
-from rich.live import Live
-from rich.progress import BarColumn, Progress, SpinnerColumn, TextColumn, TimeElapsedColumn, TaskProgressColumn
-from rich.rule import Rule
-from rich.console import Console
-
-label_progress = Progress(
-    TimeElapsedColumn(),
-    TextColumn('{task.description}'),
-)
-
-# progress for a task step that takes a while, but we're not sure how long
-step_progress_timed = Progress(
-    TextColumn('\t'),
-    TimeElapsedColumn(),
-    TextColumn('[bold blue]{task.fields[action]}'),
-    SpinnerColumn('simpleDots')
-)
-
-# progress for a task step that has a known total target (steps, ...)
-step_progress = Progress(
-    TextColumn('\t'),
-    TimeElapsedColumn(),
-    TextColumn('[bold blue]{task.fields[action]}'),
-    BarColumn(),
-    TextColumn('({task.completed}/{task.total})')
-)
-
-overall_progress = Progress(
-    TimeElapsedColumn(),
-    BarColumn(),
-    TextColumn('{task.description}'),
-    TaskProgressColumn(),
-    SpinnerColumn('simpleDots')
-)
-
-group = Group(
-    label_progress,
-    step_progress_timed,
-    Rule(style='#AAAAAA'),
-    overall_progress
-)
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def get_progress_group():
+    """
+    Creates the progress bars on the first use, so rich is not imported on startup.
+    :return: group, label_progress, step_progress_timed, overall_progress.
+    """
+    from rich.console import Group
+    from rich.progress import BarColumn, Progress, SpinnerColumn, TextColumn, TimeElapsedColumn, TaskProgressColumn
+    from rich.rule import Rule
+
+    label_progress = Progress(
+        TimeElapsedColumn(),
+        TextColumn('{task.description}'),
+    )
+
+    # progress for a task step that takes a while, but we're not sure how long
+    step_progress_timed = Progress(
+        TextColumn('\t'),
+        TimeElapsedColumn(),
+        TextColumn('[bold blue]{task.fields[action]}'),
+        SpinnerColumn('simpleDots')
+    )
+
+    overall_progress = Progress(
+        TimeElapsedColumn(),
+        BarColumn(),
+        TextColumn('{task.description}'),
+        TaskProgressColumn(),
+        SpinnerColumn('simpleDots')
+    )
+
+    group = Group(
+        label_progress,
+        step_progress_timed,
+        Rule(style='#AAAAAA'),
+        overall_progress
+    )
+    return group, label_progress, step_progress_timed, overall_progress
 
 
 def set_progress_bar(known_amount: bool = False):
     def progress_bar_decorator(func):
         def collect_data_from_links(*args, **kwargs):
+            from rich.live import Live
+
+            group, label_progress, step_progress_timed, overall_progress = get_progress_group()
             overall_task_id = overall_progress.add_task('', total=2)
             progress_gen = func(*args, **kwargs)
             with Live(group):
@@ -76,6 +78,8 @@ def set_progress_bar(known_amount: bool = False):
                                                                          f"has been collected!")
 
         def collect_data_by_click_next_page(*args, **kwargs):
+            from rich.console import Console
+
             console = Console()
             progress_gen = func(*args, **kwargs)
             with console.status("[bold blue]Collecting data by click 'next_page'..."):
@@ -1,6 +1,9 @@
 from enum import Enum
+from typing import Literal
 
 Second = int
 Html = str
 Link = str
 Element_for_parsing = Enum
+Extraction_mode = Literal['element'] | Literal['batch'] | Literal['snapshot']  # how PageParser extracts page data
+Ready_state = Literal['interactive'] | Literal['complete']  # document.readyState of a ready page
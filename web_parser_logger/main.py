@@ -1,10 +1,15 @@
+import atexit
 import logging.config
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
 from typing import NoReturn
 
-from web_parser_logger.settings import logger_config
+from web_parser_logger.settings import logger_config, log_folder, preset_type, SamplingFilter, OTHER_LOGGERS
 
 
-def set_level_for_other_loggers(level_name: str = 'CRITICAL') -> NoReturn:
+def set_level_for_other_loggers(level_name: str = 'CRITICAL',
+                                logger_names: tuple[str, ...] = OTHER_LOGGERS) -> NoReturn:
     level_names: tuple = ('DEBUG', 'SUCCESS', 'INFO', 'WARNING', 'ERROR', 'CRITICAL')
 
     if level_name.upper() in level_names:
@@ -12,14 +17,130 @@ def set_level_for_other_loggers(level_name: str = 'CRITICAL') -> NoReturn:
     else:
         processed_level_name = 'CRITICAL'
 
-    for logger_name in logging.Logger.manager.loggerDict:
+    for logger_name in logger_names:
         logging.getLogger(logger_name).setLevel(processed_level_name)
 
 
-set_level_for_other_loggers('CRITICAL')
-logging.config.dictConfig(logger_config)
+_configuration_lock = threading.Lock()
+_is_configured = False
+
+
+def configure_logging() -> NoReturn:
+    """
+    Creates the 'logs' folder and the handlers from the logger_config
+    and sets the dependency loggers (OTHER_LOGGERS) to CRITICAL.
+    It is called on the first record of the library loggers, so importing does not touch the disk;
+    call it explicitly to configure logging at startup.
+    """
+    global _is_configured
+    with _configuration_lock:
+        if _is_configured:
+            return
+        log_folder.mkdir(parents=True, exist_ok=True)
+        set_level_for_other_loggers('CRITICAL')
+        logging.config.dictConfig(logger_config)
+        _is_configured = True
+
+
+class _ConfigureOnFirstRecordHandler(logging.Handler):
+    """Configures logging on the first record and passes the record to the configured handlers"""
+    def emit(self, record):
+        configure_logging()
+        logging.getLogger(record.name).handle(record)
+
+
+for _logger_name, _logger_settings in logger_config['loggers'].items():
+    _library_logger = logging.getLogger(_logger_name)
+    _library_logger.setLevel(_logger_settings['level'])
+    _library_logger.propagate = False
+    _library_logger.addHandler(_ConfigureOnFirstRecordHandler())
+
 logger = logging.getLogger('pages_parser_files')
 
+_queue_listeners: dict[str, QueueListener] = {}
+
+
+class _UnformattedQueueHandler(QueueHandler):
+    """
+    Puts the records to the queue as they are, the handlers of the listener format them
+    in the background thread (QueueHandler.prepare formats them in the calling thread).
+    The queue is in-process, so the records are not pickled.
+    """
+    def prepare(self, record):
+        return record
+
+
+def enable_queue_logging(logger_name: str = logger.name) -> NoReturn:
+    """
+    Moves formatting and writing of the logger records to the background thread.
+    The scraping thread only puts the records to the queue, they are not formatted there.
+    """
+    configure_logging()
+    if logger_name in _queue_listeners:
+        return
+    queue_logger = logging.getLogger(logger_name)
+    handlers: list[logging.Handler] = queue_logger.handlers[:]
+    records_queue = queue.SimpleQueue()
+    listener = QueueListener(records_queue, *handlers, respect_handler_level=True)
+    for handler in handlers:
+        queue_logger.removeHandler(handler)
+    queue_logger.addHandler(_UnformattedQueueHandler(records_queue))
+    listener.start()
+    _queue_listeners[logger_name] = listener
+
+
+def disable_queue_logging(logger_name: str = logger.name) -> NoReturn:
+    """Writes the queued records and returns the handlers to the logger."""
+    listener = _queue_listeners.pop(logger_name, None)
+    if listener is None:
+        return
+    listener.stop()
+    queue_logger = logging.getLogger(logger_name)
+    for handler in queue_logger.handlers[:]:
+        queue_logger.removeHandler(handler)
+    for handler in listener.handlers:
+        queue_logger.addHandler(handler)
+
+
+def set_debug_sampling(sample_rates: dict[str, float] = None,
+                       default_rate: float = 1.0,
+                       logger_name: str = logger.name) -> NoReturn:
+    """
+    Keeps only the part of DEBUG and SUCCESS records per operation, e.g. {'find_elements': 0.01}.
+    The records are dropped in the calling thread, before they reach the handlers.
+    """
+    configure_logging()
+    sampled_logger = logging.getLogger(logger_name)
+    for log_filter in sampled_logger.filters[:]:
+        if isinstance(log_filter, SamplingFilter):
+            sampled_logger.removeFilter(log_filter)
+    if sample_rates or default_rate < 1:
+        sampled_logger.addFilter(SamplingFilter(sample_rates, default_rate))
+
+
+def use_logging_preset(preset: preset_type = 'production') -> NoReturn:
+    """
+    'development' - all records are written synchronously;
+    'production' - records below INFO are skipped before the messages are built,
+    the rest are written by the background thread.
+    """
+    configure_logging()
+    match preset:
+        case 'production':
+            logger.setLevel('INFO')
+            set_debug_sampling()
+            enable_queue_logging()
+        case _:
+            logger.setLevel('DEBUG')
+            set_debug_sampling()
+            disable_queue_logging()
+
+
+@atexit.register
+def _stop_queue_listeners() -> NoReturn:
+    for logger_name in list(_queue_listeners):
+        disable_queue_logging(logger_name)
+
 
 if __name__ == '__main__':
     logger.debug(f"Debug message with level number is {logging.DEBUG}")
@@ -1,6 +1,11 @@
 import logging
 import logging.config
+import threading
+from collections import defaultdict
 from pathlib import Path
+from typing import Literal
+
+preset_type = Literal['development'] | Literal['production']
 
 ESCAPE_SEQUENCE = {
     'HEXADECIMAL': "\x1b[",
@@ -39,10 +44,9 @@ BACKGROUND_COLOR = {
     'WHITE': "47"
 }
 
-# create 'logs' folder
+# 'logs' folder is created when logging is configured
 current_folder = Path(__file__).parent.absolute()
 log_folder = current_folder.joinpath('logs')
-log_folder.mkdir(parents=True, exist_ok=True)
 
 
 def get_colored_string(text: str,
@@ -159,12 +163,55 @@ class ColoredFormatter(logging.Formatter):
         return result
 
 
+class SamplingFilter(logging.Filter):
+    """
+    Passes only every n-th record of the operation (n = 1 / sample rate),
+    records above max_level are always passed.
+    The operation is taken from the 'operation' record attribute, that write_log sets,
+    otherwise it is the name of the function, that made the record.
+    The records are counted per operation and level, not per message,
+    so the messages built by f-strings are sampled too.
+    """
+    def __init__(self, sample_rates: dict[str, float] = None,
+                 default_rate: float = 1.0,
+                 max_level: int = logging.DEBUG + 5):
+        super().__init__()
+        self.sample_rates = sample_rates or {}
+        self.default_rate = default_rate
+        self.max_level = max_level
+        # the filter is called in the threads, that make the records (e.g. the pool threads)
+        self._lock = threading.Lock()
+        self._counters: defaultdict[tuple[str, int], int] = defaultdict(int)
+
+    def filter(self, record):
+        if record.levelno > self.max_level:
+            return True
+        operation = getattr(record, 'operation', record.funcName)
+        sample_rate = self.sample_rates.get(operation, self.default_rate)
+        if sample_rate >= 1:
+            return True
+        if sample_rate <= 0:
+            return False
+        # the before (DEBUG) and after (SUCCESS) messages of one call are counted separately,
+        # so both are passed
+        with self._lock:
+            records_count = self._counters[operation, record.levelno]
+            self._counters[operation, record.levelno] += 1
+        return records_count % round(1 / sample_rate) == 0
+
+
+# the loggers of the dependencies, that are set to CRITICAL when logging is configured,
+# the loggers of the application are not changed
+OTHER_LOGGERS: tuple[str, ...] = ('selenium', 'urllib3', 'WDM', 'httpx', 'httpcore',
+                                  'fake_useragent', 'dotenv')
+
 # Add new logging level
 add_log_level('SUCCESS', logging.DEBUG + 5)
 
 logger_config = {
     'version': 1,
-    'disable_existing_loggers': True,
+    # logging is configured on the first record, when the application loggers may already exist
+    'disable_existing_loggers': False,
     'formatters': {
         'standard': {
             'format': "%(asctime)s - %(name)s - %(levelname)s - %(module)s:%(funcName)s:%(lineno)s - %(message)s"